@@ -0,0 +1,84 @@
+
+/** \executable benchmarkDRmaxGenJetMatchFormula
+ *
+ * Compare CPU time and results of evaluating the 'dRmaxGenJetMatch' formula
+ * by TFormula::Eval and by the native code of DRmaxGenJetMatchFormula.
+ *
+ * Usage:
+ *   benchmarkDRmaxGenJetMatchFormula [formula] [numEvaluations]
+ *
+ */
+
+#include "PhysicsTools/PatUtils/interface/DRmaxGenJetMatchFormula.h"
+
+#include <TFormula.h>
+#include <TMath.h>
+#include <TRandom3.h>
+#include <TStopwatch.h>
+#include <TString.h>
+
+#include <iostream>
+#include <string>
+#include <vector>
+#include <stdlib.h>
+
+int main(int argc, char* argv[])
+{
+  if ( argc > 3 ) {
+    std::cerr << "Usage: " << argv[0] << " [formula] [numEvaluations]" << std::endl;
+    return 1;
+  }
+
+  std::string formula = ( argc >= 2 ) ?
+    argv[1] : "TMath::Min(0.5, 0.1 + 0.3*TMath::Exp(-0.05*(genJetPt - 10.)))";
+  int numEvaluations = ( argc >= 3 ) ?
+    atoi(argv[2]) : 10000000;
+
+  std::cout << "formula = " << formula << std::endl;
+
+  TString formula_tstring = formula.data();
+  formula_tstring.ReplaceAll("genJetPt", "x");
+  TFormula tFormula("dRmaxGenJetMatch_benchmark", formula_tstring.Data());
+
+  DRmaxGenJetMatchFormula dRmaxGenJetMatch(formula);
+  std::cout << " evaluated by " << ( dRmaxGenJetMatch.isNative() ? "native code" : "TFormula" ) << std::endl;
+
+//--- generate genJetPt values falling steeply, as in QCD events
+  TRandom3 rnd;
+  const int numGenJetPtValues = 100000;
+  std::vector<double> genJetPtValues(numGenJetPtValues);
+  for ( int iGenJetPt = 0; iGenJetPt < numGenJetPtValues; ++iGenJetPt ) {
+    genJetPtValues[iGenJetPt] = 5. + rnd.Exp(20.);
+  }
+
+  TStopwatch clock;
+
+  double sum_tFormula = 0.;
+  clock.Start();
+  for ( int iEvaluation = 0; iEvaluation < numEvaluations; ++iEvaluation ) {
+    sum_tFormula += tFormula.Eval(genJetPtValues[iEvaluation % numGenJetPtValues]);
+  }
+  clock.Stop();
+  double cpuTime_tFormula = clock.CpuTime();
+
+  double sum_native = 0.;
+  clock.Start();
+  for ( int iEvaluation = 0; iEvaluation < numEvaluations; ++iEvaluation ) {
+    sum_native += dRmaxGenJetMatch(genJetPtValues[iEvaluation % numGenJetPtValues]);
+  }
+  clock.Stop();
+  double cpuTime_native = clock.CpuTime();
+
+  double maxDiff = 0.;
+  for ( int iGenJetPt = 0; iGenJetPt < numGenJetPtValues; ++iGenJetPt ) {
+    double diff = TMath::Abs(dRmaxGenJetMatch(genJetPtValues[iGenJetPt]) - tFormula.Eval(genJetPtValues[iGenJetPt]));
+    if ( diff > maxDiff ) maxDiff = diff;
+  }
+
+  std::cout << "TFormula:                " << cpuTime_tFormula << " s (sum = " << sum_tFormula << ")" << std::endl;
+  std::cout << "DRmaxGenJetMatchFormula: " << cpuTime_native << " s (sum = " << sum_native << ")" << std::endl;
+  if ( cpuTime_native > 0. ) std::cout << " speed-up = " << (cpuTime_tFormula/cpuTime_native) << std::endl;
+  std::cout << " max. difference = " << maxDiff << std::endl;
+
+  return 0;
+}
@@ -0,0 +1,53 @@
+
+/** \executable convertJetCorrectorParametersToBinary
+ *
+ * Convert text file with jet energy correction (uncertainty) parameters into binary format,
+ * which is read by JetCorrectorParametersReader instead of the text file if present.
+ *
+ * Usage:
+ *   convertJetCorrectorParametersToBinary inputFileName.txt [outputFileName]
+ *
+ * By default, the binary file is written to inputFileName.txt.bin (same directory as the text file),
+ * where it is found automatically by JetCorrectorParametersReader.
+ *
+ */
+
+#include "PhysicsTools/PatUtils/interface/JetCorrectorParametersReader.h"
+
+#include "FWCore/Utilities/interface/Exception.h"
+
+#include <iostream>
+#include <string>
+
+int main(int argc, char* argv[])
+{
+  if ( argc < 2 || argc > 3 ) {
+    std::cerr << "Usage: " << argv[0] << " inputFileName.txt [outputFileName]" << std::endl;
+    return 1;
+  }
+
+  std::string inputFileName = argv[1];
+  std::string outputFileName = ( argc == 3 ) ?
+    argv[2] : JetCorrectorParametersReader::getBinaryFileName(inputFileName);
+
+  try {
+    JetCorrectorParametersReader reader(inputFileName);
+    std::cout << "Read " << reader.sections().size() << " section(s) from file = " << inputFileName << "." << std::endl;
+    reader.writeBinary(outputFileName);
+    std::cout << "Wrote binary file = " << outputFileName << "." << std::endl;
+
+//--- read back binary file and compare with content of text file
+    if ( outputFileName == JetCorrectorParametersReader::getBinaryFileName(inputFileName) ) {
+      JetCorrectorParametersReader reader_binary(inputFileName);
+      if ( !reader_binary.isLoadedFromBinary() || reader_binary.sections() != reader.sections() ) {
+	std::cerr << "Failed to read back binary file = " << outputFileName << " !!" << std::endl;
+	return 1;
+      }
+    }
+  } catch ( cms::Exception& e ) {
+    std::cerr << e.what() << std::endl;
+    return 1;
+  }
+
+  return 0;
+}
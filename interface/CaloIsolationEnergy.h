@@ -13,9 +13,15 @@
    a half-cone (dependent on the lepton's charge) around the lepton's impact
    position on the ECAL surface, as defined in CMS Note 2006/024
 
+   When computing the isolation of several leptons in the same event,
+   an eta-phi index of the towers can be built once per event by buildTowerIndex
+   and passed to calculate, so that only towers close to the lepton are visited
+
   \author   Steven Lowette
   \version  $Id: CaloIsolationEnergy.h,v 1.2 2008/02/28 14:54:24 llista Exp $
 */
+#include "PhysicsTools/PatUtils/interface/EtaPhiGrid.h"
+
 #include <vector>
 
 class MagneticField;
@@ -38,8 +44,15 @@ namespace pat {
       float calculate(const Electron & anElectron, const std::vector<CaloTower> & theTowers, float isoConeElectron = 0.3) const;
       float calculate(const Muon & aMuon, const std::vector<CaloTower> & theTowers, float isoConeMuon = 0.3) const;
 
+      /// same as above, using an eta-phi index of the towers built by buildTowerIndex (for the same collection of towers)
+      float calculate(const Electron & anElectron, const std::vector<CaloTower> & theTowers, const helper::EtaPhiGrid & towerIndex, float isoConeElectron = 0.3) const;
+      float calculate(const Muon & aMuon, const std::vector<CaloTower> & theTowers, const helper::EtaPhiGrid & towerIndex, float isoConeMuon = 0.3) const;
+
+      /// build eta-phi index of the towers, valid for isolation cones up to maxIsoCone
+      static void buildTowerIndex(const std::vector<CaloTower> & theTowers, float maxIsoCone, helper::EtaPhiGrid & towerIndex);
+
     private:
-      float calculate(const reco::Track & track, const float leptonEnergy, const std::vector<CaloTower> & theTowers, float isoCone) const;
+      float calculate(const reco::Track & track, const float leptonEnergy, const std::vector<CaloTower> & theTowers, const helper::EtaPhiGrid * towerIndex, float isoCone) const;
   };
 
 }
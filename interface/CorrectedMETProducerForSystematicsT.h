@@ -0,0 +1,127 @@
+#ifndef PhysicsTools_PatUtils_CorrectedMETProducerForSystematicsT_h
+#define PhysicsTools_PatUtils_CorrectedMETProducerForSystematicsT_h
+
+/** \class CorrectedMETProducerForSystematicsT
+ *
+ * Produce several corrected MET collections (e.g. for all systematic variations of jet energy scale,
+ * jet energy resolution, lepton energy scales and "unclustered energy") in one module
+ *
+ * NOTE: the correction sets are specified by a 'corrections' VPSet,
+ *       each entry of which defines the instance label of one output collection
+ *       plus the configuration parameters 'applyType1Corrections', 'srcType1Corrections',
+ *       'applyType2Corrections', 'srcUnclEnergySums', 'type2CorrFormula' and 'type2CorrParameter'
+ *       with the same meaning as for CorrectedMETProducerT.
+ *       The corrected MET collections are identical to those produced by one CorrectedMETProducerT module per correction set.
+ *       The collection of uncorrected MET objects is retrieved from the event only once.
+ *
+ */
+
+#include "FWCore/Framework/interface/EDProducer.h"
+#include "FWCore/Framework/interface/Event.h"
+#include "FWCore/Framework/interface/EventSetup.h"
+#include "FWCore/ParameterSet/interface/ParameterSet.h"
+#include "FWCore/Utilities/interface/InputTag.h"
+#include "FWCore/Utilities/interface/Exception.h"
+
+#include "DataFormats/METReco/interface/CorrMETData.h"
+
+#include "JetMETCorrections/Type1MET/interface/CorrectedMETProducerT.h"
+#include "JetMETCorrections/Type1MET/interface/METCorrectionAlgorithm.h"
+
+#include <string>
+#include <vector>
+
+template<typename T>
+class CorrectedMETProducerForSystematicsT : public edm::EDProducer
+{
+  typedef std::vector<T> METCollection;
+
+ public:
+
+  explicit CorrectedMETProducerForSystematicsT(const edm::ParameterSet& cfg)
+    : moduleLabel_(cfg.getParameter<std::string>("@module_label"))
+  {
+    src_ = cfg.getParameter<edm::InputTag>("src");
+
+    typedef std::vector<edm::ParameterSet> vParameterSet;
+    vParameterSet cfgCorrections = cfg.getParameter<vParameterSet>("corrections");
+    for ( vParameterSet::const_iterator cfgCorrection = cfgCorrections.begin();
+	  cfgCorrection != cfgCorrections.end(); ++cfgCorrection ) {
+      corrections_.push_back(new correctionEntryType(*cfgCorrection));
+    }
+    if ( corrections_.size() == 0 )
+      throw cms::Exception("CorrectedMETProducerForSystematics")
+	<< " Configuration parameter 'corrections' must not be empty !!\n";
+
+    for ( typename std::vector<correctionEntryType*>::const_iterator correction = corrections_.begin();
+	  correction != corrections_.end(); ++correction ) {
+      for ( typename std::vector<correctionEntryType*>::const_iterator correction_test = corrections_.begin();
+	    correction_test != correction; ++correction_test ) {
+	if ( (*correction_test)->instanceLabel_ == (*correction)->instanceLabel_ )
+	  throw cms::Exception("CorrectedMETProducerForSystematics")
+	    << " Instance label = '" << (*correction)->instanceLabel_ << "' specified more than once in 'corrections' !!\n";
+      }
+      produces<METCollection>((*correction)->instanceLabel_);
+    }
+  }
+  ~CorrectedMETProducerForSystematicsT()
+  {
+    for ( typename std::vector<correctionEntryType*>::const_iterator it = corrections_.begin();
+	  it != corrections_.end(); ++it ) {
+      delete (*it);
+    }
+  }
+
+ private:
+
+  void produce(edm::Event& evt, const edm::EventSetup& es)
+  {
+    edm::Handle<METCollection> rawMEtCollection;
+    evt.getByLabel(src_, rawMEtCollection);
+
+    static CorrectedMETProducer_namespace::CorrectedMETFactoryT<T> correctedMET_factory;
+
+    for ( typename std::vector<correctionEntryType*>::iterator correction = corrections_.begin();
+	  correction != corrections_.end(); ++correction ) {
+      // CV: MET correction does not depend on uncorrected MET object,
+      //     compute it only once per correction set
+      CorrMETData metCorrection = (*correction)->algorithm_->compMETCorrection(evt, es);
+
+      std::auto_ptr<METCollection> correctedMEtCollection(new METCollection);
+      correctedMEtCollection->reserve(rawMEtCollection->size());
+
+      for ( typename METCollection::const_iterator rawMEt = rawMEtCollection->begin();
+	    rawMEt != rawMEtCollection->end(); ++rawMEt ) {
+	correctedMEtCollection->push_back(correctedMET_factory(*rawMEt, metCorrection));
+      }
+
+      evt.put(correctedMEtCollection, (*correction)->instanceLabel_);
+    }
+  }
+
+  std::string moduleLabel_;
+
+  edm::InputTag src_;
+
+  struct correctionEntryType
+  {
+    correctionEntryType(const edm::ParameterSet& cfg)
+      : instanceLabel_(cfg.getParameter<std::string>("instanceLabel")),
+	algorithm_(new METCorrectionAlgorithm(cfg))
+    {}
+    ~correctionEntryType()
+    {
+      delete algorithm_;
+    }
+    std::string instanceLabel_;
+    METCorrectionAlgorithm* algorithm_;
+
+   private:
+    // not implemented
+    correctionEntryType(const correctionEntryType&);
+    correctionEntryType& operator=(const correctionEntryType&);
+  };
+  std::vector<correctionEntryType*> corrections_;
+};
+
+#endif
@@ -0,0 +1,78 @@
+#ifndef PhysicsTools_PatUtils_CounterBasedRandomGenerator_h
+#define PhysicsTools_PatUtils_CounterBasedRandomGenerator_h
+
+/** \class CounterBasedRandomGenerator
+ *
+ * Generate random numbers which are a function of (label, run, luminosity section, event, counter) only,
+ * e.g. label = module label and counter = index of jet in the event.
+ *
+ * NOTE: in contrast to a sequential random number generator (e.g. TRandom3 with fixed seed),
+ *       the random numbers do not depend on which events have been processed before,
+ *       so that results are reproducible independent of job splitting, skipped events or number of threads.
+ *
+ *       The random numbers are computed by hashing the key (label, run, luminosity section, event) and the counter
+ *       with the 64-bit finalizer of the SplitMix64 generator; Gaussian random numbers are computed by the Box-Muller method.
+ *
+ */
+
+#include <TMath.h>
+
+#include <string>
+#include <stdint.h>
+
+class CounterBasedRandomGenerator
+{
+ public:
+
+  explicit CounterBasedRandomGenerator(const std::string& label)
+    : labelKey_(hashString(label)),
+      eventKey_(labelKey_)
+  {}
+  ~CounterBasedRandomGenerator() {}
+
+  /// set event for which random numbers are to be generated
+  void setEvent(uint32_t run, uint32_t luminosityBlock, uint64_t event)
+  {
+    eventKey_ = mix(labelKey_ ^ mix(((uint64_t)run << 32) ^ luminosityBlock ^ mix(event)));
+  }
+
+  /// uniformly distributed random number in interval (0, 1], for given counter and stream (0 or 1)
+  double uniform(uint64_t counter, unsigned stream = 0) const
+  {
+    uint64_t bits = mix(eventKey_ + (2*counter + stream + 1)*0x9E3779B97F4A7C15ULL);
+    return ((bits >> 11) + 1)*(1./9007199254740992.); // 2^53
+  }
+
+  /// Gaussian distributed random number, for given counter
+  double gaus(uint64_t counter, double mean = 0., double sigma = 1.) const
+  {
+    double u1 = uniform(counter, 0);
+    double u2 = uniform(counter, 1);
+    return mean + sigma*TMath::Sqrt(-2.*TMath::Log(u1))*TMath::Cos(TMath::TwoPi()*u2);
+  }
+
+ private:
+
+  static uint64_t mix(uint64_t x)
+  {
+    x = (x ^ (x >> 30))*0xBF58476D1CE4E5B9ULL;
+    x = (x ^ (x >> 27))*0x94D049BB133111EBULL;
+    return x ^ (x >> 31);
+  }
+
+  static uint64_t hashString(const std::string& value)
+  {
+    uint64_t retVal = 14695981039346656037ULL; // 64-bit FNV-1a
+    for ( std::string::const_iterator c = value.begin();
+	  c != value.end(); ++c ) {
+      retVal ^= (unsigned char)(*c);
+      retVal *= 1099511628211ULL;
+    }
+    return retVal;
+  }
+
+  uint64_t labelKey_;
+  uint64_t eventKey_;
+};
+
+#endif
@@ -0,0 +1,52 @@
+#ifndef PhysicsTools_PatUtils_DRmaxGenJetMatchFormula_h
+#define PhysicsTools_PatUtils_DRmaxGenJetMatchFormula_h
+
+/** \class DRmaxGenJetMatchFormula
+ *
+ * Evaluate maximum distance in dR for matching reconstructed to generator level jets
+ * as function of generator level jet Pt, as given by the 'dRmaxGenJetMatch' configuration parameter
+ * of the SmearedJetProducer modules.
+ *
+ * NOTE: formulas of the standard form
+ *         TMath::Min(a, b + c*TMath::Exp(-d*(genJetPt - e)))
+ *      (used in all PhysicsTools/PatUtils python configuration files)
+ *       are evaluated by native code, avoiding the overhead of TFormula::Eval.
+ *       The native code is checked against TFormula for a set of genJetPt values when the formula is parsed.
+ *       Formulas of any other form are evaluated by TFormula.
+ *
+ */
+
+#include <TFormula.h>
+#include <TMath.h>
+
+#include <string>
+
+class DRmaxGenJetMatchFormula
+{
+ public:
+
+  explicit DRmaxGenJetMatchFormula(const std::string&);
+  ~DRmaxGenJetMatchFormula();
+
+  double operator()(double genJetPt) const
+  {
+    if ( isNative_ ) return TMath::Min(a_, b_ + c_*TMath::Exp(-d_*(genJetPt - e_)));
+    else return formula_->Eval(genJetPt);
+  }
+
+  /// flag indicating whether formula is evaluated by native code (true) or by TFormula (false)
+  bool isNative() const { return isNative_; }
+
+ private:
+
+  // not implemented
+  DRmaxGenJetMatchFormula(const DRmaxGenJetMatchFormula&);
+  DRmaxGenJetMatchFormula& operator=(const DRmaxGenJetMatchFormula&);
+
+  bool isNative_;
+  double a_, b_, c_, d_, e_;
+
+  TFormula* formula_; // used in case formula is not of the standard form
+};
+
+#endif
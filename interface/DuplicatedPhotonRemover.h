@@ -34,6 +34,24 @@ namespace pat {
                     }
             };
 
+            // Prekey for EqualBySuperClusterSeed: objects sharing the same supercluster seed have the same seed key
+            struct SuperClusterSeedKey {
+                template<typename T>
+                    double operator()(const T &t) const { 
+                        return t.superCluster()->seed().key();
+                    }
+                double tolerance() const { return 0.; }
+            };
+
+            // Prekey for EqualBySuperCluster: objects sharing the same supercluster have the same supercluster key
+            struct SuperClusterKey {
+                template<typename T>
+                    double operator()(const T &t) const { 
+                        return t.superCluster().key();
+                    }
+                double tolerance() const { return 0.; }
+            };
+
             /// Indices of duplicated photons (same supercluster) to remove. It keeps the photons with highest energy.
             /// PhotonCollection can be anything that has a "begin()" and "end()", and that hold things which have a "superCluster()" method
             /// notable examples are std::vector<Photon> and edm::View<Photon> (but GsfElectrons work too)
@@ -84,7 +102,7 @@ template<typename PhotonCollection>
 std::auto_ptr< std::vector<size_t> > 
 pat::DuplicatedPhotonRemover::duplicatesBySuperCluster(const PhotonCollection &photons) const {
     typedef typename PhotonCollection::value_type PhotonType;
-    pat::GenericDuplicateRemover<EqualBySuperCluster, GreaterByEt<PhotonType> > dups;
+    pat::GenericDuplicateRemover<EqualBySuperCluster, GreaterByEt<PhotonType>, SuperClusterKey> dups;
     return dups.duplicates(photons);
 }
 
@@ -92,7 +110,7 @@ template<typename PhotonCollection>
 std::auto_ptr< std::vector<size_t> > 
 pat::DuplicatedPhotonRemover::duplicatesBySeed(const PhotonCollection &photons) const {
     typedef typename PhotonCollection::value_type PhotonType;
-    pat::GenericDuplicateRemover<EqualBySuperClusterSeed, GreaterByEt<PhotonType> > dups;
+    pat::GenericDuplicateRemover<EqualBySuperClusterSeed, GreaterByEt<PhotonType>, SuperClusterSeedKey> dups;
     return dups.duplicates(photons);
 }
 
@@ -0,0 +1,130 @@
+#ifndef PhysicsTools_PatUtils_EtaPhiGrid_h
+#define PhysicsTools_PatUtils_EtaPhiGrid_h
+
+/** \class EtaPhiGrid
+ *
+ * Bucket objects in a grid of cells in eta-phi space,
+ * in order to find all objects within a given distance of a point without looping over the full collection.
+ *
+ * NOTE: the size of the cells is chosen such that all objects with |dEta| and |dPhi| smaller than the cellSize
+ *       given to build() are contained in the 3x3 cells around the point.
+ *       The cells are enlarged in case the grid would otherwise contain many more cells than objects.
+ *       Phi is treated as periodic. Objects with non-finite eta or phi are never returned.
+ *       The indices are returned in an unspecified order;
+ *       callers that need to resolve ties in the same way as a plain loop over the collection should compare indices.
+ *
+ */
+
+#include <TMath.h>
+
+#include <vector>
+#include <algorithm>
+#include <cmath>
+
+namespace pat { namespace helper {
+
+class EtaPhiGrid {
+    public:
+        EtaPhiGrid() : etaMin_(0.), cellEta_(1.), cellPhi_(1.), numRows_(0), numCols_(0) { }
+
+        /// (re)build grid for objects at given eta, phi positions
+        void build(const std::vector<double> &etas, const std::vector<double> &phis, double cellSize) ;
+
+        /// append indices of all objects in the 3x3 cells around given eta, phi position to "indices"
+        void findNeighbours(double eta, double phi, std::vector<unsigned> &indices) const ;
+
+        /// number of objects in the grid
+        size_t size() const { return objectIndices_.size(); }
+
+        /// objects within a distance smaller than cellSize in eta and in phi are guaranteed to be found by findNeighbours
+        double cellSize() const { return cellEta_; }
+
+    private:
+        static bool isValid(double eta, double phi) { return (eta == eta && phi == phi && std::fabs(eta) < 1.e+6 && std::fabs(phi) < 1.e+6); }
+
+        int row(double eta) const { return (int)std::floor((eta - etaMin_)/cellEta_); }
+        int col(double phi) const {
+            double phi_0to2pi = phi - TMath::TwoPi()*std::floor(phi/TMath::TwoPi());
+            return std::min((int)std::floor(phi_0to2pi/cellPhi_), numCols_ - 1);
+        }
+
+        double etaMin_;
+        double cellEta_;
+        double cellPhi_;
+        int numRows_;
+        int numCols_;
+        std::vector<unsigned> cellOffsets_;   // objects in cell i are stored at positions cellOffsets_[i] to cellOffsets_[i + 1] - 1,
+        std::vector<unsigned> objectIndices_; // in ascending order of their index
+};
+
+inline void EtaPhiGrid::build(const std::vector<double> &etas, const std::vector<double> &phis, double cellSize) {
+    numRows_ = 0;
+    numCols_ = 0;
+    cellOffsets_.clear();
+    objectIndices_.clear();
+
+    size_t numObjects = std::min(etas.size(), phis.size());
+    size_t numValidObjects = 0;
+    double etaMax = 0.;
+    for (size_t i = 0; i < numObjects; ++i) {
+        if (!isValid(etas[i], phis[i])) continue;
+        if (numValidObjects == 0 || etas[i] < etaMin_) etaMin_ = etas[i];
+        if (numValidObjects == 0 || etas[i] > etaMax)  etaMax  = etas[i];
+        ++numValidObjects;
+    }
+    if (numValidObjects == 0) return;
+
+    // CV: enlarge cells slightly, so that objects at a distance of exactly cellSize
+    //     are not lost to rounding when computing row and column indices
+    cellEta_ = std::max(cellSize, 1.e-3)*(1. + 1.e-4);
+    // CV: limit number of cells to a few per object, so that small cell sizes do not result in a large, mostly empty grid;
+    //     larger cells still contain all objects within cellSize in the 3x3 cells around a point
+    const double maxNumCells = std::max(64., 4.*numValidObjects);
+    while ((std::floor((etaMax - etaMin_)/cellEta_) + 1.)*std::floor(TMath::TwoPi()/cellEta_) > maxNumCells) {
+        cellEta_ *= 2.;
+    }
+    numRows_ = row(etaMax) + 1;
+    numCols_ = std::max(1, (int)std::floor(TMath::TwoPi()/cellEta_));
+    cellPhi_ = TMath::TwoPi()/numCols_;
+
+    // fill cells (counting sort)
+    std::vector<int> cells(numObjects, -1);
+    cellOffsets_.assign(numRows_*numCols_ + 1, 0);
+    for (size_t i = 0; i < numObjects; ++i) {
+        if (!isValid(etas[i], phis[i])) continue;
+        cells[i] = std::min(row(etas[i]), numRows_ - 1)*numCols_ + col(phis[i]);
+        ++cellOffsets_[cells[i] + 1];
+    }
+    for (size_t iCell = 1; iCell < cellOffsets_.size(); ++iCell) {
+        cellOffsets_[iCell] += cellOffsets_[iCell - 1];
+    }
+    objectIndices_.resize(cellOffsets_.back());
+    std::vector<unsigned> positions(cellOffsets_.begin(), cellOffsets_.end() - 1);
+    for (size_t i = 0; i < numObjects; ++i) {
+        if (cells[i] >= 0) objectIndices_[positions[cells[i]]++] = i;
+    }
+}
+
+inline void EtaPhiGrid::findNeighbours(double eta, double phi, std::vector<unsigned> &indices) const {
+    if (numRows_ == 0 || !isValid(eta, phi)) return;
+
+    int row0 = row(eta);
+    if (row0 < -1 || row0 > numRows_) return;
+    int col0 = col(phi);
+
+    int firstRow = std::max(row0 - 1, 0);
+    int lastRow  = std::min(row0 + 1, numRows_ - 1);
+    // CV: visit each column only once in case there are less than three columns
+    int numNeighbourCols = std::min(3, numCols_);
+    for (int iRow = firstRow; iRow <= lastRow; ++iRow) {
+        for (int dCol = 0; dCol < numNeighbourCols; ++dCol) {
+            int iCol = (col0 - 1 + dCol + numCols_) % numCols_;
+            int iCell = iRow*numCols_ + iCol;
+            indices.insert(indices.end(), objectIndices_.begin() + cellOffsets_[iCell], objectIndices_.begin() + cellOffsets_[iCell + 1]);
+        }
+    }
+}
+
+} } // namespace
+
+#endif
@@ -3,11 +3,22 @@
 
 #include <memory>
 #include <vector>
+#include <algorithm>
 #include <sys/types.h>
 
 namespace pat {
 
-    template <typename Comparator, typename Arbitrator>
+    /// Default "pre-key" of GenericDuplicateRemover: compare all pairs of items
+    struct NoPrekey {
+    }; // struct
+
+    /// The optional Prekey is a cheap function of one item, used to skip pairs of items that cannot be duplicates:
+    ///    prekey(x) returns a (finite) double, prekey.tolerance() returns a double >= 0
+    /// and it must hold that comparator(x1, x2) == true implies |prekey(x1) - prekey(x2)| <= tolerance
+    /// (e.g. prekey = key of supercluster seed with tolerance 0 for comparators checking the supercluster seed).
+    /// Items are then sorted by their prekey and the comparator and arbitrator are run only on pairs of items with compatible prekeys,
+    /// in the same order as without prekey, so that the indices of duplicated items are identical.
+    template <typename Comparator, typename Arbitrator, typename Prekey = NoPrekey>
     class GenericDuplicateRemover {
 
         public:
@@ -15,6 +26,7 @@ namespace pat {
            GenericDuplicateRemover() {}
            GenericDuplicateRemover(const Comparator &comp) : comparator_(comp) {}
            GenericDuplicateRemover(const Comparator &comp, const Arbitrator &arbiter) : comparator_(comp), arbiter_(arbiter) {}
+           GenericDuplicateRemover(const Comparator &comp, const Arbitrator &arbiter, const Prekey &prekey) : comparator_(comp), arbiter_(arbiter), prekey_(prekey) {}
             
            ~GenericDuplicateRemover() {}
 
@@ -28,21 +40,48 @@ namespace pat {
             duplicates(const Collection &items) const ;
 
         private:
+            /// mark duplicated items by comparing all pairs of items
+            template <typename Collection>
+            void markDuplicates(const Collection &items, const NoPrekey &, std::vector<bool> &bad) const ;
+
+            /// mark duplicated items by comparing pairs of items with compatible prekeys only
+            template <typename Collection, typename AnyPrekey>
+            void markDuplicates(const Collection &items, const AnyPrekey &prekey, std::vector<bool> &bad) const ;
+
             Comparator comparator_;
             Arbitrator   arbiter_;
+            Prekey       prekey_;
 
     }; // class
 }
 
-template<typename Comparator, typename Arbitrator>
+template<typename Comparator, typename Arbitrator, typename Prekey>
 template<typename Collection>
 std::auto_ptr< std::vector<size_t> >
-pat::GenericDuplicateRemover<Comparator,Arbitrator>::duplicates(const Collection &items) const 
+pat::GenericDuplicateRemover<Comparator,Arbitrator,Prekey>::duplicates(const Collection &items) const 
 {
     size_t size = items.size();
 
     std::vector<bool> bad(size, false);
 
+    markDuplicates(items, prekey_, bad);
+
+    std::auto_ptr< std::vector<size_t> > ret(new std::vector<size_t>());
+
+    for (size_t i = 0; i < size; ++i) {
+        if (bad[i]) ret->push_back(i);
+    }
+
+    return ret;
+}
+
+template<typename Comparator, typename Arbitrator, typename Prekey>
+template<typename Collection>
+void
+pat::GenericDuplicateRemover<Comparator,Arbitrator,Prekey>::markDuplicates(const Collection &items, const NoPrekey &, std::vector<bool> &bad) const 
+{
+    size_t size = items.size();
+
     for (size_t ie = 0; ie < size; ++ie) {
         if (bad[ie]) continue; // if already marked bad
 
@@ -56,14 +95,53 @@ pat::GenericDuplicateRemover<Comparator,Arbitrator>::duplicates(const Collection
             }
         }
     }
+}
 
-    std::auto_ptr< std::vector<size_t> > ret(new std::vector<size_t>());
-
+template<typename Comparator, typename Arbitrator, typename Prekey>
+template<typename Collection, typename AnyPrekey>
+void
+pat::GenericDuplicateRemover<Comparator,Arbitrator,Prekey>::markDuplicates(const Collection &items, const AnyPrekey &prekey, std::vector<bool> &bad) const 
+{
+    size_t size = items.size();
+    // CV: no pair to compare; return before computing prekeys,
+    //     which may dereference references (e.g. to the superCluster) of the items
+    if (size < 2) return;
+    double tolerance = prekey.tolerance();
+
+    // sort items by prekey (ties by index)
+    std::vector<double> keys(size);
+    std::vector< std::pair<double, size_t> > sortedKeys(size);
     for (size_t i = 0; i < size; ++i) {
-        if (bad[i]) ret->push_back(i);
+        keys[i] = prekey(items[i]);
+        sortedKeys[i] = std::make_pair(keys[i], i);
     }
+    std::sort(sortedKeys.begin(), sortedKeys.end());
 
-    return ret;
+    std::vector<size_t> candidates;
+    for (size_t ie = 0; ie < size; ++ie) {
+        if (bad[ie]) continue; // if already marked bad
+
+        // CV: select items of higher index with compatible prekey
+        //     and visit them in order of increasing index, as in the loop over all pairs
+        candidates.clear();
+        std::vector< std::pair<double, size_t> >::const_iterator first = std::lower_bound(
+            sortedKeys.begin(), sortedKeys.end(), std::make_pair(keys[ie] - tolerance, (size_t)0));
+        for (std::vector< std::pair<double, size_t> >::const_iterator it = first;
+             it != sortedKeys.end() && it->first <= keys[ie] + tolerance; ++it) {
+            if (it->second > ie) candidates.push_back(it->second);
+        }
+        std::sort(candidates.begin(), candidates.end());
+
+        for (std::vector<size_t>::const_iterator je = candidates.begin(); je != candidates.end(); ++je) {
+
+            if (bad[*je]) continue; // if already marked bad
+
+            if ( comparator_(items[ie], items[*je]) ) {
+                int toRemove = arbiter_(items[ie], items[*je]) ? *je : ie;
+                bad[toRemove] = true;
+            }
+        }
+    }
 }
 
 
@@ -2,6 +2,7 @@
 #define PhysicsTools_PatUtils_GenericOverlapFinder_h
 
 #include "DataFormats/Math/interface/deltaR.h"
+#include "PhysicsTools/PatUtils/interface/EtaPhiGrid.h"
 
 #include <memory>
 #include <vector>
@@ -42,6 +43,8 @@ namespace pat {
             double operator()(const T1 &t1, const T2 &t2) const {
                 return deltaR2(t1,t2) * scale_;
             }
+            /// the maximum deltaR for which two items overlap
+            double deltaR() const { return 1.0/sqrt(scale_); }
         private:
             double scale_;
     }; //struct
@@ -66,6 +69,36 @@ namespace pat {
             Distance distance_;
 
     }; // class
+
+    /// Same as GenericOverlapFinder<OverlapByDeltaR>, but the items of the other collection
+    /// are bucketed in an eta-phi grid with cells of size deltaR,
+    /// so that each item is compared only to the items of the other collection in the neighbouring cells.
+    /// The OverlapList is identical to the one of GenericOverlapFinder<OverlapByDeltaR>
+    /// (in case of equal distance, the item of lowest index in the other collection is taken as "best" match).
+    /// For small collections, the grid is not used and all pairs are compared.
+    class DeltaROverlapFinder {
+
+        public:
+
+            DeltaROverlapFinder(double deltaR, size_t minPairsForGrid = 256) : distance_(deltaR), minPairsForGrid_(minPairsForGrid) {}
+
+            /// Indices of overlapped items, and of the nearest item on they overlap with
+            /// Items are considered to overlap if deltaR(x1,x2) < deltaR
+            /// both Collections can be vectors, Views, or anything with the same interface
+            template <typename Collection, typename OtherCollection>
+            std::auto_ptr< OverlapList >
+            find(const Collection &items, const OtherCollection &other) const ;
+
+        private:
+            OverlapByDeltaR distance_;
+            size_t minPairsForGrid_;
+
+            // CV: grid and buffer are reused in subsequent calls, to avoid memory allocations
+            mutable helper::EtaPhiGrid grid_;
+            mutable std::vector<double> etas_, phis_;
+            mutable std::vector<unsigned> neighbours_;
+
+    }; // class
 }
 
 template<typename Distance>
@@ -94,5 +127,44 @@ pat::GenericOverlapFinder<Distance>::find(const Collection &items, const OtherCo
     return ret;
 }
 
+template<typename Collection, typename OtherCollection>
+std::auto_ptr< pat::OverlapList >
+pat::DeltaROverlapFinder::find(const Collection &items, const OtherCollection &other) const 
+{
+    size_t size = items.size(), size2 = other.size();
+
+    if (size*size2 < minPairsForGrid_) {
+        return GenericOverlapFinder<OverlapByDeltaR>(distance_).find(items, other);
+    }
+
+    etas_.resize(size2);
+    phis_.resize(size2);
+    for (size_t je = 0; je < size2; ++je) {
+        etas_[je] = other[je].eta();
+        phis_[je] = other[je].phi();
+    }
+    grid_.build(etas_, phis_, distance_.deltaR());
+
+    std::auto_ptr< OverlapList > ret(new OverlapList());
+    
+    for (size_t ie = 0; ie < size; ++ie) {
+        double dmin   = 1.0;
+        size_t match = 0;
+
+        neighbours_.clear();
+        grid_.findNeighbours(items[ie].eta(), items[ie].phi(), neighbours_);
+        for (std::vector<unsigned>::const_iterator je = neighbours_.begin(); je != neighbours_.end(); ++je) {
+            double dist = distance_(items[ie], other[*je]);
+            if (dist < dmin || (dist == dmin && dmin < 1.0 && *je < match)) { match = *je; dmin = dist;  }
+        }
+        
+        if (dmin < 1.0) {
+            ret->push_back(std::make_pair(ie,match));
+        }
+    }
+
+    return ret;
+}
+
 
 #endif
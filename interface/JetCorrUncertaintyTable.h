@@ -0,0 +1,79 @@
+#ifndef PhysicsTools_PatUtils_JetCorrUncertaintyTable_h
+#define PhysicsTools_PatUtils_JetCorrUncertaintyTable_h
+
+/** \class JetCorrUncertaintyTable
+ *
+ * Precomputed lookup table for jet energy scale uncertainties,
+ * built once per payload from JetCorrectorParameters with one bin variable (JetEta) and one parameter variable (JetPt)
+ * and meant as drop-in replacement for JetCorrectionUncertainty in the innermost loops of the shift producers.
+ *
+ * NOTE: the eta bin is found in constant time via a uniform grid of cells,
+ *       each of which holds the (few) eta bins overlapping it.
+ *       The slope and intercept of each pt segment are precomputed
+ *       using the same single-precision arithmetic as SimpleJetCorrectionUncertainty,
+ *       so that the uncertainties agree with those computed by JetCorrectionUncertainty
+ *       up to floating-point rounding (relative difference < 1.e-6).
+ *       As for JetCorrectionUncertainty, -999 is returned in case eta is outside the range covered by the payload.
+ *
+ *       Modules reading the parameters from a text file should obtain the table via JetCorrUncertaintyTable::get,
+ *       in order to share one read-only copy between all modules in the process.
+ *
+ */
+
+#include "CondFormats/JetMETObjects/interface/JetCorrectorParameters.h"
+
+#include "PhysicsTools/PatUtils/interface/JetCorrectorParametersReader.h"
+
+#include <boost/shared_ptr.hpp>
+
+#include <string>
+#include <vector>
+
+class JetCorrUncertaintyTable
+{
+ public:
+
+  explicit JetCorrUncertaintyTable(const JetCorrectorParameters&);
+  ~JetCorrUncertaintyTable() {}
+
+  /// get table for given section of file read by JetCorrectorParametersReader;
+  /// the table is built only once per process and shared by all callers requesting the same section
+  static boost::shared_ptr<const JetCorrUncertaintyTable> get(const JetCorrectorParametersReader&, const std::string&);
+
+  /// relative uncertainty for upward (direction = true) or downward (direction = false) variation of jet energy
+  float getUncertainty(double eta, double pt, bool direction) const;
+
+ private:
+
+  int findEtaBin(float) const;
+  unsigned findPtSegment(unsigned, float) const;
+
+//--- eta binning
+  std::vector<float> etaMin_;
+  std::vector<float> etaMax_;
+
+//--- uniform grid of cells in eta,
+//    storing for each cell the indices of all eta bins overlapping the cell (in ascending order)
+  double cellEtaMin_;
+  double cellEtaMax_;
+  double cellWidth_;
+  unsigned numCells_;
+  std::vector<unsigned> cellOffsets_;
+  std::vector<unsigned> cellEtaBins_;
+
+//--- pt nodes, uncertainties and slope/intercept of linear interpolation between nodes, for each eta bin;
+//    the entries for eta bin i are stored at positions nodeOffsets_[i] to nodeOffsets_[i + 1] - 1
+  std::vector<unsigned> nodeOffsets_;
+  std::vector<bool> isSorted_; // flag indicating that pt nodes are in ascending order (true for all payloads in practice)
+  std::vector<float> ptNodes_;
+  struct directionEntryType
+  {
+    std::vector<float> values_;
+    std::vector<float> slopes_;
+    std::vector<float> intercepts_;
+  };
+  directionEntryType up_;
+  directionEntryType down_;
+};
+
+#endif
@@ -0,0 +1,104 @@
+#ifndef PhysicsTools_PatUtils_JetCorrectorParametersReader_h
+#define PhysicsTools_PatUtils_JetCorrectorParametersReader_h
+
+/** \class JetCorrectorParametersReader
+ *
+ * Read all sections of a text file with jet energy correction (uncertainty) parameters,
+ * e.g. the [Source] sections of PhysicsTools/PatUtils/data/Fall12_V7_DATA_UncertaintySources_AK5PF.txt,
+ * in a single pass.
+ *
+ * NOTE: the JetCorrectorParameters(fileName, section) constructor re-reads the whole file for each section.
+ *       This class reads the file only once and converts the lines of a section
+ *       into a JetCorrectorParameters object upon first request of that section.
+ *
+ *       In case a binary file with the same name plus ".bin" suffix exists
+ *      (created by the convertJetCorrectorParametersToBinary executable)
+ *       and has been made from a text file of identical content (checked by a checksum stored in the binary file),
+ *       the parameters are loaded from the binary file, which avoids parsing the floating-point numbers in the text.
+ *
+ *       Modules should obtain the parameters via JetCorrectorParametersReader::get,
+ *       in order to share one read-only copy between all modules in the process.
+ *
+ */
+
+#include "CondFormats/JetMETObjects/interface/JetCorrectorParameters.h"
+
+#include <boost/shared_ptr.hpp>
+
+#include <string>
+#include <vector>
+#include <map>
+#include <iostream>
+#include <stdint.h>
+
+class JetCorrectorParametersReader
+{
+ public:
+
+  explicit JetCorrectorParametersReader(const std::string&);
+  ~JetCorrectorParametersReader();
+
+  /// get reader for given text file; the file is read only once per process
+  /// and the returned reader is shared by all callers requesting the same file
+  static boost::shared_ptr<const JetCorrectorParametersReader> get(const std::string&);
+
+  /// name of file from which the parameters have been read
+  const std::string& inputFileName() const { return inputFileName_; }
+
+  /// flag indicating whether the parameters have been loaded from the binary file
+  bool isLoadedFromBinary() const { return isLoadedFromBinary_; }
+
+  /// checksum of the content of the text file
+  uint64_t checksum() const { return checksum_; }
+
+  /// names of all sections, in the order in which they appear in the file
+  /// (the name of the section is an empty string in case the file is not divided into sections)
+  const std::vector<std::string>& sections() const { return sections_; }
+
+  bool hasSection(const std::string&) const;
+
+  /// parameters for given section (throws an exception in case the section does not exist)
+  const JetCorrectorParameters& parameters(const std::string&) const;
+
+  /// write parameters of all sections to binary file
+  void writeBinary(const std::string&) const;
+
+  /// name of binary file that is looked for when reading given text file
+  static std::string getBinaryFileName(const std::string& inputFileName) { return inputFileName + ".bin"; }
+
+ private:
+
+  struct sectionEntryType
+  {
+    sectionEntryType()
+      : parameters_(0)
+    {}
+    ~sectionEntryType()
+    {
+      delete parameters_;
+    }
+    std::string definitions_;
+    std::vector<std::string> records_;
+    JetCorrectorParameters* parameters_; // created upon first access
+  };
+
+  // not implemented
+  JetCorrectorParametersReader(const JetCorrectorParametersReader&);
+  JetCorrectorParametersReader& operator=(const JetCorrectorParametersReader&);
+
+  void readText(std::istream&);
+  bool readBinary(const std::string&);
+
+  sectionEntryType* addSection(const std::string&);
+
+  std::string inputFileName_;
+
+  bool isLoadedFromBinary_;
+  uint64_t checksum_;
+
+  std::vector<std::string> sections_;
+  typedef std::map<std::string, sectionEntryType*> sectionMap;
+  mutable sectionMap sectionEntries_;
+};
+
+#endif
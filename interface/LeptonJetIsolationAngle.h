@@ -13,6 +13,9 @@
    given jets as the minimal angle to a jet in Euclidean space, as defined in
    CMS Note 2006/024
 
+   The directions of the jets (cleaned from isolated electrons) are computed
+   once per event and track collection, and reused for all leptons of the event
+
   \author   Steven Lowette
   \version  $Id: LeptonJetIsolationAngle.h,v 1.3 2008/03/05 14:51:02 fronga Exp $
 */
@@ -20,12 +23,17 @@
 
 #include "FWCore/Framework/interface/Event.h"
 #include "DataFormats/Common/interface/Handle.h"
-#include "CLHEP/Vector/LorentzVector.h"
+#include "DataFormats/Math/interface/Vector3D.h"
+#include "DataFormats/Provenance/interface/EventID.h"
+#include "DataFormats/Provenance/interface/ProductID.h"
 
 #include "DataFormats/PatCandidates/interface/Electron.h"
 #include "DataFormats/PatCandidates/interface/Muon.h"
 #include "DataFormats/PatCandidates/interface/Jet.h"
 #include "PhysicsTools/PatUtils/interface/TrackerIsolationPt.h"
+#include "PhysicsTools/PatUtils/interface/EtaPhiGrid.h"
+
+#include <vector>
 
 
 namespace pat {
@@ -43,13 +51,23 @@ namespace pat {
 
     private:
 
-      float calculate(const CLHEP::HepLorentzVector & aLepton, const edm::Handle<edm::View<reco::Track> > & trackHandle, const edm::Event & iEvent);
-      float spaceAngle(const CLHEP::HepLorentzVector & aLepton, const reco::CaloJet & aJet);
+      float calculate(const math::XYZVector & aLeptonDirection, const edm::Handle<edm::View<reco::Track> > & trackHandle, const edm::Event & iEvent);
+      void  update(const edm::Handle<edm::View<reco::Track> > & trackHandle, const edm::Event & iEvent);
 
     private:
 
       TrackerIsolationPt trkIsolator_;
 
+      // per-event cache: unit vectors along the jets cleaned from isolated electrons,
+      // valid for the event and track collection given below
+      // (track collection identified by its ProductID, address and size)
+      edm::EventID cachedEventID_;
+      edm::ProductID cachedTrackProductID_;
+      const edm::View<reco::Track> * cachedTrackProduct_;
+      size_t cachedTrackCollectionSize_;
+      std::vector<math::XYZVector> jetDirections_;
+      helper::EtaPhiGrid trackIndex_;
+
   };
 
 
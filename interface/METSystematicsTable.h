@@ -0,0 +1,81 @@
+#ifndef PhysicsTools_PatUtils_METSystematicsTable_h
+#define PhysicsTools_PatUtils_METSystematicsTable_h
+
+/** \class METSystematicsTable
+ *
+ * Compact table of px, py and sumEt of MET for a list of named systematic variations
+ * (e.g. 'patType1CorrectedPFMetJetEnUp', 'patType1CorrectedPFMetJetEnDown', ...)
+ *
+ * NOTE: the values are stored in parallel arrays of single precision,
+ *       so that analyses which need only px, py and sumEt of the shifted MET
+ *       do not need to keep one full pat::MET collection per systematic variation in the event content.
+ *       The names of the variations are stored in every event, so that the table is self-describing
+ *       and does not depend on run or provenance information being available when reading it back.
+ *       For the O(30) variations produced by the MET uncertainty tools this amounts to O(1 kB) per event
+ *       before compression; as the names are identical in all events, they compress to almost nothing.
+ *       index() does a linear search by string comparison: call it once per variation
+ *       (e.g. in the first event or in beginJob) and keep the index, rather than calling it per event and variation.
+ *
+ */
+
+#include <string>
+#include <vector>
+#include <math.h>
+
+namespace pat {
+
+  class METSystematicsTable {
+
+   public:
+
+    METSystematicsTable() {}
+    ~METSystematicsTable() {}
+
+    /// add variation of given name;
+    /// NOTE: names are expected to be unique, the first variation of given name is returned by index()
+    void addVariation(const std::string& name, float mex, float mey, float sumEt)
+    {
+      names_.push_back(name);
+      mex_.push_back(mex);
+      mey_.push_back(mey);
+      sumEt_.push_back(sumEt);
+    }
+
+    /// number of variations
+    size_t size() const { return names_.size(); }
+
+    /// index of variation of given name (-1 in case the table does not contain a variation of that name);
+    /// NOTE: linear search, cache the result instead of calling this function for every event
+    int index(const std::string& name) const
+    {
+      for ( size_t idx = 0; idx < names_.size(); ++idx ) {
+        if ( names_[idx] == name ) return idx;
+      }
+      return -1;
+    }
+
+    /// name, px, py, sumEt, Pt and phi of variation with given index
+    const std::string& name(size_t idx) const { return names_[idx]; }
+    float px(size_t idx) const { return mex_[idx]; }
+    float py(size_t idx) const { return mey_[idx]; }
+    float sumEt(size_t idx) const { return sumEt_[idx]; }
+    float pt(size_t idx) const { return sqrt(mex_[idx]*mex_[idx] + mey_[idx]*mey_[idx]); }
+    float phi(size_t idx) const { return atan2(mey_[idx], mex_[idx]); }
+
+    /// arrays of names, px, py and sumEt of all variations
+    const std::vector<std::string>& names() const { return names_; }
+    const std::vector<float>& px() const { return mex_; }
+    const std::vector<float>& py() const { return mey_; }
+    const std::vector<float>& sumEt() const { return sumEt_; }
+
+   private:
+
+    std::vector<std::string> names_;
+    std::vector<float> mex_;
+    std::vector<float> mey_;
+    std::vector<float> sumEt_;
+  };
+
+}
+
+#endif
@@ -0,0 +1,57 @@
+#ifndef PhysicsTools_PatUtils_SharedInstance_h
+#define PhysicsTools_PatUtils_SharedInstance_h
+
+/** \fn getSharedInstance
+ *
+ * Process-wide registry of objects (e.g. lookup tables read from file)
+ * that are shared by all modules requesting the object with the same key
+ *
+ * NOTE: the object is created by calling factory() (by new T(key) in case no factory is given)
+ *       when the first module requests it. It is released when the last module holding it is destroyed.
+ *       Each type T should be requested from one place only (typically a static T::get function),
+ *       so that there is exactly one registry per type.
+ *
+ */
+
+#include <boost/shared_ptr.hpp>
+#include <boost/weak_ptr.hpp>
+
+#include <map>
+
+namespace pat { namespace helper {
+
+template <typename T, typename Tkey, typename Tfactory>
+boost::shared_ptr<T> getSharedInstance(const Tkey& key, const Tfactory& factory)
+{
+  // CV: keep only weak references, so that memory gets released once all modules using the object are destroyed.
+  //     No locking needed, as modules get constructed sequentially by the framework.
+  typedef std::map<Tkey, boost::weak_ptr<T> > instanceMap;
+  static instanceMap instances;
+
+  boost::weak_ptr<T>& instanceEntry = instances[key];
+  boost::shared_ptr<T> instance = instanceEntry.lock();
+  if ( !instance ) {
+    instance.reset(factory());
+    instanceEntry = instance;
+  }
+
+  return instance;
+}
+
+template <typename T, typename Tkey>
+struct SharedInstanceFromKeyT
+{
+  explicit SharedInstanceFromKeyT(const Tkey& key) : key_(key) {}
+  T* operator()() const { return new T(key_); }
+  const Tkey& key_;
+};
+
+template <typename T, typename Tkey>
+boost::shared_ptr<T> getSharedInstance(const Tkey& key)
+{
+  return getSharedInstance<T>(key, SharedInstanceFromKeyT<T, Tkey>(key));
+}
+
+} }
+
+#endif
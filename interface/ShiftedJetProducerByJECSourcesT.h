@@ -0,0 +1,183 @@
+#ifndef PhysicsTools_PatUtils_ShiftedJetProducerByJECSourcesT_h
+#define PhysicsTools_PatUtils_ShiftedJetProducerByJECSourcesT_h
+
+/** \class ShiftedJetProducerByJECSourcesT
+ *
+ * Vary energy of jets by +/- 1 standard deviation of each individual source of jet energy scale uncertainty,
+ * in order to estimate resulting uncertainty on MET
+ *
+ * NOTE: the file containing the parameters of all uncertainty sources
+ *      (e.g. PhysicsTools/PatUtils/data/Fall12_V7_DATA_UncertaintySources_AK5PF.txt)
+ *       is read only once per process and shared by all modules using the same file.
+ *       For each source, the relative jet energy uncertainty is stored in a ValueMap (instance label = name of source)
+ *       and, optionally, collections of jets shifted up and down in energy are produced
+ *      (instance labels = name of source + "Up"/"Down").
+ *
+ */
+
+#include "FWCore/Framework/interface/EDProducer.h"
+#include "FWCore/Framework/interface/Event.h"
+#include "FWCore/Framework/interface/EventSetup.h"
+#include "FWCore/ParameterSet/interface/ParameterSet.h"
+#include "FWCore/ParameterSet/interface/FileInPath.h"
+#include "FWCore/Utilities/interface/InputTag.h"
+#include "FWCore/Utilities/interface/Exception.h"
+
+#include "CondFormats/JetMETObjects/interface/JetCorrectorParameters.h"
+#include "DataFormats/Common/interface/Handle.h"
+#include "DataFormats/Common/interface/ValueMap.h"
+#include "DataFormats/Candidate/interface/Candidate.h"
+
+#include "PhysicsTools/PatUtils/interface/JetCorrectorParametersReader.h"
+#include "PhysicsTools/PatUtils/interface/JetCorrUncertaintyTable.h"
+
+#include <string>
+#include <vector>
+
+template <typename T>
+class ShiftedJetProducerByJECSourcesT : public edm::EDProducer
+{
+  typedef std::vector<T> JetCollection;
+  typedef edm::ValueMap<float> JetUncertaintyMap;
+
+ public:
+
+  explicit ShiftedJetProducerByJECSourcesT(const edm::ParameterSet& cfg)
+    : moduleLabel_(cfg.getParameter<std::string>("@module_label")),
+      src_(cfg.getParameter<edm::InputTag>("src"))
+  {
+    jetCorrInputFileName_ = cfg.getParameter<edm::FileInPath>("jetCorrInputFileName");
+    if ( !jetCorrInputFileName_.isLocal()) throw cms::Exception("ShiftedJetProducerByJECSourcesT")
+      << " Failed to find JEC parameter file = " << jetCorrInputFileName_ << " !!\n";
+    std::cout << "Reading JEC uncertainty sources from file = " << jetCorrInputFileName_.fullPath() << "." << std::endl;
+    jetCorrParametersReader_ = JetCorrectorParametersReader::get(jetCorrInputFileName_.fullPath());
+
+//--- use all uncertainty sources defined in file unless a subset is specified explicitely
+    std::vector<std::string> jetCorrUncertaintyTags = ( cfg.exists("jetCorrUncertaintyTags") ) ?
+      cfg.getParameter<std::vector<std::string> >("jetCorrUncertaintyTags") : std::vector<std::string>();
+    if ( jetCorrUncertaintyTags.size() == 0 ) jetCorrUncertaintyTags = jetCorrParametersReader_->sections();
+
+    for ( std::vector<std::string>::const_iterator jetCorrUncertaintyTag = jetCorrUncertaintyTags.begin();
+	  jetCorrUncertaintyTag != jetCorrUncertaintyTags.end(); ++jetCorrUncertaintyTag ) {
+      if ( (*jetCorrUncertaintyTag) == "" )
+	throw cms::Exception("ShiftedJetProducerByJECSourcesT")
+	  << " File = " << jetCorrInputFileName_.fullPath() << " is not divided into uncertainty sources !!\n";
+      sources_.push_back(new sourceEntryType(*jetCorrUncertaintyTag, JetCorrUncertaintyTable::get(*jetCorrParametersReader_, *jetCorrUncertaintyTag)));
+    }
+
+    shiftBy_ = ( cfg.exists("shiftBy") ) ?
+      cfg.getParameter<double>("shiftBy") : 1.;
+
+    produceShiftedJets_ = ( cfg.exists("produceShiftedJets") ) ?
+      cfg.getParameter<bool>("produceShiftedJets") : true;
+
+    verbosity_ = ( cfg.exists("verbosity") ) ?
+      cfg.getParameter<int>("verbosity") : 0;
+
+    for ( typename std::vector<sourceEntryType*>::const_iterator source = sources_.begin();
+	  source != sources_.end(); ++source ) {
+      produces<JetUncertaintyMap>((*source)->name_);
+      if ( produceShiftedJets_ ) {
+	produces<JetCollection>((*source)->getInstanceLabelUp());
+	produces<JetCollection>((*source)->getInstanceLabelDown());
+      }
+    }
+  }
+  ~ShiftedJetProducerByJECSourcesT()
+  {
+    for ( typename std::vector<sourceEntryType*>::const_iterator it = sources_.begin();
+	  it != sources_.end(); ++it ) {
+      delete (*it);
+    }
+  }
+
+ private:
+
+  void produce(edm::Event& evt, const edm::EventSetup& es)
+  {
+    if ( verbosity_ ) {
+      std::cout << "<ShiftedJetProducerByJECSourcesT::produce>:" << std::endl;
+      std::cout << " moduleLabel = " << moduleLabel_ << std::endl;
+      std::cout << " src = " << src_.label() << std::endl;
+    }
+
+    edm::Handle<JetCollection> originalJets;
+    evt.getByLabel(src_, originalJets);
+
+    size_t numJets = originalJets->size();
+
+    std::vector<float> jecUncertainties(numJets);
+    for ( typename std::vector<sourceEntryType*>::iterator source = sources_.begin();
+	  source != sources_.end(); ++source ) {
+      std::auto_ptr<JetCollection> shiftedJetsUp(new JetCollection);
+      std::auto_ptr<JetCollection> shiftedJetsDown(new JetCollection);
+      if ( produceShiftedJets_ ) {
+	shiftedJetsUp->reserve(numJets);
+	shiftedJetsDown->reserve(numJets);
+      }
+
+      for ( size_t iJet = 0; iJet < numJets; ++iJet ) {
+	const T& originalJet = (*originalJets)[iJet];
+	reco::Candidate::LorentzVector originalJetP4 = originalJet.p4();
+
+	double jecUncertainty = (*source)->jecUncertaintyTable_->getUncertainty(originalJetP4.eta(), originalJetP4.pt(), true);
+	if ( verbosity_ ) {
+	  std::cout << "jet #" << iJet << " (Pt = " << originalJetP4.pt() << ", eta = " << originalJetP4.eta() << "):"
+		    << " uncertainty(" << (*source)->name_ << ") = " << jecUncertainty << std::endl;
+	}
+	jecUncertainties[iJet] = jecUncertainty;
+
+	if ( produceShiftedJets_ ) {
+	  double shift = shiftBy_*jecUncertainty;
+	  shiftedJetsUp->push_back(originalJet);
+	  shiftedJetsUp->back().setP4((1. + shift)*originalJetP4);
+	  shiftedJetsDown->push_back(originalJet);
+	  shiftedJetsDown->back().setP4((1. - shift)*originalJetP4);
+	}
+      }
+
+      std::auto_ptr<JetUncertaintyMap> jetUncertaintyMap(new JetUncertaintyMap);
+      typename JetUncertaintyMap::Filler valueMapFiller(*jetUncertaintyMap);
+      valueMapFiller.insert(originalJets, jecUncertainties.begin(), jecUncertainties.end());
+      valueMapFiller.fill();
+      evt.put(jetUncertaintyMap, (*source)->name_);
+
+      if ( produceShiftedJets_ ) {
+	evt.put(shiftedJetsUp, (*source)->getInstanceLabelUp());
+	evt.put(shiftedJetsDown, (*source)->getInstanceLabelDown());
+      }
+    }
+  }
+
+  std::string moduleLabel_;
+
+  edm::InputTag src_;
+
+  edm::FileInPath jetCorrInputFileName_;
+  boost::shared_ptr<const JetCorrectorParametersReader> jetCorrParametersReader_;
+
+  struct sourceEntryType
+  {
+    sourceEntryType(const std::string& name, const boost::shared_ptr<const JetCorrUncertaintyTable>& jecUncertaintyTable)
+      : name_(name),
+	jecUncertaintyTable_(jecUncertaintyTable)
+    {}
+    ~sourceEntryType() {}
+    std::string getInstanceLabelUp() const { return name_ + "Up"; }
+    std::string getInstanceLabelDown() const { return name_ + "Down"; }
+    std::string name_;
+    boost::shared_ptr<const JetCorrUncertaintyTable> jecUncertaintyTable_;
+  };
+  std::vector<sourceEntryType*> sources_;
+
+  double shiftBy_; // number of standard deviations by which jet energies are shifted up/down
+
+  bool produceShiftedJets_; // flag to enable/disable production of shifted jet collections
+                            // (in addition to ValueMaps of jet energy uncertainties)
+
+  int verbosity_; // flag to enabled/disable debug output
+};
+
+#endif
+
+
@@ -8,6 +8,11 @@
  *
  * NOTE: energy scale uncertainties are taken from the Database
  *
+ *       Several shifted jet collections can be produced in one pass
+ *       by specifying a 'shifts' VPSet, each entry of which defines
+ *       the instance label, the shiftBy value and the addResidualJES flag of one output collection.
+ *       The jet energy uncertainty (and residual correction) is computed only once per jet in that case.
+ *
  * \author Christian Veelken, LLR
  *
  * \version $Revision: 1.4 $
@@ -27,14 +32,16 @@
 #include "JetMETCorrections/Objects/interface/JetCorrectionsRecord.h"
 #include "JetMETCorrections/Type1MET/interface/JetCorrExtractorT.h"
 #include "CondFormats/JetMETObjects/interface/JetCorrectorParameters.h"
-#include "CondFormats/JetMETObjects/interface/JetCorrectionUncertainty.h"
 #include "FWCore/Framework/interface/ESHandle.h"
 
 #include "PhysicsTools/PatUtils/interface/SmearedJetProducerT.h"
+#include "PhysicsTools/PatUtils/interface/JetCorrectorParametersReader.h"
+#include "PhysicsTools/PatUtils/interface/JetCorrUncertaintyTable.h"
 
 #include <TMath.h>
 
 #include <string>
+#include <vector>
 
 template <typename T, typename Textractor>
 class ShiftedJetProducerT : public edm::EDProducer  
@@ -47,8 +54,7 @@ class ShiftedJetProducerT : public edm::EDProducer
     : moduleLabel_(cfg.getParameter<std::string>("@module_label")),
       src_(cfg.getParameter<edm::InputTag>("src")),
       jetCorrPayloadName_(""),
-      jetCorrParameters_(0),
-      jecUncertainty_(0),
+      jetCorrCacheIdentifier_(0),
       jecUncertaintyValue_(-1.)
   {
     if ( cfg.exists("jecUncertaintyValue") ) {
@@ -61,8 +67,8 @@ class ShiftedJetProducerT : public edm::EDProducer
 	  << " Failed to find JEC parameter file = " << jetCorrInputFileName_ << " !!\n";
 	std::cout << "Reading JEC parameters = " << jetCorrUncertaintyTag_  
 		  << " from file = " << jetCorrInputFileName_.fullPath() << "." << std::endl;
-	jetCorrParameters_ = new JetCorrectorParameters(jetCorrInputFileName_.fullPath().data(), jetCorrUncertaintyTag_);
-	jecUncertainty_ = new JetCorrectionUncertainty(*jetCorrParameters_);
+	jetCorrParametersReader_ = JetCorrectorParametersReader::get(jetCorrInputFileName_.fullPath());
+	jecUncertaintyTable_ = JetCorrUncertaintyTable::get(*jetCorrParametersReader_, jetCorrUncertaintyTag_);
       } else {
 	std::cout << "Reading JEC parameters = " << jetCorrUncertaintyTag_
 		  << " from DB/SQLlite file." << std::endl;
@@ -70,7 +76,6 @@ class ShiftedJetProducerT : public edm::EDProducer
       }
     }
 
-    addResidualJES_ = cfg.getParameter<bool>("addResidualJES");
     jetCorrLabelUpToL3_ = ( cfg.exists("jetCorrLabelUpToL3") ) ?
       cfg.getParameter<std::string>("jetCorrLabelUpToL3") : "";
     jetCorrLabelUpToL3Res_ = ( cfg.exists("jetCorrLabelUpToL3Res") ) ?
@@ -78,18 +83,37 @@ class ShiftedJetProducerT : public edm::EDProducer
     jetCorrEtaMax_ = ( cfg.exists("jetCorrEtaMax") ) ?
       cfg.getParameter<double>("jetCorrEtaMax") : 9.9;
 
-    shiftBy_ = cfg.getParameter<double>("shiftBy");
+    if ( cfg.exists("shifts") ) {
+      typedef std::vector<edm::ParameterSet> vParameterSet;
+      vParameterSet cfgShifts = cfg.getParameter<vParameterSet>("shifts");
+      for ( vParameterSet::const_iterator cfgShift = cfgShifts.begin();
+	    cfgShift != cfgShifts.end(); ++cfgShift ) {
+	shifts_.push_back(shiftEntryType(*cfgShift));
+      }
+    } else {
+      shifts_.push_back(shiftEntryType("", cfg.getParameter<double>("shiftBy"), cfg.getParameter<bool>("addResidualJES")));
+    }
+    if ( shifts_.size() == 0 ) 
+      throw cms::Exception("ShiftedJetProducerT") 
+	<< " Configuration parameter 'shifts' must not be empty !!\n";
+
+    needResidualJES_ = false;
+    for ( typename std::vector<shiftEntryType>::const_iterator shift = shifts_.begin();
+	  shift != shifts_.end(); ++shift ) {
+      for ( typename std::vector<shiftEntryType>::const_iterator shift_test = shifts_.begin();
+	    shift_test != shift; ++shift_test ) {
+	if ( shift_test->instanceLabel_ == shift->instanceLabel_ ) 
+	  throw cms::Exception("ShiftedJetProducerT") 
+	    << " Instance label = '" << shift->instanceLabel_ << "' specified more than once in 'shifts' !!\n";
+      }
+      if ( shift->addResidualJES_ ) needResidualJES_ = true;
+      produces<JetCollection>(shift->instanceLabel_);
+    }
 
     verbosity_ = ( cfg.exists("verbosity") ) ?
       cfg.getParameter<int>("verbosity") : 0;
-
-    produces<JetCollection>();
-  }
-  ~ShiftedJetProducerT()
-  {
-    delete jetCorrParameters_;
-    delete jecUncertainty_;
   }
+  ~ShiftedJetProducerT() {}
     
  private:
 
@@ -104,14 +128,22 @@ class ShiftedJetProducerT : public edm::EDProducer
     edm::Handle<JetCollection> originalJets;
     evt.getByLabel(src_, originalJets);
 
-    std::auto_ptr<JetCollection> shiftedJets(new JetCollection);
-    
+    size_t numShifts = shifts_.size();
+    std::vector<JetCollection> shiftedJets(numShifts);
+    for ( size_t iShift = 0; iShift < numShifts; ++iShift ) {
+      shiftedJets[iShift].reserve(originalJets->size());
+    }
+
     if ( jetCorrPayloadName_ != "" ) {
-      edm::ESHandle<JetCorrectorParametersCollection> jetCorrParameterSet;
-      es.get<JetCorrectionsRecord>().get(jetCorrPayloadName_, jetCorrParameterSet); 
-      const JetCorrectorParameters& jetCorrParameters = (*jetCorrParameterSet)[jetCorrUncertaintyTag_];
-      delete jecUncertainty_;
-      jecUncertainty_ = new JetCorrectionUncertainty(jetCorrParameters);
+      // CV: rebuild lookup table only in case JEC parameters in DB have changed
+      const JetCorrectionsRecord& jetCorrRecord = es.get<JetCorrectionsRecord>();
+      if ( !jecUncertaintyTable_ || jetCorrRecord.cacheIdentifier() != jetCorrCacheIdentifier_ ) {
+	edm::ESHandle<JetCorrectorParametersCollection> jetCorrParameterSet;
+	jetCorrRecord.get(jetCorrPayloadName_, jetCorrParameterSet); 
+	const JetCorrectorParameters& jetCorrParameters = (*jetCorrParameterSet)[jetCorrUncertaintyTag_];
+	jecUncertaintyTable_.reset(new JetCorrUncertaintyTable(jetCorrParameters));
+	jetCorrCacheIdentifier_ = jetCorrRecord.cacheIdentifier();
+      }
     }
 
     for ( typename JetCollection::const_iterator originalJet = originalJets->begin();
@@ -125,16 +157,15 @@ class ShiftedJetProducerT : public edm::EDProducer
       if ( jecUncertaintyValue_ != -1. ) {
 	shift = jecUncertaintyValue_;
       } else {
-	jecUncertainty_->setJetEta(originalJetP4.eta());
-	jecUncertainty_->setJetPt(originalJetP4.pt());
-	
-	shift = jecUncertainty_->getUncertainty(true);
+	shift = jecUncertaintyTable_->getUncertainty(originalJetP4.eta(), originalJetP4.pt(), true);
       }
       if ( verbosity_ ) {
 	std::cout << "shift = " << shift << std::endl;
       }
 
-      if ( addResidualJES_ ) {
+      double residualJES = 0.;
+      bool isValidResidualJES = false;
+      if ( needResidualJES_ ) {
 	static SmearedJetProducer_namespace::RawJetExtractorT<T> rawJetExtractor;
 	reco::Candidate::LorentzVector rawJetP4 = rawJetExtractor(*originalJet);
 	if ( rawJetP4.E() > 1.e-1 ) {
@@ -143,30 +174,42 @@ class ShiftedJetProducerT : public edm::EDProducer
 	  reco::Candidate::LorentzVector corrJetP4upToL3Res = 
 	    jetCorrExtractor_(*originalJet, jetCorrLabelUpToL3Res_, &evt, &es, jetCorrEtaMax_, &rawJetP4);
 	  if ( corrJetP4upToL3.E() > 1.e-1 && corrJetP4upToL3Res.E() > 1.e-1 ) {
-	    double residualJES = (corrJetP4upToL3Res.E()/corrJetP4upToL3.E()) - 1.;
+	    residualJES = (corrJetP4upToL3Res.E()/corrJetP4upToL3.E()) - 1.;
+	    isValidResidualJES = true;
 	    if ( verbosity_ ) {
 	      std::cout << "residualJES = " << residualJES << std::endl;
 	    }
-	    shift = TMath::Sqrt(shift*shift + residualJES*residualJES);
 	  }
 	}
       }
 
-      shift *= shiftBy_;
-      if ( verbosity_ ) {
-	std::cout << "shift*shiftBy = " << shift << std::endl;
-      }
+      for ( size_t iShift = 0; iShift < numShifts; ++iShift ) {
+	const shiftEntryType& shiftEntry = shifts_[iShift];
 
-      T shiftedJet(*originalJet);
-      shiftedJet.setP4((1. + shift)*originalJetP4);
-      if ( verbosity_ ) {
-	std::cout << "shiftedJet: Pt = " << shiftedJet.pt() << ", eta = " << shiftedJet.eta() << ", phi = " << shiftedJet.phi() << std::endl;
+	double shift_i = shift;
+	if ( shiftEntry.addResidualJES_ && isValidResidualJES ) {
+	  shift_i = TMath::Sqrt(shift_i*shift_i + residualJES*residualJES);
+	}
+
+	shift_i *= shiftEntry.shiftBy_;
+	if ( verbosity_ ) {
+	  std::cout << "shift*shiftBy = " << shift_i << " (instanceLabel = '" << shiftEntry.instanceLabel_ << "')" << std::endl;
+	}
+
+	shiftedJets[iShift].push_back(*originalJet);
+	T& shiftedJet = shiftedJets[iShift].back();
+	shiftedJet.setP4((1. + shift_i)*originalJetP4);
+	if ( verbosity_ ) {
+	  std::cout << "shiftedJet: Pt = " << shiftedJet.pt() << ", eta = " << shiftedJet.eta() << ", phi = " << shiftedJet.phi() << std::endl;
+	}
       }
-    
-      shiftedJets->push_back(shiftedJet);
     }
   
-    evt.put(shiftedJets);
+    for ( size_t iShift = 0; iShift < numShifts; ++iShift ) {
+      std::auto_ptr<JetCollection> shiftedJets_i(new JetCollection);
+      shiftedJets_i->swap(shiftedJets[iShift]);
+      evt.put(shiftedJets_i, shifts_[iShift].instanceLabel_);
+    }
   }
 
   std::string moduleLabel_;
@@ -176,10 +219,10 @@ class ShiftedJetProducerT : public edm::EDProducer
   edm::FileInPath jetCorrInputFileName_;
   std::string jetCorrPayloadName_;
   std::string jetCorrUncertaintyTag_;
-  JetCorrectorParameters* jetCorrParameters_;
-  JetCorrectionUncertainty* jecUncertainty_;
+  boost::shared_ptr<const JetCorrectorParametersReader> jetCorrParametersReader_; // shared with all other modules reading the same file
+  unsigned long long jetCorrCacheIdentifier_;
+  boost::shared_ptr<const JetCorrUncertaintyTable> jecUncertaintyTable_;
 
-  bool addResidualJES_;
   std::string jetCorrLabelUpToL3_;    // L1+L2+L3 correction
   std::string jetCorrLabelUpToL3Res_; // L1+L2+L3+Residual correction
   double jetCorrEtaMax_; // do not use JEC factors for |eta| above this threshold (recommended default = 4.7),
@@ -191,7 +234,26 @@ class ShiftedJetProducerT : public edm::EDProducer
 
   double jecUncertaintyValue_;
 
-  double shiftBy_; // set to +1.0/-1.0 for up/down variation of energy scale
+  struct shiftEntryType
+  {
+    shiftEntryType(const std::string& instanceLabel, double shiftBy, bool addResidualJES)
+      : instanceLabel_(instanceLabel),
+	shiftBy_(shiftBy),
+	addResidualJES_(addResidualJES)
+    {}
+    shiftEntryType(const edm::ParameterSet& cfg)
+      : instanceLabel_(cfg.getParameter<std::string>("instanceLabel")),
+	shiftBy_(cfg.getParameter<double>("shiftBy")),
+	addResidualJES_(cfg.getParameter<bool>("addResidualJES"))
+    {}
+    ~shiftEntryType() {}
+    std::string instanceLabel_;
+    double shiftBy_;      // set to +1.0/-1.0 for up/down variation of energy scale
+    bool addResidualJES_; // add residual jet energy corrections in quadrature to jet energy uncertainty
+  };
+  std::vector<shiftEntryType> shifts_;
+
+  bool needResidualJES_; // flag indicating that residual jet energy corrections need to be computed for at least one shift
 
   int verbosity_; // flag to enabled/disable debug output
 };
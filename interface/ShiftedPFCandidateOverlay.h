@@ -0,0 +1,87 @@
+#ifndef PhysicsTools_PatUtils_ShiftedPFCandidateOverlay_h
+#define PhysicsTools_PatUtils_ShiftedPFCandidateOverlay_h
+
+/** \class ShiftedPFCandidateOverlay
+ *
+ * List of scale factors applied to the four-vectors of PFCandidates in the original collection
+ * (e.g. when varying the energy of PFCandidates within jets/leptons by their energy uncertainty)
+ *
+ * NOTE: the scale factors are stored together with the ProductID and size of the original collection,
+ *       so that the shifted PFCandidates can be read through pat::ShiftedPFCandidateView
+ *       without keeping a full copy of the PFCandidate collection per systematic variation in the event.
+ *       In sparse mode (default) only PFCandidates with a scale factor different from one are stored, together with their index;
+ *       in dense mode the scale factors of all PFCandidates are stored, without indices
+ *       (smaller in case most PFCandidates are shifted).
+ *       The scale factors are stored in double precision,
+ *       so that the shifted four-vectors are identical to those of the shifted PFCandidate collection.
+ *
+ */
+
+#include "DataFormats/Provenance/interface/ProductID.h"
+
+#include <vector>
+#include <algorithm>
+
+namespace pat {
+
+  class ShiftedPFCandidateOverlay {
+
+   public:
+
+    ShiftedPFCandidateOverlay() : srcSize_(0), isDense_(false) {}
+    ShiftedPFCandidateOverlay(const edm::ProductID& srcProductID, size_t srcSize, bool isDense = false)
+      : srcProductID_(srcProductID),
+	srcSize_(srcSize),
+	isDense_(isDense)
+    {
+      if ( isDense_ ) scaleFactors_.reserve(srcSize_);
+    }
+    ~ShiftedPFCandidateOverlay() {}
+
+    /// set scale factor of PFCandidate with given index in original collection;
+    /// NOTE: indices are expected to be added in ascending order
+    void addShift(unsigned idx, double scaleFactor)
+    {
+      if ( isDense_ ) {
+	if ( scaleFactors_.size() < idx ) scaleFactors_.resize(idx, 1.);
+	scaleFactors_.push_back(scaleFactor);
+	return;
+      }
+      if ( scaleFactor == 1. ) return;
+      indices_.push_back(idx);
+      scaleFactors_.push_back(scaleFactor);
+    }
+
+    /// ProductID and size of original collection of PFCandidates
+    const edm::ProductID& srcProductID() const { return srcProductID_; }
+    size_t srcSize() const { return srcSize_; }
+
+    /// flag indicating whether scale factors of all PFCandidates are stored
+    bool isDense() const { return isDense_; }
+
+    /// scale factor of PFCandidate with given index in original collection (one in case the PFCandidate is not shifted)
+    double scaleFactor(unsigned idx) const
+    {
+      if ( isDense_ ) return ( idx < scaleFactors_.size() ) ? scaleFactors_[idx] : 1.;
+      std::vector<unsigned>::const_iterator it = std::lower_bound(indices_.begin(), indices_.end(), idx);
+      if ( it != indices_.end() && (*it) == idx ) return scaleFactors_[it - indices_.begin()];
+      return 1.;
+    }
+
+    /// number of stored scale factors, indices in original collection of the corresponding PFCandidates and the scale factors
+    size_t size() const { return scaleFactors_.size(); }
+    unsigned shiftedIndex(size_t i) const { return ( isDense_ ) ? i : indices_[i]; }
+    double shiftedScaleFactor(size_t i) const { return scaleFactors_[i]; }
+
+   private:
+
+    edm::ProductID srcProductID_;
+    unsigned srcSize_;
+    bool isDense_;
+    std::vector<unsigned> indices_; // empty in dense mode
+    std::vector<double> scaleFactors_;
+  };
+
+}
+
+#endif
@@ -0,0 +1,86 @@
+#ifndef PhysicsTools_PatUtils_ShiftedPFCandidateView_h
+#define PhysicsTools_PatUtils_ShiftedPFCandidateView_h
+
+/** \class ShiftedPFCandidateView
+ *
+ * Read-only view of the original collection of PFCandidates
+ * with the scale factors stored in a pat::ShiftedPFCandidateOverlay applied
+ *
+ * NOTE: the shifted four-vectors are computed on access;
+ *       a shifted PFCandidate (or collection of shifted PFCandidates) is only created
+ *       in case shiftedCandidate() (makeShiftedCandidates()) is called explicitly.
+ *
+ */
+
+#include "FWCore/Utilities/interface/Exception.h"
+
+#include "DataFormats/Common/interface/Handle.h"
+#include "DataFormats/Candidate/interface/Candidate.h"
+#include "DataFormats/ParticleFlowCandidate/interface/PFCandidate.h"
+#include "DataFormats/ParticleFlowCandidate/interface/PFCandidateFwd.h"
+
+#include "PhysicsTools/PatUtils/interface/ShiftedPFCandidateOverlay.h"
+
+#include <memory>
+
+namespace pat {
+
+  class ShiftedPFCandidateView {
+
+   public:
+
+    ShiftedPFCandidateView(const edm::Handle<reco::PFCandidateCollection>& originals, const ShiftedPFCandidateOverlay& overlay)
+      : originals_(&(*originals)),
+	overlay_(&overlay)
+    {
+      if ( originals.id() != overlay.srcProductID() || originals->size() != overlay.srcSize() )
+	throw cms::Exception("ShiftedPFCandidateView")
+	  << " Overlay of shifted PFCandidates does not match collection of original PFCandidates !!\n";
+    }
+    ~ShiftedPFCandidateView() {}
+
+    /// number of PFCandidates
+    size_t size() const { return originals_->size(); }
+
+    /// original PFCandidate and scale factor of PFCandidate with given index
+    const reco::PFCandidate& original(size_t idx) const { return (*originals_)[idx]; }
+    double scaleFactor(size_t idx) const { return overlay_->scaleFactor(idx); }
+
+    /// shifted four-vector of PFCandidate with given index
+    reco::Candidate::LorentzVector p4(size_t idx) const
+    {
+      reco::Candidate::LorentzVector shiftedP4 = original(idx).p4();
+      shiftedP4 *= scaleFactor(idx);
+      return shiftedP4;
+    }
+
+    /// copy of PFCandidate with given index, with four-vector shifted
+    reco::PFCandidate shiftedCandidate(size_t idx) const
+    {
+      reco::PFCandidate shiftedPFCandidate(original(idx));
+      double sf = scaleFactor(idx);
+      if ( sf != 1. ) shiftedPFCandidate.setP4(shiftedPFCandidate.p4()*sf);
+      return shiftedPFCandidate;
+    }
+
+    /// full collection of shifted PFCandidates
+    /// (for consumers that need a reco::PFCandidateCollection)
+    std::auto_ptr<reco::PFCandidateCollection> makeShiftedCandidates() const
+    {
+      std::auto_ptr<reco::PFCandidateCollection> shiftedPFCandidates(new reco::PFCandidateCollection(*originals_));
+      for ( size_t i = 0; i < overlay_->size(); ++i ) {
+	reco::PFCandidate& shiftedPFCandidate = (*shiftedPFCandidates)[overlay_->shiftedIndex(i)];
+	shiftedPFCandidate.setP4(shiftedPFCandidate.p4()*overlay_->shiftedScaleFactor(i));
+      }
+      return shiftedPFCandidates;
+    }
+
+   private:
+
+    const reco::PFCandidateCollection* originals_;
+    const ShiftedPFCandidateOverlay* overlay_;
+  };
+
+}
+
+#endif
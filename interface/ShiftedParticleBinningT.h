@@ -0,0 +1,306 @@
+#ifndef PhysicsTools_PatUtils_ShiftedParticleBinningT_h
+#define PhysicsTools_PatUtils_ShiftedParticleBinningT_h
+
+/** \class ShiftedParticleBinningT
+ *
+ * Energy scale uncertainties of electrons/muons/tau-jets, binned by StringCutObjectSelector
+ * (or a single uncertainty common to all particles),
+ * as specified by the 'binning' (or 'uncertainty' and 'offset') configuration parameters
+ * of the ShiftedParticleProducerT and ShiftedParticleMETcorrInputProducerT modules
+ *
+ * NOTE: in case the 'binSelection' of all bins are simple ranges in the same variable,
+ *       i.e. cuts of type "pt < 100", "abs(eta) < 1.479" or "eta > -2.5 && eta < 2.5"
+ *       on pt, eta or abs(eta), the bin is found by binary search in a sorted array of bin edges,
+ *       without evaluating the StringCutObjectSelector of each bin per particle.
+ *       The bin found is the same (first bin selecting the particle) in both cases.
+ *
+ */
+
+#include "FWCore/ParameterSet/interface/ParameterSet.h"
+
+#include "CommonTools/Utils/interface/StringCutObjectSelector.h"
+#include "DataFormats/Candidate/interface/Candidate.h"
+
+#include <string>
+#include <vector>
+#include <algorithm>
+#include <limits>
+#include <stdlib.h>
+#include <math.h>
+
+template <typename T>
+class ShiftedParticleBinningT
+{
+ public:
+
+  explicit ShiftedParticleBinningT(const edm::ParameterSet& cfg)
+  {
+    if ( cfg.exists("binning") ) {
+      typedef std::vector<edm::ParameterSet> vParameterSet;
+      vParameterSet cfgBinning = cfg.getParameter<vParameterSet>("binning");
+      for ( vParameterSet::const_iterator cfgBinningEntry = cfgBinning.begin();
+	    cfgBinningEntry != cfgBinning.end(); ++cfgBinningEntry ) {
+	binning_.push_back(new binningEntryType(*cfgBinningEntry));
+      }
+    } else {
+      double uncertainty = cfg.getParameter<double>("uncertainty");
+      double offset = ( cfg.exists("offset") ) ?
+	cfg.getParameter<double>("offset") : 0.;
+      binning_.push_back(new binningEntryType(uncertainty, offset));
+    }
+
+    compileBinning();
+  }
+  ~ShiftedParticleBinningT()
+  {
+    for ( typename std::vector<binningEntryType*>::const_iterator it = binning_.begin();
+	  it != binning_.end(); ++it ) {
+      delete (*it);
+    }
+  }
+
+  /// uncertainty and offset of first bin selecting the particle (zero in case no bin selects the particle)
+  void getUncertainty(const T& particle, double& uncertainty, double& offset) const
+  {
+    uncertainty = 0.;
+    offset = 0.;
+    if ( variable_ != kGeneric ) {
+      int idxBin = findBin(getVariable(particle, variable_));
+      if ( idxBin != -1 ) {
+	uncertainty = binning_[idxBin]->binUncertainty_;
+	offset = binning_[idxBin]->binOffset_;
+      }
+      return;
+    }
+    for ( typename std::vector<binningEntryType*>::const_iterator binningEntry = binning_.begin();
+	  binningEntry != binning_.end(); ++binningEntry ) {
+      if ( (!(*binningEntry)->binSelection_) || (*(*binningEntry)->binSelection_)(particle) ) {
+	uncertainty = (*binningEntry)->binUncertainty_;
+	offset = (*binningEntry)->binOffset_;
+	break;
+      }
+    }
+  }
+
+  /// four-vector of particle with momentum scaled by (1 + shiftBy*uncertainty - offset), keeping the mass fixed
+  static reco::Candidate::LorentzVector getShiftedP4(const T& particle, double shift)
+  {
+    double shiftedParticlePx = (1. + shift)*particle.px();
+    double shiftedParticlePy = (1. + shift)*particle.py();
+    double shiftedParticlePz = (1. + shift)*particle.pz();
+    double shiftedParticleEn = sqrt(
+       shiftedParticlePx*shiftedParticlePx
+     + shiftedParticlePy*shiftedParticlePy
+     + shiftedParticlePz*shiftedParticlePz
+     + particle.mass()*particle.mass());
+    return reco::Candidate::LorentzVector(shiftedParticlePx, shiftedParticlePy, shiftedParticlePz, shiftedParticleEn);
+  }
+
+ private:
+
+  // not implemented
+  ShiftedParticleBinningT(const ShiftedParticleBinningT&);
+  ShiftedParticleBinningT& operator=(const ShiftedParticleBinningT&);
+
+  enum { kGeneric, kPt, kEta, kAbsEta };
+
+  /// range [min, max] in one variable, bounds included or excluded
+  struct rangeType
+  {
+    rangeType()
+      : variable_(kGeneric),
+	min_(-std::numeric_limits<double>::infinity()),
+	max_(+std::numeric_limits<double>::infinity()),
+	minIncluded_(false),
+	maxIncluded_(false)
+    {}
+    bool contains(double value) const
+    {
+      return ( (value > min_ || (minIncluded_ && value == min_)) &&
+	       (value < max_ || (maxIncluded_ && value == max_)) );
+    }
+    int variable_;
+    double min_;
+    double max_;
+    bool minIncluded_;
+    bool maxIncluded_;
+  };
+
+  static std::string trim(const std::string& str)
+  {
+    size_t first = str.find_first_not_of(" \t");
+    if ( first == std::string::npos ) return "";
+    size_t last = str.find_last_not_of(" \t");
+    return str.substr(first, last - first + 1);
+  }
+
+  static int parseVariable(const std::string& str)
+  {
+    std::string variable;
+    for ( std::string::const_iterator c = str.begin(); c != str.end(); ++c ) {
+      if ( (*c) != ' ' && (*c) != '\t' ) variable += (*c);
+    }
+    if ( variable == "pt"       || variable == "pt()"        ) return kPt;
+    if ( variable == "eta"      || variable == "eta()"       ) return kEta;
+    if ( variable == "abs(eta)" || variable == "abs(eta())"  ) return kAbsEta;
+    return kGeneric;
+  }
+
+  static bool parseNumber(const std::string& str, double& number)
+  {
+    if ( str.empty() ) return false;
+    char* end = 0;
+    number = strtod(str.c_str(), &end);
+    return ( (*end) == '\0' );
+  }
+
+  /// parse selection of type "variable op number [&& ...]" (or "number op variable");
+  /// returns false in case the selection is not a simple range in pt, eta or abs(eta)
+  static bool parseRange(const std::string& selection, rangeType& result)
+  {
+    rangeType range;
+    size_t pos = 0;
+    while ( pos <= selection.length() ) {
+      size_t end = selection.find("&&", pos);
+      if ( end == std::string::npos ) end = selection.length();
+      std::string term = trim(selection.substr(pos, end - pos));
+      pos = end + 2;
+
+      size_t posOp = term.find_first_of("<>");
+      if ( posOp == std::string::npos ) return false;
+      bool isLess = ( term[posOp] == '<' );
+      size_t lengthOp = 1;
+      bool isIncluded = false;
+      if ( posOp + 1 < term.length() && term[posOp + 1] == '=' ) {
+	lengthOp = 2;
+	isIncluded = true;
+      }
+      std::string lhs = trim(term.substr(0, posOp));
+      std::string rhs = trim(term.substr(posOp + lengthOp));
+
+      int variable = parseVariable(lhs);
+      double number;
+      if ( variable != kGeneric ) {
+	if ( !parseNumber(rhs, number) ) return false;
+      } else {
+	variable = parseVariable(rhs);
+	if ( variable == kGeneric || !parseNumber(lhs, number) ) return false;
+	isLess = !isLess; // CV: "number < variable" is equivalent to "variable > number"
+      }
+      if ( range.variable_ != kGeneric && range.variable_ != variable ) return false;
+      range.variable_ = variable;
+
+      if ( isLess ) {
+	if ( number < range.max_ ) {
+	  range.max_ = number;
+	  range.maxIncluded_ = isIncluded;
+	} else if ( number == range.max_ ) {
+	  range.maxIncluded_ &= isIncluded;
+	}
+      } else {
+	if ( number > range.min_ ) {
+	  range.min_ = number;
+	  range.minIncluded_ = isIncluded;
+	} else if ( number == range.min_ ) {
+	  range.minIncluded_ &= isIncluded;
+	}
+      }
+    }
+    if ( range.variable_ == kGeneric ) return false;
+    result = range;
+    return true;
+  }
+
+  static double getVariable(const T& particle, int variable)
+  {
+    if      ( variable == kPt  ) return particle.pt();
+    else if ( variable == kEta ) return particle.eta();
+    else                         return fabs(particle.eta());
+  }
+
+  /// in case all bins are ranges in the same variable, compute for each interval between (and at) the bin edges
+  /// the index of the first bin selecting particles in that interval
+  void compileBinning()
+  {
+    variable_ = kGeneric;
+    edges_.clear();
+    binIndices_.clear();
+
+    for ( typename std::vector<binningEntryType*>::const_iterator binningEntry = binning_.begin();
+	  binningEntry != binning_.end(); ++binningEntry ) {
+      const rangeType& range = (*binningEntry)->binRange_;
+      if ( range.variable_ == kGeneric || (variable_ != kGeneric && range.variable_ != variable_) ) {
+	variable_ = kGeneric;
+	edges_.clear();
+	return;
+      }
+      variable_ = range.variable_;
+      if ( range.min_ != -std::numeric_limits<double>::infinity() ) edges_.push_back(range.min_);
+      if ( range.max_ != +std::numeric_limits<double>::infinity() ) edges_.push_back(range.max_);
+    }
+    if ( variable_ == kGeneric ) return;
+    std::sort(edges_.begin(), edges_.end());
+    edges_.erase(std::unique(edges_.begin(), edges_.end()), edges_.end());
+
+    // CV: intervals are (-inf, edge[0]), [edge[0]], (edge[0], edge[1]), [edge[1]], ..., (edge[n - 1], +inf)
+    size_t numEdges = edges_.size();
+    for ( size_t idxInterval = 0; idxInterval < (2*numEdges + 1); ++idxInterval ) {
+      size_t idxEdge = idxInterval/2;
+      double value;
+      if      ( numEdges == 0                 ) value = 0.;
+      else if ( idxInterval % 2 == 1          ) value = edges_[idxEdge];
+      else if ( idxEdge == 0                  ) value = edges_.front() - 1. - fabs(edges_.front());
+      else if ( idxEdge == numEdges           ) value = edges_.back() + 1. + fabs(edges_.back());
+      else                                      value = 0.5*(edges_[idxEdge - 1] + edges_[idxEdge]);
+      int idxBin = -1;
+      for ( size_t idxBin_test = 0; idxBin_test < binning_.size(); ++idxBin_test ) {
+	if ( binning_[idxBin_test]->binRange_.contains(value) ) {
+	  idxBin = idxBin_test;
+	  break;
+	}
+      }
+      binIndices_.push_back(idxBin);
+    }
+  }
+
+  /// index of first bin selecting particles with given value of the variable (-1 in case no bin selects the particle)
+  int findBin(double value) const
+  {
+    if ( value != value ) return -1; // CV: NaN is not selected by any cut
+    size_t idxEdge = std::upper_bound(edges_.begin(), edges_.end(), value) - edges_.begin();
+    size_t idxInterval = ( idxEdge > 0 && edges_[idxEdge - 1] == value ) ? (2*idxEdge - 1) : 2*idxEdge;
+    return binIndices_[idxInterval];
+  }
+
+  struct binningEntryType
+  {
+    binningEntryType(double uncertainty, double offset)
+      : binSelection_(0),
+        binUncertainty_(uncertainty),
+	binOffset_(offset)
+    {}
+    binningEntryType(const edm::ParameterSet& cfg)
+    : binSelection_(new StringCutObjectSelector<T>(cfg.getParameter<std::string>("binSelection"))),
+      binUncertainty_(cfg.getParameter<double>("binUncertainty"))
+    {
+      binOffset_ = ( cfg.exists("binOffset") ) ?
+	cfg.getParameter<double>("binOffset") : 0.;
+      parseRange(cfg.getParameter<std::string>("binSelection"), binRange_);
+    }
+    ~binningEntryType()
+    {
+      delete binSelection_;
+    }
+    StringCutObjectSelector<T>* binSelection_;
+    double binUncertainty_;
+    double binOffset_;
+    rangeType binRange_; // variable = kGeneric in case binSelection is not a simple range
+  };
+  std::vector<binningEntryType*> binning_;
+
+  int variable_;              // variable in which all bins are ranges (kGeneric if binSelection needs to be evaluated per bin)
+  std::vector<double> edges_; // sorted bin edges
+  std::vector<int> binIndices_;
+};
+
+#endif
@@ -0,0 +1,172 @@
+#ifndef PhysicsTools_PatUtils_ShiftedParticleMETcorrInputProducerT_h
+#define PhysicsTools_PatUtils_ShiftedParticleMETcorrInputProducerT_h
+
+/** \class ShiftedParticleMETcorrInputProducerT
+ *
+ * Propagate energy variations of electrons/muons/tau-jets to MET,
+ * without producing the collections of shifted electrons/muons/tau-jets
+ *
+ * NOTE: the MET correction (difference in Px, Py and sumEt between original and shifted particles)
+ *       is computed directly from the original particles,
+ *       using the same energy scale uncertainties and shifts as ShiftedParticleProducerT.
+ *       The output is identical (up to floating-point rounding) to running ShiftedParticleProducerT followed by ShiftedParticleMETcorrInputProducer.
+ *
+ *       MET corrections for several shifts (e.g. up and down) can be produced in one pass
+ *       by specifying a 'shifts' VPSet, each entry of which defines the instance label and the shiftBy value of one shift.
+ *       The collections of shifted particles are produced (with the same instance labels)
+ *       only in case the configuration parameter 'produceShiftedParticles' is set to true.
+ *
+ */
+
+#include "FWCore/Framework/interface/EDProducer.h"
+#include "FWCore/Framework/interface/Event.h"
+#include "FWCore/Framework/interface/EventSetup.h"
+#include "FWCore/ParameterSet/interface/ParameterSet.h"
+#include "FWCore/Utilities/interface/InputTag.h"
+#include "FWCore/Utilities/interface/Exception.h"
+
+#include "DataFormats/METReco/interface/CorrMETData.h"
+#include "DataFormats/Candidate/interface/Candidate.h"
+
+#include "PhysicsTools/PatUtils/interface/ShiftedParticleBinningT.h"
+
+#include <string>
+#include <vector>
+#include <iostream>
+
+template <typename T, typename TCollection = std::vector<T> >
+class ShiftedParticleMETcorrInputProducerT : public edm::EDProducer
+{
+ public:
+
+  explicit ShiftedParticleMETcorrInputProducerT(const edm::ParameterSet& cfg)
+    : moduleLabel_(cfg.getParameter<std::string>("@module_label")),
+      binning_(cfg)
+  {
+    src_ = cfg.getParameter<edm::InputTag>("src");
+
+    if ( cfg.exists("shifts") ) {
+      typedef std::vector<edm::ParameterSet> vParameterSet;
+      vParameterSet cfgShifts = cfg.getParameter<vParameterSet>("shifts");
+      for ( vParameterSet::const_iterator cfgShift = cfgShifts.begin();
+	    cfgShift != cfgShifts.end(); ++cfgShift ) {
+	shifts_.push_back(shiftEntryType(*cfgShift));
+      }
+    } else {
+      shifts_.push_back(shiftEntryType("", cfg.getParameter<double>("shiftBy")));
+    }
+    if ( shifts_.size() == 0 )
+      throw cms::Exception("ShiftedParticleMETcorrInputProducerT")
+	<< " Configuration parameter 'shifts' must not be empty !!\n";
+
+    produceShiftedParticles_ = ( cfg.exists("produceShiftedParticles") ) ?
+      cfg.getParameter<bool>("produceShiftedParticles") : false;
+
+    verbosity_ = ( cfg.exists("verbosity") ) ?
+      cfg.getParameter<int>("verbosity") : 0;
+
+    for ( typename std::vector<shiftEntryType>::const_iterator shift = shifts_.begin();
+	  shift != shifts_.end(); ++shift ) {
+      for ( typename std::vector<shiftEntryType>::const_iterator shift_test = shifts_.begin();
+	    shift_test != shift; ++shift_test ) {
+	if ( shift_test->instanceLabel_ == shift->instanceLabel_ )
+	  throw cms::Exception("ShiftedParticleMETcorrInputProducerT")
+	    << " Instance label = '" << shift->instanceLabel_ << "' specified more than once in 'shifts' !!\n";
+      }
+      produces<CorrMETData>(shift->instanceLabel_);
+      if ( produceShiftedParticles_ ) produces<TCollection>(shift->instanceLabel_);
+    }
+  }
+  ~ShiftedParticleMETcorrInputProducerT() {}
+
+ private:
+
+  void produce(edm::Event& evt, const edm::EventSetup& es)
+  {
+    if ( verbosity_ ) {
+      std::cout << "<ShiftedParticleMETcorrInputProducerT::produce>:" << std::endl;
+      std::cout << " moduleLabel = " << moduleLabel_ << std::endl;
+    }
+
+    edm::Handle<TCollection> originalParticles;
+    evt.getByLabel(src_, originalParticles);
+
+    size_t numShifts = shifts_.size();
+    std::vector<CorrMETData> metCorrections(numShifts);
+    std::vector<TCollection> shiftedParticles(numShifts);
+
+    int idxOriginalParticle = 0;
+    for ( typename TCollection::const_iterator originalParticle = originalParticles->begin();
+	  originalParticle != originalParticles->end(); ++originalParticle ) {
+      if ( verbosity_ ) {
+	std::cout << "originalParticle #" << idxOriginalParticle << ": Pt = " << originalParticle->pt() << ","
+		  << " eta = " << originalParticle->eta() << ", phi = " << originalParticle->phi()
+		  << " (Px = " << originalParticle->px() << ", Py = " << originalParticle->py() << ")" << std::endl;
+      }
+
+      double uncertainty, offset;
+      binning_.getUncertainty(*originalParticle, uncertainty, offset);
+
+      for ( size_t iShift = 0; iShift < numShifts; ++iShift ) {
+	double shift = shifts_[iShift].shiftBy_*uncertainty - offset;
+	reco::Candidate::LorentzVector shiftedParticleP4 = binning_.getShiftedP4(*originalParticle, shift);
+	if ( verbosity_ ) {
+	  std::cout << " shifted (instanceLabel = '" << shifts_[iShift].instanceLabel_ << "'): Pt = " << shiftedParticleP4.pt() << ","
+		    << " eta = " << shiftedParticleP4.eta() << ", phi = " << shiftedParticleP4.phi()
+		    << " (Px = " << shiftedParticleP4.px() << ", Py = " << shiftedParticleP4.py() << ")" << std::endl;
+	}
+
+	CorrMETData& metCorrection = metCorrections[iShift];
+	metCorrection.mex   += (originalParticle->px() - shiftedParticleP4.px());
+	metCorrection.mey   += (originalParticle->py() - shiftedParticleP4.py());
+	metCorrection.sumet += (originalParticle->et() - shiftedParticleP4.Et());
+
+	if ( produceShiftedParticles_ ) {
+	  T shiftedParticle(*originalParticle);
+	  shiftedParticle.setP4(shiftedParticleP4);
+	  shiftedParticles[iShift].push_back(shiftedParticle);
+	}
+      }
+      ++idxOriginalParticle;
+    }
+
+    for ( size_t iShift = 0; iShift < numShifts; ++iShift ) {
+      std::auto_ptr<CorrMETData> metCorrection(new CorrMETData(metCorrections[iShift]));
+      evt.put(metCorrection, shifts_[iShift].instanceLabel_);
+      if ( produceShiftedParticles_ ) {
+	std::auto_ptr<TCollection> shiftedParticles_i(new TCollection());
+	shiftedParticles_i->swap(shiftedParticles[iShift]);
+	evt.put(shiftedParticles_i, shifts_[iShift].instanceLabel_);
+      }
+    }
+  }
+
+  std::string moduleLabel_;
+
+  edm::InputTag src_;
+
+  ShiftedParticleBinningT<T> binning_;
+
+  struct shiftEntryType
+  {
+    shiftEntryType(const std::string& instanceLabel, double shiftBy)
+      : instanceLabel_(instanceLabel),
+	shiftBy_(shiftBy)
+    {}
+    shiftEntryType(const edm::ParameterSet& cfg)
+      : instanceLabel_(cfg.getParameter<std::string>("instanceLabel")),
+	shiftBy_(cfg.getParameter<double>("shiftBy"))
+    {}
+    ~shiftEntryType() {}
+    std::string instanceLabel_;
+    double shiftBy_; // set to +1.0/-1.0 for up/down variation of energy scale
+  };
+  std::vector<shiftEntryType> shifts_;
+
+  bool produceShiftedParticles_; // flag to enable/disable production of shifted particle collections
+                                 // (in addition to MET corrections)
+
+  int verbosity_; // flag to enabled/disable debug output
+};
+
+#endif
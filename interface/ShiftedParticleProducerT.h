@@ -22,12 +22,12 @@
 #include "FWCore/ParameterSet/interface/ParameterSet.h"
 #include "FWCore/Utilities/interface/InputTag.h"
 
-#include "CommonTools/Utils/interface/StringCutObjectSelector.h"
 #include "DataFormats/Candidate/interface/Candidate.h"
 
+#include "PhysicsTools/PatUtils/interface/ShiftedParticleBinningT.h"
+
 #include <string>
 #include <vector>
-#include <math.h>
 
 template <typename T, typename TCollection = std::vector<T> >
 class ShiftedParticleProducerT : public edm::EDProducer  
@@ -35,36 +35,17 @@ class ShiftedParticleProducerT : public edm::EDProducer
  public:
 
   explicit ShiftedParticleProducerT(const edm::ParameterSet& cfg)
-    : moduleLabel_(cfg.getParameter<std::string>("@module_label"))
+    : moduleLabel_(cfg.getParameter<std::string>("@module_label")),
+      binning_(cfg)
   {
     src_ = cfg.getParameter<edm::InputTag>("src");
 
     shiftBy_ = cfg.getParameter<double>("shiftBy");
 
-    if ( cfg.exists("binning") ) {
-      typedef std::vector<edm::ParameterSet> vParameterSet;
-      vParameterSet cfgBinning = cfg.getParameter<vParameterSet>("binning");
-      for ( vParameterSet::const_iterator cfgBinningEntry = cfgBinning.begin();
-	    cfgBinningEntry != cfgBinning.end(); ++cfgBinningEntry ) {
-	binning_.push_back(new binningEntryType(*cfgBinningEntry));
-      }
-    } else {
-      double uncertainty = cfg.getParameter<double>("uncertainty");
-      double offset = ( cfg.exists("offset") ) ?
-	cfg.getParameter<double>("offset") : 0.;
-      binning_.push_back(new binningEntryType(uncertainty, offset));
-    }
-    
     produces<TCollection>();
   }
-  ~ShiftedParticleProducerT()
-  {
-    for ( typename std::vector<binningEntryType*>::const_iterator it = binning_.begin();
-	  it != binning_.end(); ++it ) {
-      delete (*it);
-    }
-  }
-    
+  ~ShiftedParticleProducerT() {}
+
  private:
 
   void produce(edm::Event& evt, const edm::EventSetup& es)
@@ -77,30 +58,13 @@ class ShiftedParticleProducerT : public edm::EDProducer
     for ( typename TCollection::const_iterator originalParticle = originalParticles->begin();
 	  originalParticle != originalParticles->end(); ++originalParticle ) {
 
-      double uncertainty = 0.;
-      double offset = 0.;
-      for ( typename std::vector<binningEntryType*>::iterator binningEntry = binning_.begin();
-	    binningEntry != binning_.end(); ++binningEntry ) {
-	if ( (!(*binningEntry)->binSelection_) || (*(*binningEntry)->binSelection_)(*originalParticle) ) {
-	  uncertainty = (*binningEntry)->binUncertainty_;
-	  offset = (*binningEntry)->binOffset_;
-	  break;
-	}
-      }
-      
+      double uncertainty, offset;
+      binning_.getUncertainty(*originalParticle, uncertainty, offset);
+
       double shift = shiftBy_*uncertainty - offset;
 
-      double shiftedParticlePx = (1. + shift)*originalParticle->px();
-      double shiftedParticlePy = (1. + shift)*originalParticle->py();
-      double shiftedParticlePz = (1. + shift)*originalParticle->pz();
-      double shiftedParticleEn = sqrt(
-         shiftedParticlePx*shiftedParticlePx 
-       + shiftedParticlePy*shiftedParticlePy 
-       + shiftedParticlePz*shiftedParticlePz
-       + originalParticle->mass()*originalParticle->mass());
-      T shiftedParticle(*originalParticle);      
-      reco::Candidate::LorentzVector shiftedParticleP4(shiftedParticlePx, shiftedParticlePy, shiftedParticlePz, shiftedParticleEn);
-      shiftedParticle.setP4(shiftedParticleP4);
+      T shiftedParticle(*originalParticle);
+      shiftedParticle.setP4(binning_.getShiftedP4(*originalParticle, shift));
 
       shiftedParticles->push_back(shiftedParticle);
     }
@@ -110,37 +74,11 @@ class ShiftedParticleProducerT : public edm::EDProducer
 
   std::string moduleLabel_;
 
-  edm::InputTag src_; 
+  edm::InputTag src_;
 
-  struct binningEntryType
-  {
-    binningEntryType(double uncertainty, double offset)
-      : binSelection_(0),
-        binUncertainty_(uncertainty),
-	binOffset_(offset)
-    {}
-    binningEntryType(const edm::ParameterSet& cfg)
-    : binSelection_(new StringCutObjectSelector<T>(cfg.getParameter<std::string>("binSelection"))),
-      binUncertainty_(cfg.getParameter<double>("binUncertainty"))
-    {
-      binOffset_ = ( cfg.exists("binOffset") ) ?
-	cfg.getParameter<double>("binOffset") : 0.;
-    }
-    ~binningEntryType() 
-    {
-      delete binSelection_;
-    }
-    StringCutObjectSelector<T>* binSelection_;
-    double binUncertainty_;
-    double binOffset_;
-  };
-  std::vector<binningEntryType*> binning_;
+  ShiftedParticleBinningT<T> binning_;
 
   double shiftBy_; // set to +1.0/-1.0 for up/down variation of energy scale
 };
 
 #endif
-
-
- 
-
@@ -8,6 +8,16 @@
  * between Monte Carlo simulation and Data. 
  * The jet energy resolutions have been measured in QCD di-jet and gamma + jets events selected in 2010 data,
  * as documented in the PAS JME-10-014.
+ *
+ * NOTE: several smeared jet collections (e.g. central value and jet resolution shifted up/down)
+ *       can be produced in one pass by specifying a 'shifts' VPSet,
+ *       each entry of which defines the instance label and the smearBy and shiftBy values of one output collection.
+ *       The jet smearing flags of each collection are stored with instance label 'jetSmearingFlags' + instanceLabel.
+ *       All collections share the same random numbers.
+ *
+ *       The random numbers used for smearing jets not matched to generator level jets
+ *       are a function of module label, run, luminosity section, event number and jet index only,
+ *       so that the smeared jets do not depend on job splitting, skipped events or number of threads.
  * 
  * \author Christian Veelken, LLR
  *
@@ -39,11 +49,15 @@
 #include "JetMETCorrections/Type1MET/interface/JetCorrExtractorT.h"
 #include "CommonTools/Utils/interface/StringCutObjectSelector.h"
 
+#include "PhysicsTools/PatUtils/interface/EtaPhiGrid.h"
+#include "PhysicsTools/PatUtils/interface/DRmaxGenJetMatchFormula.h"
+#include "PhysicsTools/PatUtils/interface/TH2LookupTable.h"
+#include "PhysicsTools/PatUtils/interface/CounterBasedRandomGenerator.h"
+
 #include <TFile.h>
 #include <TFormula.h>
 #include <TH2.h>
 #include <TMath.h>
-#include <TRandom3.h>
 #include <TString.h>
 
 #include <vector>
@@ -61,33 +75,55 @@ namespace SmearedJetProducer_namespace
        : srcGenJets_(cfg.getParameter<edm::InputTag>("srcGenJets")),
          dRmaxGenJetMatch_(0)
      {
-       TString dRmaxGenJetMatch_formula = cfg.getParameter<std::string>("dRmaxGenJetMatch").data();
-       dRmaxGenJetMatch_formula.ReplaceAll("genJetPt", "x");
-       dRmaxGenJetMatch_ = new TFormula("dRmaxGenJetMatch", dRmaxGenJetMatch_formula.Data());
+       dRmaxGenJetMatch_ = new DRmaxGenJetMatchFormula(cfg.getParameter<std::string>("dRmaxGenJetMatch"));
      }
      ~GenJetMatcherT() 
      {
        delete dRmaxGenJetMatch_;
      }
 
+     // CV: load generator level jets once per event,
+     //     compute matching cone size for each generator level jet and bucket generator level jets in eta-phi grid
+     void beginEvent(const edm::Event& evt)
+     {
+       evt.getByLabel(srcGenJets_, genJets_);
+
+       size_t numGenJets = genJets_->size();
+       dRmax_.resize(numGenJets);
+       genJetEtas_.resize(numGenJets);
+       genJetPhis_.resize(numGenJets);
+       double dRmaxMax = 0.;
+       for ( size_t genJetIndex = 0; genJetIndex < numGenJets; ++genJetIndex ) {
+	 const reco::GenJet& genJet = (*genJets_)[genJetIndex];
+	 dRmax_[genJetIndex] = (*dRmaxGenJetMatch_)(genJet.pt());
+	 if ( dRmax_[genJetIndex] > dRmaxMax ) dRmaxMax = dRmax_[genJetIndex];
+	 genJetEtas_[genJetIndex] = genJet.eta();
+	 genJetPhis_[genJetIndex] = genJet.phi();
+       }
+       genJetGrid_.build(genJetEtas_, genJetPhis_, dRmaxMax);
+     }
+
      const reco::GenJet* operator()(const T& jet, edm::Event* evt = 0) const
      {
-       assert(evt);
-       
-       edm::Handle<reco::GenJetCollection> genJets;
-       evt->getByLabel(srcGenJets_, genJets);
+       assert(genJets_.isValid());
 
        const reco::GenJet* retVal = 0;
 
+       // CV: in case of equal dR, take generator level jet with lowest index,
+       //     as in a plain loop over all generator level jets
+       candidateIndices_.clear();
+       genJetGrid_.findNeighbours(jet.eta(), jet.phi(), candidateIndices_);
        double dRbestMatch = 1.e+6;
-       for ( reco::GenJetCollection::const_iterator genJet = genJets->begin();
-	     genJet != genJets->end(); ++genJet ) {
-	 double dRmax = dRmaxGenJetMatch_->Eval(genJet->pt());
-	 //std::cout << "genJetPt = " << genJet->pt() << ": dRmax = " << dRmax << std::endl;
-	 double dR = deltaR(jet.p4(), genJet->p4());	 
-	 if ( dR < dRbestMatch && dR < dRmax ) {
-	   retVal = &(*genJet);
+       unsigned bestMatchIndex = 0;
+       for ( std::vector<unsigned>::const_iterator genJetIndex = candidateIndices_.begin();
+	     genJetIndex != candidateIndices_.end(); ++genJetIndex ) {
+	 const reco::GenJet& genJet = (*genJets_)[*genJetIndex];
+	 double dR = deltaR(jet.p4(), genJet.p4());	 
+	 if ( dR < dRmax_[*genJetIndex] && 
+	      (dR < dRbestMatch || (dR == dRbestMatch && retVal && (*genJetIndex) < bestMatchIndex)) ) {
+	   retVal = &genJet;
 	   dRbestMatch = dR;
+	   bestMatchIndex = (*genJetIndex);
 	 }
        }
 
@@ -99,7 +135,15 @@ namespace SmearedJetProducer_namespace
 //--- configuration parameter
      edm::InputTag srcGenJets_;
 
-     TFormula* dRmaxGenJetMatch_;
+     DRmaxGenJetMatchFormula* dRmaxGenJetMatch_;
+
+//--- generator level jets of current event
+     edm::Handle<reco::GenJetCollection> genJets_;
+     std::vector<double> dRmax_;
+     std::vector<double> genJetEtas_;
+     std::vector<double> genJetPhis_;
+     pat::helper::EtaPhiGrid genJetGrid_;
+     mutable std::vector<unsigned> candidateIndices_;
   };
 
   template <typename T>
@@ -110,7 +154,9 @@ namespace SmearedJetProducer_namespace
      JetResolutionExtractorT(const edm::ParameterSet&) {}
      ~JetResolutionExtractorT() {}
 
-     double operator()(const T&) const
+     void beginEvent(const edm::Event&, const edm::ProductID&) {}
+
+     double operator()(const T&, size_t) const
      {
        throw cms::Exception("SmearedJetProducer::produce")
 	 << " Jets of type other than PF not supported yet !!\n";       
@@ -154,6 +200,7 @@ class SmearedJetProducerT : public edm::EDProducer
     : moduleLabel_(cfg.getParameter<std::string>("@module_label")),
       genJetMatcher_(cfg),
       jetResolutionExtractor_(cfg.getParameter<edm::ParameterSet>("jetResolutions")),
+      rnd_(cfg.getParameter<std::string>("@module_label")),
       skipJetSelection_(0)
   {
     //std::cout << "<SmearedJetProducer::SmearedJetProducer>:" << std::endl;
@@ -167,11 +214,7 @@ class SmearedJetProducerT : public edm::EDProducer
       throw cms::Exception("JetMETsmearInputProducer") 
         << " Failed to find File = " << inputFileName << " !!\n";
 
-    inputFile_ = new TFile(inputFileName.fullPath().data());
-    lut_ = dynamic_cast<TH2*>(inputFile_->Get(lutName.data()));
-    if ( !lut_ ) 
-      throw cms::Exception("SmearedJetProducer") 
-        << " Failed to load LUT = " << lutName.data() << " from file = " << inputFileName.fullPath().data() << " !!\n";
+    lut_ = TH2LookupTable::get(inputFileName.fullPath(), lutName);
 
     jetCorrLabel_ = ( cfg.exists("jetCorrLabel") ) ?
       cfg.getParameter<std::string>("jetCorrLabel") : "";
@@ -180,11 +223,21 @@ class SmearedJetProducerT : public edm::EDProducer
 
     sigmaMaxGenJetMatch_ = cfg.getParameter<double>("sigmaMaxGenJetMatch");
 
-    smearBy_ = ( cfg.exists("smearBy") ) ? cfg.getParameter<double>("smearBy") : 1.0;
-    //std::cout << "smearBy = " << smearBy_ << std::endl;
-
-    shiftBy_ = ( cfg.exists("shiftBy") ) ? cfg.getParameter<double>("shiftBy") : 0.;
-    //std::cout << "shiftBy = " << shiftBy_ << std::endl;
+    if ( cfg.exists("shifts") ) {
+      typedef std::vector<edm::ParameterSet> vParameterSet;
+      vParameterSet cfgShifts = cfg.getParameter<vParameterSet>("shifts");
+      for ( vParameterSet::const_iterator cfgShift = cfgShifts.begin();
+	    cfgShift != cfgShifts.end(); ++cfgShift ) {
+	shifts_.push_back(shiftEntryType(*cfgShift));
+      }
+    } else {
+      double smearBy = ( cfg.exists("smearBy") ) ? cfg.getParameter<double>("smearBy") : 1.0;
+      double shiftBy = ( cfg.exists("shiftBy") ) ? cfg.getParameter<double>("shiftBy") : 0.;
+      shifts_.push_back(shiftEntryType("", smearBy, shiftBy));
+    }
+    if ( shifts_.size() == 0 ) 
+      throw cms::Exception("SmearedJetProducer") 
+	<< " Configuration parameter 'shifts' must not be empty !!\n";
 
     if ( cfg.exists("skipJetSelection") ) {
       std::string skipJetSelection_string = cfg.getParameter<std::string>("skipJetSelection");
@@ -199,15 +252,22 @@ class SmearedJetProducerT : public edm::EDProducer
     verbosity_ = ( cfg.exists("verbosity") ) ?
       cfg.getParameter<int>("verbosity") : 0;
 
-    produces<JetCollection>();
-    produces<JetSmearingFlags>("jetSmearingFlags");
+    for ( typename std::vector<shiftEntryType>::const_iterator shift = shifts_.begin();
+	  shift != shifts_.end(); ++shift ) {
+      for ( typename std::vector<shiftEntryType>::const_iterator shift_test = shifts_.begin();
+	    shift_test != shift; ++shift_test ) {
+	if ( shift_test->instanceLabel_ == shift->instanceLabel_ ) 
+	  throw cms::Exception("SmearedJetProducer") 
+	    << " Instance label = '" << shift->instanceLabel_ << "' specified more than once in 'shifts' !!\n";
+      }
+      produces<JetCollection>(shift->instanceLabel_);
+      produces<JetSmearingFlags>(shift->getInstanceLabelFlags());
+    }
 
   }
   ~SmearedJetProducerT()
   {
     delete skipJetSelection_;
-    delete inputFile_;
-    delete lut_;
   }
     
  private:
@@ -225,8 +285,17 @@ class SmearedJetProducerT : public edm::EDProducer
 
     int numJets = jets->size();
 
-    std::auto_ptr<JetCollection> smearedJets(new JetCollection);
-    std::vector<int> jetSmearingFlags_tmp(numJets);
+    genJetMatcher_.beginEvent(evt);
+    jetResolutionExtractor_.beginEvent(evt, jets.id());
+
+    rnd_.setEvent(evt.id().run(), evt.luminosityBlock(), evt.id().event());
+
+    size_t numShifts = shifts_.size();
+    std::vector<JetCollection> smearedJets(numShifts);
+    std::vector<std::vector<int> > jetSmearingFlags_tmp(numShifts, std::vector<int>(numJets));
+    for ( size_t iShift = 0; iShift < numShifts; ++iShift ) {
+      smearedJets[iShift].reserve(numJets);
+    }
 
     for ( int jetIndex = 0; jetIndex < numJets; ++jetIndex ) {
       const T& jet = jets->at(jetIndex);
@@ -243,106 +312,130 @@ class SmearedJetProducerT : public edm::EDProducer
 	std::cout << "corrJet: Pt = " << corrJetP4.pt() << ", eta = " << corrJetP4.eta() << ", phi = " << corrJetP4.phi() << std::endl;
       }
 
-      double smearFactor = 1.;      
+//--- compute quantities that do not depend on smearBy and shiftBy only once per jet
       double x = TMath::Abs(corrJetP4.eta());
       double y = corrJetP4.pt();
-      if ( x > lut_->GetXaxis()->GetXmin() && x < lut_->GetXaxis()->GetXmax() &&
-	   y > lut_->GetYaxis()->GetXmin() && y < lut_->GetYaxis()->GetXmax() ) {
-	int binIndex = lut_->FindBin(x, y);
-	
-	if ( smearBy_ > 0. ) smearFactor += smearBy_*(lut_->GetBinContent(binIndex) - 1.);
-	double smearFactorErr = lut_->GetBinError(binIndex);
-	if ( verbosity_ ) std::cout << "smearFactor = " << smearFactor << " +/- " << smearFactorErr << std::endl;
-
-	if ( shiftBy_ != 0. ) {
-	  smearFactor += (shiftBy_*smearFactorErr);
-	  if ( verbosity_ ) std::cout << "smearFactor(shifted) = " << smearFactor << std::endl;
-	}
-      }
+      double smearFactorLUT = 1.;
+      double smearFactorErr = 0.;
+      bool isInLUT = lut_->lookup(x, y, smearFactorLUT, smearFactorErr);
 
-      double smearedJetEn = jet.energy();
-      double sigmaEn = jetResolutionExtractor_(jet)*TMath::Sqrt(smearFactor*smearFactor - 1.);
+      double jetResolution = jetResolutionExtractor_(jet, jetIndex);
       const reco::GenJet* genJet = genJetMatcher_(jet, &evt);
-      bool isGenMatched = false;
-      if ( genJet ) {
-	if ( verbosity_ ) {
-	  std::cout << "genJet: Pt = " << genJet->pt() << ", eta = " << genJet->eta() << ", phi = " << genJet->phi() << std::endl;
+      if ( genJet && verbosity_ ) {
+	std::cout << "genJet: Pt = " << genJet->pt() << ", eta = " << genJet->eta() << ", phi = " << genJet->phi() << std::endl;
+      }
+
+      // CV: skip smearing in case either "raw" or "corrected" jet energy is very low
+      //     or jet passes selection configurable via python
+      //    (allows for protection against "pathological cases",
+      //     cf. PhysicsTools/PatUtils/python/tools/metUncertaintyTools.py)
+      bool skipJet = ((skipJetSelection_ && (*skipJetSelection_)(jet)) ||
+		      rawJetP4.pt()  < skipRawJetPtThreshold_          ||
+		      corrJetP4.pt() < skipCorrJetPtThreshold_         );
+
+      // CV: draw random number at most once per jet and use the same random number for all shifts,
+      //     so that the smeared jet collections are fully correlated
+      bool isRandomNumber = false;
+      double randomNumber = 0.;
+
+      for ( size_t iShift = 0; iShift < numShifts; ++iShift ) {
+	const shiftEntryType& shiftEntry = shifts_[iShift];
+	if ( verbosity_ && numShifts > 1 ) {
+	  std::cout << "instanceLabel = '" << shiftEntry.instanceLabel_ << "':" << std::endl;
+	}
+
+	double smearFactor = 1.;      
+	if ( isInLUT ) {
+	  if ( shiftEntry.smearBy_ > 0. ) smearFactor += shiftEntry.smearBy_*(smearFactorLUT - 1.);
+	  if ( verbosity_ ) std::cout << "smearFactor = " << smearFactor << " +/- " << smearFactorErr << std::endl;
+
+	  if ( shiftEntry.shiftBy_ != 0. ) {
+	    smearFactor += (shiftEntry.shiftBy_*smearFactorErr);
+	    if ( verbosity_ ) std::cout << "smearFactor(shifted) = " << smearFactor << std::endl;
+	  }
 	}
-	double dEn = corrJetP4.E() - genJet->energy();
-	if ( dEn < (sigmaMaxGenJetMatch_*sigmaEn) ) {
+
+	double smearedJetEn = jet.energy();
+	double sigmaEn = jetResolution*TMath::Sqrt(smearFactor*smearFactor - 1.);
+	bool isGenMatched = false;
+	if ( genJet ) {
+	  double dEn = corrJetP4.E() - genJet->energy();
+	  if ( dEn < (sigmaMaxGenJetMatch_*sigmaEn) ) {
 //--- case 1: reconstructed jet matched to generator level jet, 
 //            smear difference between reconstructed and "true" jet energy
 
-	  if ( verbosity_ ) {
-	    std::cout << " successfully matched to genJet" << std::endl;	
-	    std::cout << "corrJetEn = " << corrJetP4.E() << ", genJetEn = " << genJet->energy() << " --> dEn = " << dEn << std::endl;
-	  }
+	    if ( verbosity_ ) {
+	      std::cout << " successfully matched to genJet" << std::endl;	
+	      std::cout << "corrJetEn = " << corrJetP4.E() << ", genJetEn = " << genJet->energy() << " --> dEn = " << dEn << std::endl;
+	    }
 
-	  smearedJetEn = jet.energy()*(1. + (smearFactor - 1.)*dEn/TMath::Max(rawJetP4.E(), corrJetP4.E()));
-	  isGenMatched = true;
+	    smearedJetEn = jet.energy()*(1. + (smearFactor - 1.)*dEn/TMath::Max(rawJetP4.E(), corrJetP4.E()));
+	    isGenMatched = true;
+	  }
 	}
-      }
-      if ( !isGenMatched ) {
+	if ( !isGenMatched ) {
 //--- case 2: reconstructed jet **not** matched to generator level jet, 
 //            smear jet energy using MC resolution functions implemented in PFMEt significance algorithm (CMS AN-10/400)
 
-	if ( verbosity_ ) {
-	  std::cout << " not matched to genJet" << std::endl;
-	  std::cout << "corrJetEn = " << corrJetP4.E() << ", sigmaEn = " << sigmaEn << std::endl;
-	}
-
-	if ( smearFactor > 1. ) {
-	  // CV: MC resolution already accounted for in reconstructed jet,
-	  //     add additional Gaussian smearing of width = sqrt(smearFactor^2 - 1) 
-	  //     to account for Data/MC **difference** in jet resolutions.
-	  //     Take maximum(rawJetEn, corrJetEn) to avoid pathological cases
-	  //    (e.g. corrJetEn << rawJetEn, due to L1Fastjet corrections)
+	  if ( verbosity_ ) {
+	    std::cout << " not matched to genJet" << std::endl;
+	    std::cout << "corrJetEn = " << corrJetP4.E() << ", sigmaEn = " << sigmaEn << std::endl;
+	  }
 
-	  smearedJetEn = jet.energy()*(1. + rnd_.Gaus(0., sigmaEn)/TMath::Max(rawJetP4.E(), corrJetP4.E()));
+	  if ( smearFactor > 1. ) {
+	    // CV: MC resolution already accounted for in reconstructed jet,
+	    //     add additional Gaussian smearing of width = sqrt(smearFactor^2 - 1) 
+	    //     to account for Data/MC **difference** in jet resolutions.
+	    //     Take maximum(rawJetEn, corrJetEn) to avoid pathological cases
+	    //    (e.g. corrJetEn << rawJetEn, due to L1Fastjet corrections)
+
+	    if ( !isRandomNumber ) {
+	      randomNumber = rnd_.gaus(jetIndex);
+	      isRandomNumber = true;
+	    }
+	    smearedJetEn = jet.energy()*(1. + sigmaEn*randomNumber/TMath::Max(rawJetP4.E(), corrJetP4.E()));
+	  }
 	}
-      }
 
-      // CV: keep minimum jet energy, in order not to loose direction information
-      const double minJetEn = 1.e-2;
-      if ( smearedJetEn < minJetEn ) smearedJetEn = minJetEn;
+	// CV: keep minimum jet energy, in order not to loose direction information
+	const double minJetEn = 1.e-2;
+	if ( smearedJetEn < minJetEn ) smearedJetEn = minJetEn;
 
-      // CV: skip smearing in case either "raw" or "corrected" jet energy is very low
-      //     or jet passes selection configurable via python
-      //    (allows for protection against "pathological cases",
-      //     cf. PhysicsTools/PatUtils/python/tools/metUncertaintyTools.py)
-      reco::Candidate::LorentzVector smearedJetP4 = jet.p4();
-      if ( !((skipJetSelection_ && (*skipJetSelection_)(jet)) ||
-	     rawJetP4.pt()  < skipRawJetPtThreshold_          ||
-	     corrJetP4.pt() < skipCorrJetPtThreshold_         ) ) {
-	if ( verbosity_ ) {
-	  std::cout << " multiplying jetP4 by factor = " << (smearedJetEn/jet.energy()) << " --> smearedJetEn = " << smearedJetEn << std::endl;
+	reco::Candidate::LorentzVector smearedJetP4 = jet.p4();
+	if ( !skipJet ) {
+	  if ( verbosity_ ) {
+	    std::cout << " multiplying jetP4 by factor = " << (smearedJetEn/jet.energy()) << " --> smearedJetEn = " << smearedJetEn << std::endl;
+	  }
+	  smearedJetP4 *= (smearedJetEn/jet.energy());
 	}
-	smearedJetP4 *= (smearedJetEn/jet.energy());
-      }
 	  
-      if ( verbosity_ ) {
-	std::cout << "smearedJet: Pt = " << smearedJetP4.pt() << ", eta = " << smearedJetP4.eta() << ", phi = " << smearedJetP4.phi() << std::endl;
-	std::cout << " dPt = " << (smearedJetP4.pt() - jet.pt()) 
-		  << " (Px = " << (smearedJetP4.px() - jet.px()) << ", Py = " << (smearedJetP4.py() - jet.py()) << ")" << std::endl;
-      }
-      
-      T smearedJet = (jet);
-      smearedJet.setP4(smearedJetP4);
+	if ( verbosity_ ) {
+	  std::cout << "smearedJet: Pt = " << smearedJetP4.pt() << ", eta = " << smearedJetP4.eta() << ", phi = " << smearedJetP4.phi() << std::endl;
+	  std::cout << " dPt = " << (smearedJetP4.pt() - jet.pt()) 
+		    << " (Px = " << (smearedJetP4.px() - jet.px()) << ", Py = " << (smearedJetP4.py() - jet.py()) << ")" << std::endl;
+	}
       
-      smearedJets->push_back(smearedJet);
+	smearedJets[iShift].push_back(jet);
+	smearedJets[iShift].back().setP4(smearedJetP4);
 
-      if ( isGenMatched ) jetSmearingFlags_tmp[jetIndex] = 1;
-      else jetSmearingFlags_tmp[jetIndex] = 0;
+	if ( isGenMatched ) jetSmearingFlags_tmp[iShift][jetIndex] = 1;
+	else jetSmearingFlags_tmp[iShift][jetIndex] = 0;
+      }
     }
 
-    std::auto_ptr<JetSmearingFlags> jetSmearingFlags(new JetSmearingFlags);
-    JetSmearingFlags::Filler valueMapFiller(*jetSmearingFlags);
-    valueMapFiller.insert(jets, jetSmearingFlags_tmp.begin(), jetSmearingFlags_tmp.end());
-    valueMapFiller.fill();
+//--- add collections of "smeared" jets to the event
+    for ( size_t iShift = 0; iShift < numShifts; ++iShift ) {
+      std::auto_ptr<JetCollection> smearedJets_i(new JetCollection);
+      smearedJets_i->swap(smearedJets[iShift]);
 
-//--- add collection of "smeared" jets to the event
-    evt.put(smearedJets);
-    evt.put(jetSmearingFlags, "jetSmearingFlags");
+      std::auto_ptr<JetSmearingFlags> jetSmearingFlags(new JetSmearingFlags);
+      JetSmearingFlags::Filler valueMapFiller(*jetSmearingFlags);
+      valueMapFiller.insert(jets, jetSmearingFlags_tmp[iShift].begin(), jetSmearingFlags_tmp[iShift].end());
+      valueMapFiller.fill();
+
+      evt.put(smearedJets_i, shifts_[iShift].instanceLabel_);
+      evt.put(jetSmearingFlags, shifts_[iShift].getInstanceLabelFlags());
+    }
   } 
 
   std::string moduleLabel_;
@@ -354,11 +447,10 @@ class SmearedJetProducerT : public edm::EDProducer
   // collection of pat::Jets (with L2L3/L2L3Residual corrections applied)
   edm::InputTag src_;
 
-  TFile* inputFile_;
-  TH2* lut_;
+  boost::shared_ptr<const TH2LookupTable> lut_; // shared with all other modules reading the same LUT
 
   SmearedJetProducer_namespace::JetResolutionExtractorT<T> jetResolutionExtractor_;
-  TRandom3 rnd_;
+  CounterBasedRandomGenerator rnd_; // random numbers depend on (module label, run, lumi, event, jet index) only
 
   std::string jetCorrLabel_; // e.g. 'ak5PFJetL1FastL2L3' (reco::PFJets) / '' (pat::Jets)
   double jetCorrEtaMax_; // do not use JEC factors for |eta| above this threshold (recommended default = 4.7),
@@ -372,9 +464,26 @@ class SmearedJetProducerT : public edm::EDProducer
                                // (if the difference between reconstructed and generated jet energy exceeds this threshold,
                                //  the jet is considered to have substantial pile-up contributions are is considered to be unmatched)
 
-  double smearBy_; // option to "smear" jet energy by N standard-deviations, useful for template morphing
-
-  double shiftBy_; // option to increase/decrease within uncertainties the jet energy resolution used for smearing 
+  struct shiftEntryType
+  {
+    shiftEntryType(const std::string& instanceLabel, double smearBy, double shiftBy)
+      : instanceLabel_(instanceLabel),
+	smearBy_(smearBy),
+	shiftBy_(shiftBy)
+    {}
+    shiftEntryType(const edm::ParameterSet& cfg)
+      : instanceLabel_(cfg.getParameter<std::string>("instanceLabel")),
+	smearBy_(( cfg.exists("smearBy") ) ? cfg.getParameter<double>("smearBy") : 1.0),
+	shiftBy_(( cfg.exists("shiftBy") ) ? cfg.getParameter<double>("shiftBy") : 0.)
+    {}
+    ~shiftEntryType() {}
+    std::string getInstanceLabelFlags() const { return std::string("jetSmearingFlags").append(instanceLabel_); }
+    std::string instanceLabel_;
+    double smearBy_; // option to "smear" jet energy by N standard-deviations, useful for template morphing
+    double shiftBy_; // option to increase/decrease within uncertainties the jet energy resolution used for smearing 
+  };
+  std::vector<shiftEntryType> shifts_; // smeared jet collections produced in one pass,
+                                       // sharing raw/corrected jet momenta, generator level jet matches, resolutions and random numbers
 
   StringCutObjectSelector<T>* skipJetSelection_; // jets passing this cut are **not** smeared 
   double skipRawJetPtThreshold_;  // jets with transverse momenta below this value (either on "raw" or "corrected" level) 
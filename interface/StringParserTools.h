@@ -2,6 +2,9 @@
 #define PhysicsTools_PatUtils_interface_StringParserTools_h
 
 #include <boost/shared_ptr.hpp>
+#include <typeinfo>
+#include <utility>
+#include <vector>
 #include "CommonTools/Utils/interface/StringObjectFunction.h"
 #include "CommonTools/Utils/interface/StringCutObjectSelector.h"
 
@@ -26,17 +29,27 @@ private:
     std::string expr_;
     boost::shared_ptr<StringObjectFunction<reco::Candidate> > candFunc_; 
 
-    boost::shared_ptr<StringObjectFunction<pat::Electron> >         eleFunc_;
-    boost::shared_ptr<StringObjectFunction<pat::Muon> >              muFunc_;
-    boost::shared_ptr<StringObjectFunction<pat::Tau> >              tauFunc_;
-    boost::shared_ptr<StringObjectFunction<pat::Photon> >           gamFunc_;
-    boost::shared_ptr<StringObjectFunction<pat::Jet> >              jetFunc_;
-    boost::shared_ptr<StringObjectFunction<pat::MET> >              metFunc_;
-    boost::shared_ptr<StringObjectFunction<pat::GenericParticle> >   gpFunc_;
-    boost::shared_ptr<StringObjectFunction<pat::PFParticle> >        pfFunc_;
+    /// evaluate the expression on an object of one concrete PAT type
+    struct EvaluatorBase {
+        virtual ~EvaluatorBase() {}
+        virtual double operator()(const reco::Candidate &c) const = 0;
+    };
+    template<typename Obj>
+    struct Evaluator : public EvaluatorBase {
+        Evaluator(const boost::shared_ptr<StringObjectFunction<Obj> > &func) : func_(func) {}
+        double operator()(const reco::Candidate &c) const { return (*func_)(static_cast<const Obj &>(c)); }
+        boost::shared_ptr<StringObjectFunction<Obj> > func_;
+    };
+
+    /// Evaluators for the types of objects seen so far (null if the expression can't be parsed for that type);
+    /// the expression is parsed for a given type only when the first object of that type is seen
+    typedef std::vector<std::pair<const std::type_info *, boost::shared_ptr<EvaluatorBase> > > EvaluatorCache;
+    mutable EvaluatorCache evaluators_;
+
+    const EvaluatorBase * findEvaluator(const std::type_info &type) const ;
 
     template<typename Obj> 
-    boost::shared_ptr<StringObjectFunction<Obj> > tryGet(const std::string &str) {
+    boost::shared_ptr<StringObjectFunction<Obj> > tryGet(const std::string &str) const {
         try {
             return boost::shared_ptr<StringObjectFunction<Obj> >(new StringObjectFunction<Obj>(str));
         } catch (cms::Exception) { 
@@ -45,12 +58,10 @@ private:
     }
 
     template<typename Obj>
-    double
-    tryEval(const reco::Candidate &c, const boost::shared_ptr<StringObjectFunction<Obj> > &func) const {
-        if (func.get()) return (*func)(static_cast<const Obj &>(c));
-        else throwBadType(typeid(c));
-        assert(false);
-        return 0; 
+    boost::shared_ptr<EvaluatorBase> makeEvaluator() const {
+        boost::shared_ptr<StringObjectFunction<Obj> > func = tryGet<Obj>(expr_);
+        if (func.get()) return boost::shared_ptr<EvaluatorBase>(new Evaluator<Obj>(func));
+        else return boost::shared_ptr<EvaluatorBase>();
     }
 
     // out of line throw exception
@@ -70,17 +81,27 @@ private:
     std::string expr_;
     boost::shared_ptr<StringCutObjectSelector<reco::Candidate> > candFunc_; 
 
-    boost::shared_ptr<StringCutObjectSelector<pat::Electron> >         eleFunc_;
-    boost::shared_ptr<StringCutObjectSelector<pat::Muon> >              muFunc_;
-    boost::shared_ptr<StringCutObjectSelector<pat::Tau> >              tauFunc_;
-    boost::shared_ptr<StringCutObjectSelector<pat::Photon> >           gamFunc_;
-    boost::shared_ptr<StringCutObjectSelector<pat::Jet> >              jetFunc_;
-    boost::shared_ptr<StringCutObjectSelector<pat::MET> >              metFunc_;
-    boost::shared_ptr<StringCutObjectSelector<pat::GenericParticle> >   gpFunc_;
-    boost::shared_ptr<StringCutObjectSelector<pat::PFParticle> >        pfFunc_;
+    /// evaluate the expression on an object of one concrete PAT type
+    struct EvaluatorBase {
+        virtual ~EvaluatorBase() {}
+        virtual bool operator()(const reco::Candidate &c) const = 0;
+    };
+    template<typename Obj>
+    struct Evaluator : public EvaluatorBase {
+        Evaluator(const boost::shared_ptr<StringCutObjectSelector<Obj> > &func) : func_(func) {}
+        bool operator()(const reco::Candidate &c) const { return (*func_)(static_cast<const Obj &>(c)); }
+        boost::shared_ptr<StringCutObjectSelector<Obj> > func_;
+    };
+
+    /// Evaluators for the types of objects seen so far (null if the expression can't be parsed for that type);
+    /// the expression is parsed for a given type only when the first object of that type is seen
+    typedef std::vector<std::pair<const std::type_info *, boost::shared_ptr<EvaluatorBase> > > EvaluatorCache;
+    mutable EvaluatorCache evaluators_;
+
+    const EvaluatorBase * findEvaluator(const std::type_info &type) const ;
 
     template<typename Obj> 
-    boost::shared_ptr<StringCutObjectSelector<Obj> > tryGet(const std::string &str) {
+    boost::shared_ptr<StringCutObjectSelector<Obj> > tryGet(const std::string &str) const {
         try {
             return boost::shared_ptr<StringCutObjectSelector<Obj> >(new StringCutObjectSelector<Obj>(str));
         } catch (cms::Exception) { 
@@ -89,12 +110,10 @@ private:
     }
 
     template<typename Obj>
-    bool
-    tryEval(const reco::Candidate &c, const boost::shared_ptr<StringCutObjectSelector<Obj> > &func) const {
-        if (func.get()) return (*func)(static_cast<const Obj &>(c));
-        else throwBadType(typeid(c));
-        assert(false);
-        return false;
+    boost::shared_ptr<EvaluatorBase> makeEvaluator() const {
+        boost::shared_ptr<StringCutObjectSelector<Obj> > func = tryGet<Obj>(expr_);
+        if (func.get()) return boost::shared_ptr<EvaluatorBase>(new Evaluator<Obj>(func));
+        else return boost::shared_ptr<EvaluatorBase>();
     }
 
     // out of line throw exception
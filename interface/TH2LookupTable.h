@@ -0,0 +1,76 @@
+#ifndef PhysicsTools_PatUtils_TH2LookupTable_h
+#define PhysicsTools_PatUtils_TH2LookupTable_h
+
+/** \class TH2LookupTable
+ *
+ * Read-only copy of the bin contents and errors of a two-dimensional histogram,
+ * stored in flat arrays, for fast lookup of e.g. Data/MC jet resolution correction factors.
+ *
+ * NOTE: bins are found in the same way as by TAxis::FindBin
+ *      (arithmetically for axes with bins of equal width, by binary search for axes with variable bin width),
+ *       so that the values returned by TH2LookupTable::lookup are identical to those returned by TH2::GetBinContent and TH2::GetBinError.
+ *
+ *       Modules should obtain the table via TH2LookupTable::get,
+ *       in order to share one copy between all modules in the process.
+ *       The ROOT file is closed right after the histogram has been copied.
+ *
+ */
+
+#include <TH2.h>
+#include <TAxis.h>
+
+#include <boost/shared_ptr.hpp>
+
+#include <string>
+#include <vector>
+#include <algorithm>
+
+class TH2LookupTable
+{
+ public:
+
+  explicit TH2LookupTable(const TH2&);
+  ~TH2LookupTable() {}
+
+  /// get table for histogram of given name stored in given ROOT file;
+  /// the file is read only once per process and the returned table is shared by all callers requesting the same histogram
+  static boost::shared_ptr<const TH2LookupTable> get(const std::string&, const std::string&);
+
+  /// get bin content and error for given x, y;
+  /// returns false (and leaves content and error unchanged) in case x or y are not strictly within the range of the axes
+  bool lookup(double x, double y, double& content, double& error) const
+  {
+    if ( !(xAxis_.isInRange(x) && yAxis_.isInRange(y)) ) return false;
+    unsigned binIndex = (yAxis_.findBin(y) - 1)*xAxis_.numBins_ + (xAxis_.findBin(x) - 1);
+    content = contents_[binIndex];
+    error = errors_[binIndex];
+    return true;
+  }
+
+ private:
+
+  struct axisEntryType
+  {
+    axisEntryType(const TAxis&);
+    bool isInRange(double x) const { return (x > min_ && x < max_); }
+    int findBin(double x) const
+    {
+      // CV: same computation as in TAxis::FindBin
+      //    (protected against rounding of x close to the upper edge of the axis into the overflow bin)
+      if ( isUniform_ ) return std::min(1 + int(numBins_*(x - min_)/(max_ - min_)), numBins_);
+      else return (std::upper_bound(edges_.begin(), edges_.end(), x) - edges_.begin());
+    }
+    double min_;
+    double max_;
+    int numBins_;
+    bool isUniform_;
+    std::vector<double> edges_;
+  };
+  axisEntryType xAxis_;
+  axisEntryType yAxis_;
+
+  std::vector<double> contents_;
+  std::vector<double> errors_;
+};
+
+#endif
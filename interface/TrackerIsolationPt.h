@@ -12,10 +12,18 @@
    TrackerIsolationPt calculates a tracker isolation pt in a cone
    around the lepton's direction, without doing track extrapolation
 
+   When computing the isolation of several leptons in the same event,
+   an eta-phi index of the tracks can be built once per event by buildTrackIndex
+   and passed to calculate, so that only tracks close to the lepton are visited
+
   \author   Steven Lowette
   \version  $Id: TrackerIsolationPt.h,v 1.3 2008/02/28 14:54:24 llista Exp $
 */
 
+#include "PhysicsTools/PatUtils/interface/EtaPhiGrid.h"
+#include "DataFormats/Math/interface/Vector3D.h"
+#include "DataFormats/Math/interface/Point3D.h"
+
 namespace reco {
   class Track;
 }
@@ -35,9 +43,22 @@ namespace pat {
     
     float calculate(const Electron & theElectron, const edm::View<reco::Track> & theTracks, float isoConeElectron = 0.3) const;
     float calculate(const Muon & theMuon, const edm::View<reco::Track> & theTracks, float isoConeMuon = 0.3) const;
+
+    /// same as above, using an eta-phi index of the tracks built by buildTrackIndex (for the same collection of tracks)
+    float calculate(const Electron & theElectron, const edm::View<reco::Track> & theTracks, const helper::EtaPhiGrid & trackIndex, float isoConeElectron = 0.3) const;
+    float calculate(const Muon & theMuon, const edm::View<reco::Track> & theTracks, const helper::EtaPhiGrid & trackIndex, float isoConeMuon = 0.3) const;
+
+    /// same as above, for a lepton track given by its momentum and vertex
+    /// (e.g. the gsfTrack of a reco::GsfElectron, without building a pat::Electron);
+    /// NOTE: the vertex is not used for the time being, as no track extrapolation is done
+    float calculate(const math::XYZVector & theMomentum, const math::XYZPoint & theVertex, const edm::View<reco::Track> & theTracks, float isoCone = 0.3) const;
+    float calculate(const math::XYZVector & theMomentum, const math::XYZPoint & theVertex, const edm::View<reco::Track> & theTracks, const helper::EtaPhiGrid & trackIndex, float isoCone = 0.3) const;
+
+    /// build eta-phi index of the tracks, valid for isolation cones up to maxIsoCone
+    static void buildTrackIndex(const edm::View<reco::Track> & theTracks, float maxIsoCone, helper::EtaPhiGrid & trackIndex);
     
   private:
-    float calculate(const reco::Track & theTrack, const edm::View<reco::Track> & theTracks, float isoCone) const;
+    float calculate(const math::XYZVector & theMomentum, const edm::View<reco::Track> & theTracks, const helper::EtaPhiGrid * trackIndex, float isoCone) const;
   };
 
 }
@@ -16,6 +16,11 @@
             The following class(es) are implemented in the pat::helper namespace:
             - TriggerMatchHelper:
               + provides the usage of functions which need the edm::AssociativeIterator;
+              + the associations of a matcher module are iterated only once per event:
+                on first access, an index of the matched physics objects and trigger objects is built and cached
+                for the following calls in the same event;
+                a cached index is used only if the size and the product IDs of the association are unchanged,
+                resetCache() drops all cached indices;
 
   \author   Volker Adler
   \version  $Id: TriggerHelper.h,v 1.6 2010/12/20 11:55:48 vadler Exp $
@@ -23,9 +28,14 @@
 
 
 #include <string>
+#include <vector>
+#include <map>
+#include <utility>
 
 #include "DataFormats/PatCandidates/interface/TriggerEvent.h"
 #include "DataFormats/Candidate/interface/Candidate.h"
+#include "DataFormats/Provenance/interface/EventID.h"
+#include "DataFormats/Provenance/interface/ProductID.h"
 #include "FWCore/Framework/interface/Event.h"
 
 
@@ -40,13 +50,16 @@ namespace pat {
         /// Constructors and Destructor
 
         /// Default constructor
-        TriggerMatchHelper() {};
+        TriggerMatchHelper() : cachedTriggerEvent_( 0 ) {};
 
         /// Destructor
         ~TriggerMatchHelper() {};
 
         /// Methods
 
+        /// Drop the cached indices of the associations
+        void resetCache() const;
+
         /// Get a reference to the trigger objects matched to a certain physics object given by a reference for a certain matcher module
         /// ... by resulting association
         TriggerObjectRef triggerMatchObject( const reco::CandidateBaseRef & candRef, const TriggerObjectMatch * matchResult, const edm::Event & event, const TriggerEvent & triggerEvent ) const;
@@ -72,6 +85,29 @@ namespace pat {
         /// ... by matcher module label
         reco::CandidateBaseRefVector triggerMatchCandidates( const edm::Handle< TriggerObjectCollection > & trigCollHandle, const size_t iTrig, const std::string & labelMatcher      , const edm::Event & event, const TriggerEvent & triggerEvent ) const;
 
+      private:
+
+        /// Index of the associations of one matcher module, keyed by (ProductID, key) of the physics objects and trigger objects
+        typedef std::pair< edm::ProductID, size_t > RefKey;
+        struct MatchIndex {
+          /// size and product IDs of the association the index has been built for
+          size_t                                           associationSize_;
+          edm::ProductID                                   objectProductID_;
+          std::vector< edm::ProductID >                    candidateProductIDs_;
+          /// first trigger object matched to each physics object
+          std::map< RefKey, TriggerObjectRef >             objectByCandidate_;
+          /// all physics objects matched to each trigger object
+          std::map< RefKey, reco::CandidateBaseRefVector > candidatesByObject_;
+        };
+
+        /// Get the index of the associations of a matcher module, building it on first access in the event
+        const MatchIndex & matchIndex( const TriggerObjectMatch * matchResult, const edm::Event & event, const TriggerEvent & triggerEvent ) const;
+
+        /// Cached indices, valid for the event and trigger event given below only
+        mutable edm::EventID                                    cachedEventID_;
+        mutable const TriggerEvent *                            cachedTriggerEvent_;
+        mutable std::map< const TriggerObjectMatch *, MatchIndex > cachedMatchIndices_;
+
     };
 
     // Method Templates
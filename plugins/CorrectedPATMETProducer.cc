@@ -1,7 +1,7 @@
 
 /** \class CorrectedPATMETProducer
  *
- * Instantiate CorrectedMETProducer template for pat::MET (PF or Calo)
+ * Instantiate CorrectedMETProducer and CorrectedMETProducerForSystematics templates for pat::MET (PF or Calo)
  *
  * NOTE: This file also defines concrete implementation of CorrectedMETFactory template
  *       specific to pat::MET
@@ -18,6 +18,7 @@
 #include "DataFormats/PatCandidates/interface/MET.h"
 
 #include "JetMETCorrections/Type1MET/interface/CorrectedMETProducerT.h"
+#include "PhysicsTools/PatUtils/interface/CorrectedMETProducerForSystematicsT.h"
 
 namespace CorrectedMETProducer_namespace
 {
@@ -37,8 +38,10 @@ namespace CorrectedMETProducer_namespace
 }
 
 typedef CorrectedMETProducerT<pat::MET> CorrectedPATMETProducer;
+typedef CorrectedMETProducerForSystematicsT<pat::MET> CorrectedPATMETProducerForSystematics;
 
 #include "FWCore/Framework/interface/MakerMacros.h"
 
 DEFINE_FWK_MODULE(CorrectedPATMETProducer);
+DEFINE_FWK_MODULE(CorrectedPATMETProducerForSystematics);
 
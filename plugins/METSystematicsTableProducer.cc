@@ -0,0 +1,100 @@
+
+/** \class METSystematicsTableProducer
+ *
+ * Collect px, py and sumEt of MET for a list of systematic variations
+ * into one compact pat::METSystematicsTable
+ *
+ * NOTE: the variations are specified by a 'variations' VPSet,
+ *       each entry of which defines the name of the variation and the MET collection ('src') to be read;
+ *       each MET collection is expected to contain exactly one MET object.
+ *
+ */
+
+#include "FWCore/Framework/interface/EDProducer.h"
+#include "FWCore/Framework/interface/Event.h"
+#include "FWCore/Framework/interface/EventSetup.h"
+#include "FWCore/ParameterSet/interface/ParameterSet.h"
+#include "FWCore/Utilities/interface/InputTag.h"
+#include "FWCore/Utilities/interface/Exception.h"
+
+#include "DataFormats/Common/interface/View.h"
+#include "DataFormats/METReco/interface/MET.h"
+
+#include "PhysicsTools/PatUtils/interface/METSystematicsTable.h"
+
+#include <string>
+#include <vector>
+
+class METSystematicsTableProducer : public edm::EDProducer
+{
+ public:
+
+  explicit METSystematicsTableProducer(const edm::ParameterSet&);
+  ~METSystematicsTableProducer() {}
+
+ private:
+
+  void produce(edm::Event&, const edm::EventSetup&);
+
+  std::string moduleLabel_;
+
+  struct variationEntryType
+  {
+    variationEntryType(const edm::ParameterSet& cfg)
+      : name_(cfg.getParameter<std::string>("name")),
+        src_(cfg.getParameter<edm::InputTag>("src"))
+    {}
+    ~variationEntryType() {}
+    std::string name_;
+    edm::InputTag src_;
+  };
+  std::vector<variationEntryType> variations_;
+};
+
+METSystematicsTableProducer::METSystematicsTableProducer(const edm::ParameterSet& cfg)
+  : moduleLabel_(cfg.getParameter<std::string>("@module_label"))
+{
+  typedef std::vector<edm::ParameterSet> vParameterSet;
+  vParameterSet cfgVariations = cfg.getParameter<vParameterSet>("variations");
+  for ( vParameterSet::const_iterator cfgVariation = cfgVariations.begin();
+	cfgVariation != cfgVariations.end(); ++cfgVariation ) {
+    variations_.push_back(variationEntryType(*cfgVariation));
+  }
+
+  for ( std::vector<variationEntryType>::const_iterator variation = variations_.begin();
+	variation != variations_.end(); ++variation ) {
+    for ( std::vector<variationEntryType>::const_iterator variation_test = variations_.begin();
+	  variation_test != variation; ++variation_test ) {
+      if ( variation_test->name_ == variation->name_ )
+	throw cms::Exception("METSystematicsTableProducer")
+	  << " Name = '" << variation->name_ << "' specified more than once in 'variations' !!\n";
+    }
+  }
+
+  produces<pat::METSystematicsTable>();
+}
+
+void METSystematicsTableProducer::produce(edm::Event& evt, const edm::EventSetup& es)
+{
+  std::auto_ptr<pat::METSystematicsTable> metSystematicsTable(new pat::METSystematicsTable());
+
+  typedef edm::View<reco::MET> METView;
+  for ( std::vector<variationEntryType>::const_iterator variation = variations_.begin();
+	variation != variations_.end(); ++variation ) {
+    edm::Handle<METView> metCollection;
+    evt.getByLabel(variation->src_, metCollection);
+
+    if ( metCollection->size() != 1 )
+      throw cms::Exception("METSystematicsTableProducer")
+	<< "Failed to find unique MET object in collection = " << variation->src_.label() << " !!\n";
+
+    const reco::MET& met = metCollection->front();
+    metSystematicsTable->addVariation(variation->name_, met.px(), met.py(), met.sumEt());
+  }
+
+  evt.put(metSystematicsTable);
+}
+
+#include "FWCore/Framework/interface/MakerMacros.h"
+
+DEFINE_FWK_MODULE(METSystematicsTableProducer);
@@ -0,0 +1,12 @@
+#include "PhysicsTools/PatUtils/interface/ShiftedJetProducerByJECSourcesT.h"
+
+#include "DataFormats/JetReco/interface/CaloJet.h"
+#include "DataFormats/JetReco/interface/PFJet.h"
+
+typedef ShiftedJetProducerByJECSourcesT<reco::CaloJet> ShiftedCaloJetProducerByJECSources;
+typedef ShiftedJetProducerByJECSourcesT<reco::PFJet> ShiftedPFJetProducerByJECSources;
+
+#include "FWCore/Framework/interface/MakerMacros.h"
+
+DEFINE_FWK_MODULE(ShiftedCaloJetProducerByJECSources);
+DEFINE_FWK_MODULE(ShiftedPFJetProducerByJECSources);
@@ -21,7 +21,28 @@ ShiftedMETcorrInputProducer::ShiftedMETcorrInputProducer(const edm::ParameterSet
     }
   }
 
-  shiftBy_ = cfg.getParameter<double>("shiftBy");
+  if ( cfg.exists("shifts") ) {
+    typedef std::vector<edm::ParameterSet> vParameterSet;
+    vParameterSet cfgShifts = cfg.getParameter<vParameterSet>("shifts");
+    for ( vParameterSet::const_iterator cfgShift = cfgShifts.begin();
+	  cfgShift != cfgShifts.end(); ++cfgShift ) {
+      shifts_.push_back(shiftEntryType(*cfgShift));
+    }
+  } else {
+    shifts_.push_back(shiftEntryType("", cfg.getParameter<double>("shiftBy")));
+  }
+  if ( shifts_.size() == 0 )
+    throw cms::Exception("ShiftedMETcorrInputProducer")
+      << " Configuration parameter 'shifts' must not be empty !!\n";
+  for ( std::vector<shiftEntryType>::const_iterator shift = shifts_.begin();
+	shift != shifts_.end(); ++shift ) {
+    for ( std::vector<shiftEntryType>::const_iterator shift_test = shifts_.begin();
+	  shift_test != shift; ++shift_test ) {
+      if ( shift_test->instanceLabel_ == shift->instanceLabel_ )
+	throw cms::Exception("ShiftedMETcorrInputProducer")
+	  << " Instance label = '" << shift->instanceLabel_ << "' specified more than once in 'shifts' !!\n";
+    }
+  }
 
   if ( cfg.exists("binning") ) {
     typedef std::vector<edm::ParameterSet> vParameterSet;
@@ -39,7 +60,16 @@ ShiftedMETcorrInputProducer::ShiftedMETcorrInputProducer(const edm::ParameterSet
 	src_i != src_.end(); ++src_i ) {
     for ( std::vector<binningEntryType*>::const_iterator binningEntry = binning_.begin();
 	  binningEntry != binning_.end(); ++binningEntry ) {
-      produces<CorrMETData>((*binningEntry)->getInstanceLabel_full(src_i->instance()));
+      std::string instanceLabel_full = (*binningEntry)->getInstanceLabel_full(src_i->instance());
+      inputEntryType input(edm::InputTag(src_i->label(), instanceLabel_full), (*binningEntry)->binUncertainty_);
+      for ( std::vector<shiftEntryType>::const_iterator shift = shifts_.begin();
+	    shift != shifts_.end(); ++shift ) {
+	std::string shiftedInstanceLabel = instanceLabel_full;
+	shiftedInstanceLabel.append(shift->instanceLabel_);
+	produces<CorrMETData>(shiftedInstanceLabel);
+	input.shiftedInstanceLabels_.push_back(shiftedInstanceLabel);
+      }
+      inputs_.push_back(input);
     }
   }
 }
@@ -54,14 +84,14 @@ ShiftedMETcorrInputProducer::~ShiftedMETcorrInputProducer()
 
 void ShiftedMETcorrInputProducer::produce(edm::Event& evt, const edm::EventSetup& es)
 {
-  for ( vInputTag::const_iterator src_i = src_.begin();
-	src_i != src_.end(); ++src_i ) {
-    for ( std::vector<binningEntryType*>::iterator binningEntry = binning_.begin();
-	  binningEntry != binning_.end(); ++binningEntry ) {
-      edm::Handle<CorrMETData> originalObject;
-      evt.getByLabel(edm::InputTag(src_i->label(), (*binningEntry)->getInstanceLabel_full(src_i->instance())), originalObject);
-  
-      double shift = shiftBy_*(*binningEntry)->binUncertainty_;
+  size_t numShifts = shifts_.size();
+  for ( std::vector<inputEntryType>::const_iterator input = inputs_.begin();
+	input != inputs_.end(); ++input ) {
+    edm::Handle<CorrMETData> originalObject;
+    evt.getByLabel(input->src_, originalObject);
+
+    for ( size_t iShift = 0; iShift < numShifts; ++iShift ) {
+      double shift = shifts_[iShift].shiftBy_*input->binUncertainty_;
       
       std::auto_ptr<CorrMETData> shiftedObject(new CorrMETData(*originalObject));
 //--- MET balances momentum of reconstructed particles,
@@ -70,7 +100,7 @@ void ShiftedMETcorrInputProducer::produce(edm::Event& evt, const edm::EventSetup
       shiftedObject->mey   = -shift*originalObject->mey;
       shiftedObject->sumet = shift*originalObject->sumet;
       
-      evt.put(shiftedObject, (*binningEntry)->getInstanceLabel_full(src_i->instance()));
+      evt.put(shiftedObject, input->shiftedInstanceLabels_[iShift]);
     }
   }
 }
@@ -6,6 +6,12 @@
  * Vary px, py and sumEt of "unclustered energy" (PFJets of Pt < 10 GeV plus PFCandidates not within jets)
  * by +/- 1 standard deviation, in order to estimate resulting uncertainty on MET
  *
+ * NOTE: several shifts (e.g. up and down) can be produced in one pass
+ *       by specifying a 'shifts' VPSet, each entry of which defines the instance label and the shiftBy value of one shift.
+ *       The shifted MET corrections are stored with instance label = instance label of the original MET correction
+ *       with the instance label of the shift appended.
+ *       Each original MET correction is retrieved from the event only once, independent of the number of shifts.
+ *
  * \author Christian Veelken, LLR
  *
  * \version $Revision: 1.1 $
@@ -21,6 +27,7 @@
 #include "FWCore/Utilities/interface/InputTag.h"
 
 #include <string>
+#include <vector>
 
 class ShiftedMETcorrInputProducer : public edm::EDProducer  
 {
@@ -61,7 +68,36 @@ class ShiftedMETcorrInputProducer : public edm::EDProducer
   };
   std::vector<binningEntryType*> binning_;
 
-  double shiftBy_;
+  struct shiftEntryType
+  {
+    shiftEntryType(const std::string& instanceLabel, double shiftBy)
+      : instanceLabel_(instanceLabel),
+	shiftBy_(shiftBy)
+    {}
+    shiftEntryType(const edm::ParameterSet& cfg)
+      : instanceLabel_(cfg.getParameter<std::string>("instanceLabel")),
+	shiftBy_(cfg.getParameter<double>("shiftBy"))
+    {}
+    ~shiftEntryType() {}
+    std::string instanceLabel_;
+    double shiftBy_; // set to +1.0/-1.0 for up/down variation of "unclustered energy"
+  };
+  std::vector<shiftEntryType> shifts_;
+
+  // CV: InputTags of original MET corrections and instance labels of shifted MET corrections,
+  //     computed once in the constructor for each src x binning entry
+  struct inputEntryType
+  {
+    inputEntryType(const edm::InputTag& src, double binUncertainty)
+      : src_(src),
+	binUncertainty_(binUncertainty)
+    {}
+    ~inputEntryType() {}
+    edm::InputTag src_;
+    double binUncertainty_;
+    std::vector<std::string> shiftedInstanceLabels_; // one entry per shift
+  };
+  std::vector<inputEntryType> inputs_;
 };
 
 #endif
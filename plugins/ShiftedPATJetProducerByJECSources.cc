@@ -0,0 +1,9 @@
+#include "PhysicsTools/PatUtils/interface/ShiftedJetProducerByJECSourcesT.h"
+
+#include "DataFormats/PatCandidates/interface/Jet.h"
+
+typedef ShiftedJetProducerByJECSourcesT<pat::Jet> ShiftedPATJetProducerByJECSources;
+
+#include "FWCore/Framework/interface/MakerMacros.h"
+
+DEFINE_FWK_MODULE(ShiftedPATJetProducerByJECSources);
@@ -0,0 +1,18 @@
+#include "PhysicsTools/PatUtils/interface/ShiftedParticleMETcorrInputProducerT.h"
+
+#include "DataFormats/PatCandidates/interface/Electron.h"
+#include "DataFormats/PatCandidates/interface/Photon.h"
+#include "DataFormats/PatCandidates/interface/Muon.h"
+#include "DataFormats/PatCandidates/interface/Tau.h"
+
+typedef ShiftedParticleMETcorrInputProducerT<pat::Electron> ShiftedPATElectronMETcorrInputProducer;
+typedef ShiftedParticleMETcorrInputProducerT<pat::Photon> ShiftedPATPhotonMETcorrInputProducer;
+typedef ShiftedParticleMETcorrInputProducerT<pat::Muon> ShiftedPATMuonMETcorrInputProducer;
+typedef ShiftedParticleMETcorrInputProducerT<pat::Tau> ShiftedPATTauMETcorrInputProducer;
+
+#include "FWCore/Framework/interface/MakerMacros.h"
+
+DEFINE_FWK_MODULE(ShiftedPATElectronMETcorrInputProducer);
+DEFINE_FWK_MODULE(ShiftedPATPhotonMETcorrInputProducer);
+DEFINE_FWK_MODULE(ShiftedPATMuonMETcorrInputProducer);
+DEFINE_FWK_MODULE(ShiftedPATTauMETcorrInputProducer);
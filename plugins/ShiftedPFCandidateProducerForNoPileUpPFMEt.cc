@@ -1,4 +1,6 @@
 #include "PhysicsTools/PatUtils/plugins/ShiftedPFCandidateProducerForNoPileUpPFMEt.h"
+#include "PhysicsTools/PatUtils/interface/EtaPhiGrid.h"
+#include "PhysicsTools/PatUtils/interface/ShiftedPFCandidateOverlay.h"
 
 #include "JetMETCorrections/Objects/interface/JetCorrector.h"
 #include "JetMETCorrections/Objects/interface/JetCorrectionsRecord.h"
@@ -11,8 +13,11 @@
 #include "DataFormats/Common/interface/Handle.h"
 #include "DataFormats/Math/interface/deltaR.h"
 
+#include <algorithm>
+
 ShiftedPFCandidateProducerForNoPileUpPFMEt::ShiftedPFCandidateProducerForNoPileUpPFMEt(const edm::ParameterSet& cfg)
-  : moduleLabel_(cfg.getParameter<std::string>("@module_label"))
+  : moduleLabel_(cfg.getParameter<std::string>("@module_label")),
+    jetCorrCacheIdentifier_(0)
 {
   srcPFCandidates_ = cfg.getParameter<edm::InputTag>("srcPFCandidates");
   srcJets_ = cfg.getParameter<edm::InputTag>("srcJets");
@@ -24,8 +29,8 @@ ShiftedPFCandidateProducerForNoPileUpPFMEt::ShiftedPFCandidateProducerForNoPileU
       << " Failed to find JEC parameter file = " << jetCorrInputFileName_ << " !!\n";
     std::cout << "Reading JEC parameters = " << jetCorrUncertaintyTag_  
 	      << " from file = " << jetCorrInputFileName_.fullPath() << "." << std::endl;
-    jetCorrParameters_ = new JetCorrectorParameters(jetCorrInputFileName_.fullPath().data(), jetCorrUncertaintyTag_);
-    jecUncertainty_ = new JetCorrectionUncertainty(*jetCorrParameters_);
+    jetCorrParametersReader_ = JetCorrectorParametersReader::get(jetCorrInputFileName_.fullPath());
+    jecUncertaintyTable_ = JetCorrUncertaintyTable::get(*jetCorrParametersReader_, jetCorrUncertaintyTag_);
   } else {
     std::cout << "Reading JEC parameters = " << jetCorrUncertaintyTag_
 	      << " from DB/SQLlite file." << std::endl;
@@ -38,7 +43,16 @@ ShiftedPFCandidateProducerForNoPileUpPFMEt::ShiftedPFCandidateProducerForNoPileU
   
   unclEnUncertainty_ = cfg.getParameter<double>("unclEnUncertainty");
 
-  produces<reco::PFCandidateCollection>();
+  produceShiftedPFCandidates_ = ( cfg.exists("produceShiftedPFCandidates") ) ?
+    cfg.getParameter<bool>("produceShiftedPFCandidates") : true;
+  produceShiftedPFCandidateOverlay_ = ( cfg.exists("produceShiftedPFCandidateOverlay") ) ?
+    cfg.getParameter<bool>("produceShiftedPFCandidateOverlay") : false;
+  if ( !(produceShiftedPFCandidates_ || produceShiftedPFCandidateOverlay_) )
+    throw cms::Exception("ShiftedPFCandidateProducerForNoPileUpPFMEt")
+      << " Configuration parameters 'produceShiftedPFCandidates' and 'produceShiftedPFCandidateOverlay' must not both be false !!\n";
+
+  if ( produceShiftedPFCandidates_ ) produces<reco::PFCandidateCollection>();
+  if ( produceShiftedPFCandidateOverlay_ ) produces<pat::ShiftedPFCandidateOverlay>();
 }
 
 ShiftedPFCandidateProducerForNoPileUpPFMEt::~ShiftedPFCandidateProducerForNoPileUpPFMEt()
@@ -61,50 +75,97 @@ void ShiftedPFCandidateProducerForNoPileUpPFMEt::produce(edm::Event& evt, const
   }
 
   if ( jetCorrPayloadName_ != "" ) {
+    // CV: rebuild lookup table only in case JEC parameters in DB have changed
+    const JetCorrectionsRecord& jetCorrRecord = es.get<JetCorrectionsRecord>();
+    if ( !jecUncertaintyTable_ || jetCorrRecord.cacheIdentifier() != jetCorrCacheIdentifier_ ) {
       edm::ESHandle<JetCorrectorParametersCollection> jetCorrParameterSet;
-      es.get<JetCorrectionsRecord>().get(jetCorrPayloadName_, jetCorrParameterSet); 
+      jetCorrRecord.get(jetCorrPayloadName_, jetCorrParameterSet); 
       const JetCorrectorParameters& jetCorrParameters = (*jetCorrParameterSet)[jetCorrUncertaintyTag_];
-      delete jecUncertainty_;
-      jecUncertainty_ = new JetCorrectionUncertainty(jetCorrParameters);
+      jecUncertaintyTable_.reset(new JetCorrUncertaintyTable(jetCorrParameters));
+      jetCorrCacheIdentifier_ = jetCorrRecord.cacheIdentifier();
     }
+  }
+
+  // CV: build map of PFCandidates to the (first) selected jet they are constituents of once per event.
+  //     Jet constituents referring to the collection of PFCandidates given as input are matched by key,
+  //     jet constituents referring to any other collection are matched in deltaR to the PFCandidates
+  //     (indexed in an eta-phi grid, so that for each PFCandidate only nearby jet constituents need to be checked)
+  const double dRmatch = 1.e-2;
+  std::vector<int> jetIndicesByKey(originalPFCandidates->size(), -1);
+  std::vector<reco::Candidate::LorentzVector> otherConstituentP4s;
+  std::vector<double> otherConstituentEtas;
+  std::vector<double> otherConstituentPhis;
+  std::vector<int> otherConstituentJetIndices;
+  for ( size_t idxJet = 0; idxJet < selectedJets.size(); ++idxJet ) {
+    std::vector<reco::PFCandidatePtr> jetConstituents = selectedJets[idxJet]->getPFConstituents();
+    for ( std::vector<reco::PFCandidatePtr>::const_iterator jetConstituent = jetConstituents.begin();
+	  jetConstituent != jetConstituents.end(); ++jetConstituent ) {
+      if ( jetConstituent->id() == originalPFCandidates.id() && jetConstituent->key() < jetIndicesByKey.size() ) {
+	if ( jetIndicesByKey[jetConstituent->key()] == -1 ) jetIndicesByKey[jetConstituent->key()] = idxJet;
+      } else {
+	const reco::Candidate::LorentzVector& jetConstituentP4 = (*jetConstituent)->p4();
+	otherConstituentP4s.push_back(jetConstituentP4);
+	otherConstituentEtas.push_back(jetConstituentP4.eta());
+	otherConstituentPhis.push_back(jetConstituentP4.phi());
+	otherConstituentJetIndices.push_back(idxJet);
+      }
+    }
+  }
+  pat::helper::EtaPhiGrid otherConstituentIndex;
+  // CV: use cells larger than the (tiny) matching cone size, in order to keep the grid small
+  otherConstituentIndex.build(otherConstituentEtas, otherConstituentPhis, std::max(dRmatch, 0.1));
+  std::vector<unsigned> otherConstituentCandidates;
+
+  // CV: JEC uncertainty depends on jet only,
+  //     compute it once per selected jet rather than once per jet constituent
+  std::vector<double> jetUncertainties(selectedJets.size());
+  for ( size_t idxJet = 0; idxJet < selectedJets.size(); ++idxJet ) {
+    jetUncertainties[idxJet] = jecUncertaintyTable_->getUncertainty(selectedJets[idxJet]->eta(), selectedJets[idxJet]->pt(), true);
+  }
 
   std::auto_ptr<reco::PFCandidateCollection> shiftedPFCandidates(new reco::PFCandidateCollection);
+  std::auto_ptr<pat::ShiftedPFCandidateOverlay> shiftedPFCandidateOverlay(
+    new pat::ShiftedPFCandidateOverlay(originalPFCandidates.id(), originalPFCandidates->size(), true));
 
+  size_t idxOriginalPFCandidate = 0;
   for ( reco::PFCandidateCollection::const_iterator originalPFCandidate = originalPFCandidates->begin();
-	originalPFCandidate != originalPFCandidates->end(); ++originalPFCandidate ) {
+	originalPFCandidate != originalPFCandidates->end(); ++originalPFCandidate, ++idxOriginalPFCandidate ) {
     
-    const reco::PFJet* jet_matched = 0;
-    for ( std::vector<const reco::PFJet*>::iterator jet = selectedJets.begin();
-	  jet != selectedJets.end(); ++jet ) {
-      std::vector<reco::PFCandidatePtr> jetConstituents = (*jet)->getPFConstituents();
-      for ( std::vector<reco::PFCandidatePtr>::const_iterator jetConstituent = jetConstituents.begin();
-	    jetConstituent != jetConstituents.end() && !jet_matched; ++jetConstituent ) {
-	if ( deltaR(originalPFCandidate->p4(), (*jetConstituent)->p4()) < 1.e-2 ) jet_matched = (*jet);
+    int idxJet_matched = jetIndicesByKey[idxOriginalPFCandidate];
+    if ( otherConstituentIndex.size() > 0 ) {
+      otherConstituentCandidates.clear();
+      otherConstituentIndex.findNeighbours(originalPFCandidate->eta(), originalPFCandidate->phi(), otherConstituentCandidates);
+      for ( std::vector<unsigned>::const_iterator idxConstituent = otherConstituentCandidates.begin();
+	    idxConstituent != otherConstituentCandidates.end(); ++idxConstituent ) {
+	int idxJet = otherConstituentJetIndices[*idxConstituent];
+	if ( idxJet_matched != -1 && idxJet >= idxJet_matched ) continue;
+	if ( deltaR(originalPFCandidate->p4(), otherConstituentP4s[*idxConstituent]) < dRmatch ) idxJet_matched = idxJet;
       }
     }
 
     double shift = 0.;
-    if ( jet_matched ) {
-      jecUncertainty_->setJetEta(jet_matched->eta());
-      jecUncertainty_->setJetPt(jet_matched->pt());
-      
-      shift = jecUncertainty_->getUncertainty(true);
+    if ( idxJet_matched != -1 ) {
+      shift = jetUncertainties[idxJet_matched];
     } else {
       shift = unclEnUncertainty_;
     }
 
     shift *= shiftBy_;
     
-    reco::Candidate::LorentzVector shiftedPFCandidateP4 = originalPFCandidate->p4();
-    shiftedPFCandidateP4 *= (1. + shift);
+    if ( produceShiftedPFCandidates_ ) {
+      reco::Candidate::LorentzVector shiftedPFCandidateP4 = originalPFCandidate->p4();
+      shiftedPFCandidateP4 *= (1. + shift);
     
-    reco::PFCandidate shiftedPFCandidate(*originalPFCandidate);      
-    shiftedPFCandidate.setP4(shiftedPFCandidateP4);
+      reco::PFCandidate shiftedPFCandidate(*originalPFCandidate);      
+      shiftedPFCandidate.setP4(shiftedPFCandidateP4);
     
-    shiftedPFCandidates->push_back(shiftedPFCandidate);
+      shiftedPFCandidates->push_back(shiftedPFCandidate);
+    }
+    if ( produceShiftedPFCandidateOverlay_ ) shiftedPFCandidateOverlay->addShift(idxOriginalPFCandidate, 1. + shift);
   }
   
-  evt.put(shiftedPFCandidates);
+  if ( produceShiftedPFCandidates_ ) evt.put(shiftedPFCandidates);
+  if ( produceShiftedPFCandidateOverlay_ ) evt.put(shiftedPFCandidateOverlay);
 }
 
 #include "FWCore/Framework/interface/MakerMacros.h"
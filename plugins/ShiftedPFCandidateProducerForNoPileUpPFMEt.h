@@ -14,6 +14,10 @@
  *       by the 10% "unclustered" energy uncertainty, the systematic uncertainty
  *       on the reconstructed no-PU MET would be overestimated significantly !!
  *
+ *       Instead of (or in addition to) the full collection of shifted PFCandidates,
+ *       the scale factors applied to the original PFCandidates can be stored in a pat::ShiftedPFCandidateOverlay
+ *       (enabled by the configuration parameters 'produceShiftedPFCandidates' and 'produceShiftedPFCandidateOverlay')
+ *
  * \author Christian Veelken, LLR
  *
  * \version $Revision: 1.2 $
@@ -30,10 +34,12 @@
 #include "FWCore/Utilities/interface/InputTag.h"
 
 #include "CondFormats/JetMETObjects/interface/JetCorrectorParameters.h"
-#include "CondFormats/JetMETObjects/interface/JetCorrectionUncertainty.h"
 
 #include "DataFormats/Candidate/interface/Candidate.h"
 
+#include "PhysicsTools/PatUtils/interface/JetCorrectorParametersReader.h"
+#include "PhysicsTools/PatUtils/interface/JetCorrUncertaintyTable.h"
+
 #include <string>
 #include <vector>
 
@@ -56,14 +62,18 @@ class ShiftedPFCandidateProducerForNoPileUpPFMEt : public edm::EDProducer
   edm::FileInPath jetCorrInputFileName_;
   std::string jetCorrPayloadName_;
   std::string jetCorrUncertaintyTag_;
-  JetCorrectorParameters* jetCorrParameters_;
-  JetCorrectionUncertainty* jecUncertainty_;
+  boost::shared_ptr<const JetCorrectorParametersReader> jetCorrParametersReader_; // shared with all other modules reading the same file
+  unsigned long long jetCorrCacheIdentifier_;
+  boost::shared_ptr<const JetCorrUncertaintyTable> jecUncertaintyTable_;
 
   double minJetPt_;
 
   double shiftBy_;
   
   double unclEnUncertainty_;
+
+  bool produceShiftedPFCandidates_;       // flag to enable/disable production of full collection of shifted PFCandidates
+  bool produceShiftedPFCandidateOverlay_; // flag to enable/disable production of pat::ShiftedPFCandidateOverlay
 };
 
 #endif
@@ -1,4 +1,6 @@
 #include "PhysicsTools/PatUtils/plugins/ShiftedPFCandidateProducerForPFMEtMVA.h"
+#include "PhysicsTools/PatUtils/interface/EtaPhiGrid.h"
+#include "PhysicsTools/PatUtils/interface/ShiftedPFCandidateOverlay.h"
 
 #include "DataFormats/ParticleFlowCandidate/interface/PFCandidate.h"
 #include "DataFormats/ParticleFlowCandidate/interface/PFCandidateFwd.h"
@@ -17,7 +19,16 @@ ShiftedPFCandidateProducerForPFMEtMVA::ShiftedPFCandidateProducerForPFMEtMVA(con
   dRmatch_Object_ = cfg.exists("dRmatch_Object") ?
     cfg.getParameter<double>("dRmatch_Object") : 0.1;
 
-  produces<reco::PFCandidateCollection>();
+  produceShiftedPFCandidates_ = ( cfg.exists("produceShiftedPFCandidates") ) ?
+    cfg.getParameter<bool>("produceShiftedPFCandidates") : true;
+  produceShiftedPFCandidateOverlay_ = ( cfg.exists("produceShiftedPFCandidateOverlay") ) ?
+    cfg.getParameter<bool>("produceShiftedPFCandidateOverlay") : false;
+  if ( !(produceShiftedPFCandidates_ || produceShiftedPFCandidateOverlay_) )
+    throw cms::Exception("ShiftedPFCandidateProducerForPFMEtMVA")
+      << " Configuration parameters 'produceShiftedPFCandidates' and 'produceShiftedPFCandidateOverlay' must not both be false !!\n";
+
+  if ( produceShiftedPFCandidates_ ) produces<reco::PFCandidateCollection>();
+  if ( produceShiftedPFCandidateOverlay_ ) produces<pat::ShiftedPFCandidateOverlay>();
 }
 
 ShiftedPFCandidateProducerForPFMEtMVA::~ShiftedPFCandidateProducerForPFMEtMVA()
@@ -38,56 +49,103 @@ void ShiftedPFCandidateProducerForPFMEtMVA::produce(edm::Event& evt, const edm::
   edm::Handle<CandidateView> shiftedObjects;
   evt.getByLabel(srcShiftedObjects_, shiftedObjects);
 
+  // CV: match unshifted to shifted objects and PFCandidates to unshifted objects in squared distance,
+  //     looking up only objects in the vicinity of each unshifted object (PFCandidate)
+  //     by means of eta-phi grids sized by dRmatch_Object (dRmatch_PFCandidate)
+  std::vector<double> shiftedObjectEtas;
+  std::vector<double> shiftedObjectPhis;
+  for ( CandidateView::const_iterator shiftedObject = shiftedObjects->begin();
+	shiftedObject != shiftedObjects->end(); ++shiftedObject ) {
+    shiftedObjectEtas.push_back(shiftedObject->eta());
+    shiftedObjectPhis.push_back(shiftedObject->phi());
+  }
+  pat::helper::EtaPhiGrid shiftedObjectIndex;
+  shiftedObjectIndex.build(shiftedObjectEtas, shiftedObjectPhis, dRmatch_Object_);
+  double dR2match_Object = dRmatch_Object_*dRmatch_Object_;
+
   objects_.clear();
   
+  std::vector<unsigned> neighbours;
   for ( CandidateView::const_iterator unshiftedObject = unshiftedObjects->begin();
 	unshiftedObject != unshiftedObjects->end(); ++unshiftedObject ) {
-    bool isMatched_Object = false;
-    double dRbestMatch_Object = 1.e+3;
-    reco::Candidate::LorentzVector shiftedObjectP4_matched;
-    for ( CandidateView::const_iterator shiftedObject = shiftedObjects->begin();
-	shiftedObject != shiftedObjects->end(); ++shiftedObject ) {
-      double dR = deltaR(unshiftedObject->p4(), shiftedObject->p4());
-      if ( dR < dRmatch_Object_ && dR < dRbestMatch_Object ) {
-	shiftedObjectP4_matched = shiftedObject->p4();
-	isMatched_Object = true;
-	dRbestMatch_Object = dR;
+    double unshiftedObjectEta = unshiftedObject->eta();
+    double unshiftedObjectPhi = unshiftedObject->phi();
+    int idxShiftedObject_matched = -1;
+    double dR2bestMatch_Object = 1.e+6;
+    neighbours.clear();
+    shiftedObjectIndex.findNeighbours(unshiftedObjectEta, unshiftedObjectPhi, neighbours);
+    for ( std::vector<unsigned>::const_iterator idxShiftedObject = neighbours.begin();
+	  idxShiftedObject != neighbours.end(); ++idxShiftedObject ) {
+      double dR2 = reco::deltaR2(unshiftedObjectEta, unshiftedObjectPhi, shiftedObjectEtas[*idxShiftedObject], shiftedObjectPhis[*idxShiftedObject]);
+      // CV: in case of ties, take the first shifted object in the collection
+      if ( dR2 < dR2match_Object && 
+	   (dR2 < dR2bestMatch_Object || (dR2 == dR2bestMatch_Object && (int)(*idxShiftedObject) < idxShiftedObject_matched)) ) {
+	idxShiftedObject_matched = (*idxShiftedObject);
+	dR2bestMatch_Object = dR2;
       }
     }
-    if ( isMatched_Object ) {
-      objects_.push_back(objectEntryType(shiftedObjectP4_matched, unshiftedObject->p4(), dRbestMatch_Object));
+    if ( idxShiftedObject_matched != -1 ) {
+      objects_.push_back(objectEntryType((*shiftedObjects)[idxShiftedObject_matched].p4(), unshiftedObject->p4(), sqrt(dR2bestMatch_Object)));
     }
   }
+
+  std::vector<double> objectEtas;
+  std::vector<double> objectPhis;
+  std::vector<unsigned> objectIndices;
+  for ( size_t idxObject = 0; idxObject < objects_.size(); ++idxObject ) {
+    if ( !objects_[idxObject].isValidMatch_ ) continue;
+    objectEtas.push_back(objects_[idxObject].unshiftedObjectP4_.eta());
+    objectPhis.push_back(objects_[idxObject].unshiftedObjectP4_.phi());
+    objectIndices.push_back(idxObject);
+  }
+  pat::helper::EtaPhiGrid objectIndex;
+  objectIndex.build(objectEtas, objectPhis, dRmatch_PFCandidate_);
+  double dR2match_PFCandidate = dRmatch_PFCandidate_*dRmatch_PFCandidate_;
  
   std::auto_ptr<reco::PFCandidateCollection> shiftedPFCandidates(new reco::PFCandidateCollection);
+  if ( produceShiftedPFCandidates_ ) shiftedPFCandidates->reserve(originalPFCandidates->size());
+  std::auto_ptr<pat::ShiftedPFCandidateOverlay> shiftedPFCandidateOverlay(
+    new pat::ShiftedPFCandidateOverlay(originalPFCandidates.id(), originalPFCandidates->size()));
     
+  size_t idxOriginalPFCandidate = 0;
   for ( reco::PFCandidateCollection::const_iterator originalPFCandidate = originalPFCandidates->begin();
-	originalPFCandidate != originalPFCandidates->end(); ++originalPFCandidate ) {
+	originalPFCandidate != originalPFCandidates->end(); ++originalPFCandidate, ++idxOriginalPFCandidate ) {
     
-    double shift = 0.;
-    bool applyShift = false;
-    double dRbestMatch_PFCandidate = 1.e+3;
-    for ( std::vector<objectEntryType>::const_iterator object = objects_.begin();
-	  object != objects_.end(); ++object ) {
-      if ( !object->isValidMatch_ ) continue;
-      double dR = deltaR(originalPFCandidate->p4(), object->unshiftedObjectP4_);
-      if ( dR < dRmatch_PFCandidate_ && dR < dRbestMatch_PFCandidate ) {
-	shift = object->shift_;
-	applyShift = true;
-	dRbestMatch_PFCandidate = dR;
+    int idxObject_matched = -1;
+    if ( objectIndex.size() > 0 ) {
+      double originalPFCandidateEta = originalPFCandidate->eta();
+      double originalPFCandidatePhi = originalPFCandidate->phi();
+      double dR2bestMatch_PFCandidate = 1.e+6;
+      neighbours.clear();
+      objectIndex.findNeighbours(originalPFCandidateEta, originalPFCandidatePhi, neighbours);
+      for ( std::vector<unsigned>::const_iterator idxObject = neighbours.begin();
+	    idxObject != neighbours.end(); ++idxObject ) {
+	double dR2 = reco::deltaR2(originalPFCandidateEta, originalPFCandidatePhi, objectEtas[*idxObject], objectPhis[*idxObject]);
+	// CV: in case of ties, take the first object
+	if ( dR2 < dR2match_PFCandidate && 
+	     (dR2 < dR2bestMatch_PFCandidate || (dR2 == dR2bestMatch_PFCandidate && (int)(*idxObject) < idxObject_matched)) ) {
+	  idxObject_matched = (*idxObject);
+	  dR2bestMatch_PFCandidate = dR2;
+	}
       }
     }
     
-    reco::Candidate::LorentzVector shiftedPFCandidateP4 = originalPFCandidate->p4();
-    if ( applyShift ) shiftedPFCandidateP4 *= (1. + shift);
-    
-    reco::PFCandidate shiftedPFCandidate(*originalPFCandidate);      
-    shiftedPFCandidate.setP4(shiftedPFCandidateP4);
-    
-    shiftedPFCandidates->push_back(shiftedPFCandidate);
+    double shift = ( idxObject_matched != -1 ) ? objects_[objectIndices[idxObject_matched]].shift_ : 0.;
+
+    if ( produceShiftedPFCandidates_ ) {
+      // CV: PFCandidates not matched to any object are copied unchanged
+      shiftedPFCandidates->push_back(*originalPFCandidate);
+      if ( idxObject_matched != -1 ) {
+	reco::Candidate::LorentzVector shiftedPFCandidateP4 = originalPFCandidate->p4();
+	shiftedPFCandidateP4 *= (1. + shift);
+	shiftedPFCandidates->back().setP4(shiftedPFCandidateP4);
+      }
+    }
+    if ( produceShiftedPFCandidateOverlay_ && idxObject_matched != -1 ) shiftedPFCandidateOverlay->addShift(idxOriginalPFCandidate, 1. + shift);
   }
   
-  evt.put(shiftedPFCandidates);
+  if ( produceShiftedPFCandidates_ ) evt.put(shiftedPFCandidates);
+  if ( produceShiftedPFCandidateOverlay_ ) evt.put(shiftedPFCandidateOverlay);
 }
 
 #include "FWCore/Framework/interface/MakerMacros.h"
@@ -10,6 +10,10 @@
  *       on PFMET reconstructed by MVA-based algorithm
  *      (implemented in RecoMET/METProducers/src/PFMETProducerMVA.cc)
  *
+ *       Instead of (or in addition to) the full collection of shifted PFCandidates,
+ *       the scale factors applied to the original PFCandidates can be stored in a pat::ShiftedPFCandidateOverlay
+ *       (enabled by the configuration parameters 'produceShiftedPFCandidates' and 'produceShiftedPFCandidateOverlay')
+ *
  * \author Christian Veelken, LLR
  *
  * \version $Revision: 1.2 $
@@ -49,6 +53,9 @@ class ShiftedPFCandidateProducerForPFMEtMVA : public edm::EDProducer
   double dRmatch_PFCandidate_;
   double dRmatch_Object_;
 
+  bool produceShiftedPFCandidates_;       // flag to enable/disable production of full collection of shifted PFCandidates
+  bool produceShiftedPFCandidateOverlay_; // flag to enable/disable production of pat::ShiftedPFCandidateOverlay
+
   struct objectEntryType
   {
     objectEntryType(const reco::Candidate::LorentzVector& shiftedObjectP4, 
@@ -21,7 +21,10 @@ namespace SmearedJetProducer_namespace
      {}
      ~JetResolutionExtractorT() {}
 
-     double operator()(const reco::PFJet& jet) const
+     // CV: nothing to be done, as the resolution is computed for each jet
+     void beginEvent(const edm::Event&, const edm::ProductID&) {}
+
+     double operator()(const reco::PFJet& jet, size_t) const
      {
        metsig::SigInputObj pfJetResolution = jetResolutions_.evalPFJet(&jet);
        if ( pfJetResolution.get_energy() > 0. ) {
@@ -2,12 +2,23 @@
 
 #include "DataFormats/PatCandidates/interface/Jet.h"
 
-#include "RecoMET/METAlgorithms/interface/SignAlgoResolutions.h"
-#include "DataFormats/METReco/interface/SigInputObj.h"
-#include "RecoMET/METAlgorithms/interface/significanceAlgo.h"
-#include "DataFormats/JetReco/interface/PFJet.h"
+#include "CondFormats/JetMETObjects/interface/JetResolution.h"
+#include "DataFormats/Provenance/interface/EventID.h"
+#include "DataFormats/Provenance/interface/ProductID.h"
+#include "FWCore/ParameterSet/interface/FileInPath.h"
 
 #include "PhysicsTools/PatUtils/interface/PATJetCorrExtractor.h"
+#include "PhysicsTools/PatUtils/interface/SharedInstance.h"
+
+#include <boost/shared_ptr.hpp>
+
+#include <TF1.h>
+#include <TMath.h>
+#include <TString.h>
+
+#include <map>
+#include <string>
+#include <vector>
 
 namespace SmearedJetProducer_namespace
 {
@@ -19,15 +30,16 @@ namespace SmearedJetProducer_namespace
      GenJetMatcherT(const edm::ParameterSet& cfg)
        : dRmaxGenJetMatch_(0)
      {
-       TString dRmaxGenJetMatch_formula = cfg.getParameter<std::string>("dRmaxGenJetMatch").data();
-       dRmaxGenJetMatch_formula.ReplaceAll("genJetPt", "x");
-       dRmaxGenJetMatch_ = new TFormula("dRmaxGenJetMatch", dRmaxGenJetMatch_formula.Data());
+       dRmaxGenJetMatch_ = new DRmaxGenJetMatchFormula(cfg.getParameter<std::string>("dRmaxGenJetMatch"));
      }
      ~GenJetMatcherT()
      {
        delete dRmaxGenJetMatch_;
      }
 
+     // CV: nothing to be done, as generator level jets are embedded in pat::Jets
+     void beginEvent(const edm::Event&) {}
+
      const reco::GenJet* operator()(const pat::Jet& jet, edm::Event* evt = 0) const
      {
        const reco::GenJet* retVal = 0;
@@ -41,7 +53,7 @@ namespace SmearedJetProducer_namespace
        if ( jet.genJet() ) {
 	 const reco::GenJet* genJet = jet.genJet();
 	 double dR = deltaR(jet.p4(), genJet->p4());
-	 if ( dR < dRmaxGenJetMatch_->Eval(genJet->pt()) ) retVal = genJet;
+	 if ( dR < (*dRmaxGenJetMatch_)(genJet->pt()) ) retVal = genJet;
        }
        
        return retVal;
@@ -49,7 +61,98 @@ namespace SmearedJetProducer_namespace
 
     private:
     
-     TFormula* dRmaxGenJetMatch_;
+     DRmaxGenJetMatchFormula* dRmaxGenJetMatch_;
+  };
+
+  // CV: resolution of PF jets, computed from the jet kinematics by the resolution functions of the PFMEt significance algorithm
+  //    (configured by METSignificance_params, cf. metsig::SignAlgoResolutions::evalPFJet),
+  //     without building a temporary reco::PFJet.
+  //     The cache is shared by all SmearedPATJetProducer modules with the same 'jetResolutions' configuration
+  //     and keeps the resolutions computed in the current event per collection of jets and jet index,
+  //     so that the resolution of a jet is computed only once
+  //     in case the same jets are smeared by several modules (e.g. central value and jet resolution shifted up/down)
+  class PATJetResolutionCache
+  {
+    public:
+
+     static boost::shared_ptr<PATJetResolutionCache> get(const edm::ParameterSet& cfg)
+     {
+       return pat::helper::getSharedInstance<PATJetResolutionCache>(cfg.toString(), cacheFactory(cfg));
+     }
+     ~PATJetResolutionCache()
+     {
+       delete ptResolution_;
+     }
+
+     // CV: select the resolutions of the given collection of jets in the given event;
+     //     resolutions computed for previous events are discarded
+     void beginEvent(const edm::Event& evt, const edm::ProductID& srcProductID)
+     {
+       if ( evt.id() != eventId_ ) {
+	 jetResolutionValues_.clear();
+	 eventId_ = evt.id();
+       }
+       currentJetResolutionValues_ = &jetResolutionValues_[srcProductID];
+     }
+
+     double operator()(const pat::Jet& jet, size_t jetIndex)
+     {
+       std::vector<double>& jetResolutionValues = (*currentJetResolutionValues_);
+       if ( jetIndex >= jetResolutionValues.size() ) jetResolutionValues.resize(jetIndex + 1, -1.);
+       if ( jetResolutionValues[jetIndex] < 0. ) jetResolutionValues[jetIndex] = jet.energy()*relPtResolution(jet.pt(), jet.eta());
+       return jetResolutionValues[jetIndex];
+     }
+
+    private:
+
+     struct cacheFactory
+     {
+       explicit cacheFactory(const edm::ParameterSet& cfg) : cfg_(cfg) {}
+       PATJetResolutionCache* operator()() const { return new PATJetResolutionCache(cfg_); }
+       const edm::ParameterSet& cfg_;
+     };
+
+     PATJetResolutionCache(const edm::ParameterSet& cfg)
+       : currentJetResolutionValues_(0)
+     {
+       ptResolThreshold_ = cfg.getParameter<double>("ptresolthreshold");
+       for ( int ieta = 0; ieta < 10; ++ieta ) {
+	 jdpt_[ieta] = cfg.getParameter<std::vector<double> >(Form("jdpt%i", ieta));
+       }
+       std::string resolutionsEra = cfg.getParameter<std::string>("resolutionsEra");
+       std::string resolutionsAlgo = cfg.getParameter<std::string>("resolutionsAlgo");
+       edm::FileInPath ptResolutionFileName(std::string("CondFormats/JetMETObjects/data/")
+                                            .append(resolutionsEra).append("_PtResolution_").append(resolutionsAlgo).append(".txt"));
+       ptResolution_ = new JetResolution(ptResolutionFileName.fullPath(), false);
+     }
+
+     // CV: relative pT resolution (sigma_e/energy of the metsig::SigInputObj returned by SignAlgoResolutions::evalPFJet);
+     //     the binning of the resolutions for low pT jets is kept identical to SignAlgoResolutions
+     double relPtResolution(double jetPt, double jetEta)
+     {
+       if ( !(jetPt > 0.) ) return 0.;
+       if ( jetPt < ptResolThreshold_ && jetPt < 20. ) {
+	 double absJetEta = TMath::Abs(jetEta);
+	 int ieta = ( absJetEta < 5. ) ? int(absJetEta/0.5) : 9;
+	 int ipt = ( jetPt > 3. ) ? int(jetPt - 3./2) : 0;
+	 const std::vector<double>& jdpt = jdpt_[TMath::Min(ieta, 9)];
+	 if ( jdpt.size() == 0 ) return 0.;
+	 return jdpt[TMath::Min(ipt, int(jdpt.size()) - 1)]/jetPt;
+       } else {
+	 TF1* ptResolutionEta = ptResolution_->parameterEta("sigma", jetEta);
+	 double relPtResolution = ptResolutionEta->Eval(TMath::Max(jetPt, ptResolThreshold_));
+	 delete ptResolutionEta;
+	 return relPtResolution;
+       }
+     }
+
+     double ptResolThreshold_;
+     std::vector<double> jdpt_[10];
+     JetResolution* ptResolution_;
+
+     edm::EventID eventId_;
+     std::map<edm::ProductID, std::vector<double> > jetResolutionValues_;
+     std::vector<double>* currentJetResolutionValues_;
   };
 
   template <>
@@ -58,27 +161,26 @@ namespace SmearedJetProducer_namespace
     public:
 
      JetResolutionExtractorT(const edm::ParameterSet& cfg) 
-       : jetResolutions_(cfg)
+       : jetResolutionCache_(PATJetResolutionCache::get(cfg))
      {}
      ~JetResolutionExtractorT() {}
 
-     double operator()(const pat::Jet& jet) const
+     void beginEvent(const edm::Event& evt, const edm::ProductID& srcProductID)
+     {
+       jetResolutionCache_->beginEvent(evt, srcProductID);
+     }
+
+     double operator()(const pat::Jet& jet, size_t jetIndex) const
      {
        if ( jet.isPFJet() ) {
-	 reco::PFJet pfJet(jet.p4(), jet.vertex(), jet.pfSpecific(), jet.getJetConstituents());
-	 metsig::SigInputObj pfJetResolution = jetResolutions_.evalPFJet(&pfJet);
-	 if ( pfJetResolution.get_energy() > 0. ) {
-	   return jet.energy()*(pfJetResolution.get_sigma_e()/pfJetResolution.get_energy());
-	 } else {
-	   return 0.;
-	 }
+	 return (*jetResolutionCache_)(jet, jetIndex);
        } else {
 	 throw cms::Exception("SmearedJetProducer::produce")
 	   << " Jets of type other than PF not supported yet !!\n";
        }
      }
 
-     metsig::SignAlgoResolutions jetResolutions_;
+     boost::shared_ptr<PATJetResolutionCache> jetResolutionCache_;
   };
 }
 
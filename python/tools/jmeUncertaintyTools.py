@@ -46,6 +46,12 @@ class JetMEtUncertaintyTools(ConfigToolBase):
                           "Name of tag for Data/MC jet energy uncertainties", Type=str)
 	self.addParameter(self._defaultParameters, 'varyByNsigmas', 1.0, 
                           "Number of standard deviations by which energies are varied", Type=float)
+        self.addParameter(self._defaultParameters, 'produceShiftsInOneModule', False,
+                          "Flag to produce all up/down shifted collections of a kind in one module, stored with different instance labels (default: one module per shifted collection)", Type=bool)
+        self.addParameter(self._defaultParameters, 'makeMEtSystematicsTable', False,
+                          "Flag to enable/disable production of compact table of px, py and sumEt for all MET variations", Type=bool)
+        self.addParameter(self._defaultParameters, 'keepOnlyMEtSystematicsTable', False,
+                          "Flag to keep only the compact table instead of the full pat::MET collections of all MET variations", Type=bool)
         self.addParameter(self._defaultParameters, 'addToPatDefaultSequence', True,
                           "Flag to enable/disable that metUncertaintySequence is inserted into patDefaultSequence", Type=bool)
         self.addParameter(self._defaultParameters, 'outputModule', 'out',
@@ -132,7 +138,8 @@ class JetMEtUncertaintyTools(ConfigToolBase):
     def _addSmearedJets(self, process, jetCollection, smearedJetCollectionName_parts,
                         jetSmearFileName, jetSmearHistogram, varyByNsigmas,
                         shiftBy = None,
-                        uncertaintySequence = None, postfix = ""):
+                        uncertaintySequence = None, postfix = "",
+                        shifts = None):
 
         smearedJets = cms.EDProducer("SmearedPATJetProducer",
             src = cms.InputTag(jetCollection),
@@ -161,6 +168,8 @@ class JetMEtUncertaintyTools(ConfigToolBase):
         )
         if shiftBy is not None:
             setattr(smearedJets, "shiftBy", cms.double(shiftBy*varyByNsigmas))
+        if shifts is not None:
+            setattr(smearedJets, "shifts", cms.VPSet(shifts))
         smearedJetCollection = \
           self._addModuleToSequence(process, smearedJets,
                                     smearedJetCollectionName_parts,
@@ -170,29 +179,37 @@ class JetMEtUncertaintyTools(ConfigToolBase):
         
     def _propagateMEtUncertainties(self, process,
                                    particleCollection, particleType, shiftType, particleCollectionShiftUp, particleCollectionShiftDown,
-                                   metProducer, metType, sequence, postfix):
+                                   metProducer, metType, sequence, postfix, srcMETcorr = None):
 
-        # produce MET correction objects
-        # (sum of differences in four-momentum between original and up/down shifted particle collection)
-        moduleMETcorrShiftUp = cms.EDProducer("ShiftedParticleMETcorrInputProducer",
-            srcOriginal = cms.InputTag(particleCollection),
-            srcShifted = cms.InputTag(particleCollectionShiftUp)                                                          
-        )
-        moduleMETcorrShiftUpName = "pat%sMETcorr%s%sUp%s" % (metType, particleType, shiftType, postfix)
-        setattr(process, moduleMETcorrShiftUpName, moduleMETcorrShiftUp)
-        sequence += moduleMETcorrShiftUp
-        moduleMETcorrShiftDown = moduleMETcorrShiftUp.clone(
-            srcShifted = cms.InputTag(particleCollectionShiftDown)                                           
-        )
-        moduleMETcorrShiftDownName = "pat%sMETcorr%s%sDown%s" % (metType, particleType, shiftType, postfix)
-        setattr(process, moduleMETcorrShiftDownName, moduleMETcorrShiftDown)
-        sequence += moduleMETcorrShiftDown
+        if srcMETcorr is not None:
+            # CV: MET correction objects for up/down shifts have already been computed
+            #     directly from the original particle collection (cf. _addShiftedParticleMETcorrInputs)
+            metCorrShiftUp = cms.InputTag(srcMETcorr, "%sUp" % shiftType)
+            metCorrShiftDown = cms.InputTag(srcMETcorr, "%sDown" % shiftType)
+        else:
+            # produce MET correction objects
+            # (sum of differences in four-momentum between original and up/down shifted particle collection)
+            moduleMETcorrShiftUp = cms.EDProducer("ShiftedParticleMETcorrInputProducer",
+                srcOriginal = cms.InputTag(particleCollection),
+                srcShifted = cms.InputTag(particleCollectionShiftUp)                                                          
+            )
+            moduleMETcorrShiftUpName = "pat%sMETcorr%s%sUp%s" % (metType, particleType, shiftType, postfix)
+            setattr(process, moduleMETcorrShiftUpName, moduleMETcorrShiftUp)
+            sequence += moduleMETcorrShiftUp
+            moduleMETcorrShiftDown = moduleMETcorrShiftUp.clone(
+                srcShifted = cms.InputTag(particleCollectionShiftDown)                                           
+            )
+            moduleMETcorrShiftDownName = "pat%sMETcorr%s%sDown%s" % (metType, particleType, shiftType, postfix)
+            setattr(process, moduleMETcorrShiftDownName, moduleMETcorrShiftDown)
+            sequence += moduleMETcorrShiftDown
+            metCorrShiftUp = cms.InputTag(moduleMETcorrShiftUpName)
+            metCorrShiftDown = cms.InputTag(moduleMETcorrShiftDownName)
 
         # propagate effects of up/down shifts to MET
         moduleMETshiftUp = metProducer.clone(
             src = cms.InputTag(metProducer.label()),
             srcType1Corrections = cms.VInputTag(
-                cms.InputTag(moduleMETcorrShiftUpName)
+                metCorrShiftUp
             ),
             srcUnclEnergySums = cms.VInputTag(),
             applyType2Corrections = cms.bool(False),
@@ -211,7 +228,7 @@ class JetMEtUncertaintyTools(ConfigToolBase):
         sequence += moduleMETshiftUp
         moduleMETshiftDown = moduleMETshiftUp.clone(
             srcType1Corrections = cms.VInputTag(
-                cms.InputTag(moduleMETcorrShiftDownName)
+                metCorrShiftDown
             )
         )
         moduleMETshiftDownName = "%s%s%sDown%s" % (metProducerLabel, particleType, shiftType, postfix)
@@ -245,6 +262,84 @@ class JetMEtUncertaintyTools(ConfigToolBase):
         else:
             return True
 
+    @staticmethod
+    def _getModuleLabel(collection):
+        # CV: collections written by modules producing several shifted collections
+        #     are referred to as 'moduleLabel:instanceLabel'
+        return collection.split(':')[0]
+
+    @staticmethod
+    def _getJetEnergyShifts(varyByNsigmas, addResidualJES, instanceLabelSuffix = ""):
+        # CV: 'shifts' of Shifted(PAT/PF)JetProducer module producing jets shifted up and down in energy
+        return [
+            cms.PSet(
+                instanceLabel = cms.string('EnUp' + instanceLabelSuffix),
+                shiftBy = cms.double(+1.*varyByNsigmas),
+                addResidualJES = cms.bool(addResidualJES)
+            ),
+            cms.PSet(
+                instanceLabel = cms.string('EnDown' + instanceLabelSuffix),
+                shiftBy = cms.double(-1.*varyByNsigmas),
+                addResidualJES = cms.bool(addResidualJES)
+            )
+        ]
+
+    @staticmethod
+    def _getJetResolutionShifts(varyByNsigmas, addCentralValue = True):
+        # CV: 'shifts' of Smeared(PAT/PF)JetProducer module producing smeared jets
+        #     and jets with resolution shifted up and down
+        shifts = []
+        if addCentralValue:
+            shifts.append(cms.PSet(
+                instanceLabel = cms.string(''),
+                shiftBy = cms.double(0.)
+            ))
+        shifts.extend([
+            cms.PSet(
+                instanceLabel = cms.string('ResUp'),
+                shiftBy = cms.double(-1.*varyByNsigmas)
+            ),
+            cms.PSet(
+                instanceLabel = cms.string('ResDown'),
+                shiftBy = cms.double(+1.*varyByNsigmas)
+            )
+        ])
+        return shifts
+
+    def _addShiftedJetCollectionsForSrc(self, process,
+                                        jetCollectionShiftUp, jetCollectionShiftDown,
+                                        src, shiftType, sequence, postfix):
+
+        # produce collections of jets shifted up/down for another input jet collection,
+        # by cloning the module(s) that produce the shifted jet collections given as argument
+        if jetCollectionShiftUp.find(':') != -1:
+            moduleLabel, instanceLabelUp = jetCollectionShiftUp.split(':')
+            instanceLabelDown = jetCollectionShiftDown.split(':')[1]
+            module = getattr(process, moduleLabel).clone(
+                src = cms.InputTag(src + postfix)
+            )
+            # CV: produce only the two shifted collections needed for this input jet collection
+            module.shifts = cms.VPSet([ shift.clone() for shift in module.shifts
+                                        if shift.instanceLabel.value() in [ instanceLabelUp, instanceLabelDown ] ])
+            moduleName = "%s%s%s" % (src, shiftType, postfix)
+            setattr(process, moduleName, module)
+            sequence += module
+            return ( "%s:%s" % (moduleName, instanceLabelUp), "%s:%s" % (moduleName, instanceLabelDown) )
+        else:
+            moduleShiftUp = getattr(process, jetCollectionShiftUp).clone(
+                src = cms.InputTag(src + postfix)
+            )
+            moduleShiftUpName = "%s%sUp%s" % (src, shiftType, postfix)
+            setattr(process, moduleShiftUpName, moduleShiftUp)
+            sequence += moduleShiftUp
+            moduleShiftDown = getattr(process, jetCollectionShiftDown).clone(
+                src = cms.InputTag(src + postfix)
+            )
+            moduleShiftDownName = "%s%sDown%s" % (src, shiftType, postfix)
+            setattr(process, moduleShiftDownName, moduleShiftDown)
+            sequence += moduleShiftDown
+            return ( moduleShiftUpName, moduleShiftDownName )
+
     def _addShiftedParticleCollections(self, process, 
                                        electronCollection = None,
                                        photonCollection = None,
@@ -255,7 +350,9 @@ class JetMEtUncertaintyTools(ConfigToolBase):
                                        jetCorrLabelUpToL3 = None, jetCorrLabelUpToL3Res = None,
                                        jecUncertaintyFile = None, jecUncertaintyTag = None,
                                        varyByNsigmas = None,
-                                       postfix = ""):
+                                       postfix = "",
+                                       produceShiftsInOneModule = False,
+                                       propagateShiftsToMEtDirectly = False):
 
         shiftedParticleSequence = cms.Sequence()
         
@@ -277,52 +374,75 @@ class JetMEtUncertaintyTools(ConfigToolBase):
 
         # in case of "raw" (uncorrected) MET,
         # add residual jet energy corrections in quadrature to jet energy uncertainties:
-        # cf. https://twiki.cern.ch/twiki/bin/view/CMS/MissingETUncertaintyPrescription        
-        jetsEnUpForRawMEt = cms.EDProducer("ShiftedPATJetProducer",
-            src = cms.InputTag(lastJetCollection),
-            #jetCorrPayloadName = cms.string(jetCorrPayloadName),
-            #jetCorrUncertaintyTag = cms.string('Uncertainty'),
-            jetCorrInputFileName = cms.FileInPath(jecUncertaintyFile),
-            jetCorrUncertaintyTag = cms.string(jecUncertaintyTag),
-            addResidualJES = cms.bool(True),
-            jetCorrLabelUpToL3 = cms.string(jetCorrLabelUpToL3),
-            jetCorrLabelUpToL3Res = cms.string(jetCorrLabelUpToL3Res),
-            shiftBy = cms.double(+1.*varyByNsigmas)
-        )
-        jetCollectionEnUpForRawMEt = \
-          self._addModuleToSequence(process, jetsEnUpForRawMEt,
-                                    [ "shifted", jetCollection.value(), "EnUpForRawMEt" ],
-                                    shiftedParticleSequence, postfix)
-        shiftedParticleCollections['jetCollectionEnUpForRawMEt'] = jetCollectionEnUpForRawMEt
-        collectionsToKeep.append(jetCollectionEnUpForRawMEt)
-        jetsEnDownForRawMEt = jetsEnUpForRawMEt.clone(
-            shiftBy = cms.double(-1.*varyByNsigmas)
-        )
-        jetCollectionEnDownForRawMEt = \
-          self._addModuleToSequence(process, jetsEnDownForRawMEt,
-                                    [ "shifted", jetCollection.value(), "EnDownForRawMEt" ],
-                                    shiftedParticleSequence, postfix)
-        shiftedParticleCollections['jetCollectionEnDownForRawMEt'] = jetCollectionEnDownForRawMEt
-        collectionsToKeep.append(jetCollectionEnDownForRawMEt)
-
-        jetsEnUpForCorrMEt = jetsEnUpForRawMEt.clone(
-            addResidualJES = cms.bool(False)
-        )
-        jetCollectionEnUpForCorrMEt = \
-          self._addModuleToSequence(process, jetsEnUpForCorrMEt,
-                                    [ "shifted", jetCollection.value(), "EnUpForCorrMEt" ],
-                                    shiftedParticleSequence, postfix)
-        shiftedParticleCollections['jetCollectionEnUpForCorrMEt'] = jetCollectionEnUpForCorrMEt
-        collectionsToKeep.append(jetCollectionEnUpForCorrMEt)
-        jetsEnDownForCorrMEt = jetsEnUpForCorrMEt.clone(
-            shiftBy = cms.double(-1.*varyByNsigmas)
-        )
-        jetCollectionEnDownForCorrMEt = \
-          self._addModuleToSequence(process, jetsEnDownForCorrMEt,
-                                    [ "shifted", jetCollection.value(), "EnDownForCorrMEt" ],
-                                    shiftedParticleSequence, postfix)
-        shiftedParticleCollections['jetCollectionEnDownForCorrMEt'] = jetCollectionEnDownForCorrMEt
-        collectionsToKeep.append(jetCollectionEnDownForCorrMEt)
+        # cf. https://twiki.cern.ch/twiki/bin/view/CMS/MissingETUncertaintyPrescription
+        if produceShiftsInOneModule:
+            # CV: produce all four shifted jet collections in one module,
+            #     computing the jet energy uncertainty only once per jet
+            shiftedJets = cms.EDProducer("ShiftedPATJetProducer",
+                src = cms.InputTag(lastJetCollection),
+                jetCorrInputFileName = cms.FileInPath(jecUncertaintyFile),
+                jetCorrUncertaintyTag = cms.string(jecUncertaintyTag),
+                jetCorrLabelUpToL3 = cms.string(jetCorrLabelUpToL3),
+                jetCorrLabelUpToL3Res = cms.string(jetCorrLabelUpToL3Res),
+                shifts = cms.VPSet(
+                    self._getJetEnergyShifts(varyByNsigmas, True, "ForRawMEt") +
+                    self._getJetEnergyShifts(varyByNsigmas, False, "ForCorrMEt")
+                )
+            )
+            shiftedJetCollection = \
+              self._addModuleToSequence(process, shiftedJets,
+                                        [ "shifted", jetCollection.value(), "En" ],
+                                        shiftedParticleSequence, postfix)
+            for shift in shiftedJets.shifts:
+                shiftedParticleCollections['jetCollection%s' % shift.instanceLabel.value()] = \
+                  "%s:%s" % (shiftedJetCollection, shift.instanceLabel.value())
+            collectionsToKeep.append(shiftedJetCollection)
+        else:
+            jetsEnUpForRawMEt = cms.EDProducer("ShiftedPATJetProducer",
+                src = cms.InputTag(lastJetCollection),
+                #jetCorrPayloadName = cms.string(jetCorrPayloadName),
+                #jetCorrUncertaintyTag = cms.string('Uncertainty'),
+                jetCorrInputFileName = cms.FileInPath(jecUncertaintyFile),
+                jetCorrUncertaintyTag = cms.string(jecUncertaintyTag),
+                addResidualJES = cms.bool(True),
+                jetCorrLabelUpToL3 = cms.string(jetCorrLabelUpToL3),
+                jetCorrLabelUpToL3Res = cms.string(jetCorrLabelUpToL3Res),
+                shiftBy = cms.double(+1.*varyByNsigmas)
+            )
+            jetCollectionEnUpForRawMEt = \
+              self._addModuleToSequence(process, jetsEnUpForRawMEt,
+                                        [ "shifted", jetCollection.value(), "EnUpForRawMEt" ],
+                                        shiftedParticleSequence, postfix)
+            shiftedParticleCollections['jetCollectionEnUpForRawMEt'] = jetCollectionEnUpForRawMEt
+            collectionsToKeep.append(jetCollectionEnUpForRawMEt)
+            jetsEnDownForRawMEt = jetsEnUpForRawMEt.clone(
+                shiftBy = cms.double(-1.*varyByNsigmas)
+            )
+            jetCollectionEnDownForRawMEt = \
+              self._addModuleToSequence(process, jetsEnDownForRawMEt,
+                                        [ "shifted", jetCollection.value(), "EnDownForRawMEt" ],
+                                        shiftedParticleSequence, postfix)
+            shiftedParticleCollections['jetCollectionEnDownForRawMEt'] = jetCollectionEnDownForRawMEt
+            collectionsToKeep.append(jetCollectionEnDownForRawMEt)
+
+            jetsEnUpForCorrMEt = jetsEnUpForRawMEt.clone(
+                addResidualJES = cms.bool(False)
+            )
+            jetCollectionEnUpForCorrMEt = \
+              self._addModuleToSequence(process, jetsEnUpForCorrMEt,
+                                        [ "shifted", jetCollection.value(), "EnUpForCorrMEt" ],
+                                        shiftedParticleSequence, postfix)
+            shiftedParticleCollections['jetCollectionEnUpForCorrMEt'] = jetCollectionEnUpForCorrMEt
+            collectionsToKeep.append(jetCollectionEnUpForCorrMEt)
+            jetsEnDownForCorrMEt = jetsEnUpForCorrMEt.clone(
+                shiftBy = cms.double(-1.*varyByNsigmas)
+            )
+            jetCollectionEnDownForCorrMEt = \
+              self._addModuleToSequence(process, jetsEnDownForCorrMEt,
+                                        [ "shifted", jetCollection.value(), "EnDownForCorrMEt" ],
+                                        shiftedParticleSequence, postfix)
+            shiftedParticleCollections['jetCollectionEnDownForCorrMEt'] = jetCollectionEnDownForCorrMEt
+            collectionsToKeep.append(jetCollectionEnDownForCorrMEt)
 
         #--------------------------------------------------------------------------------------------
         # produce collection of electrons shifted up/down in energy
@@ -464,8 +584,54 @@ class JetMEtUncertaintyTools(ConfigToolBase):
             shiftedParticleCollections['tauCollectionEnDown'] = tauCollectionEnDown
             collectionsToKeep.append(tauCollectionEnDown)
 
+        if propagateShiftsToMEtDirectly:
+            self._addShiftedParticleMETcorrInputs(process, shiftedParticleSequence,
+                                                  shiftedParticleCollections, collectionsToKeep,
+                                                  postfix)
+
         return ( shiftedParticleSequence, shiftedParticleCollections, collectionsToKeep )
 
+    def _addShiftedParticleMETcorrInputs(self, process, sequence,
+                                         shiftedParticleCollections, collectionsToKeep,
+                                         postfix):
+
+        # replace the modules producing collections of electrons/photons, muons and tau-jets shifted up/down in energy
+        # by one Shifted*METcorrInputProducer module per particle type, which computes the MET corrections
+        # for the up and down shifts directly from the original particle collection.
+        # The collections of shifted particles are then neither produced nor kept.
+        for particleCollection in [ 'electronCollection', 'photonCollection', 'muonCollection', 'tauCollection' ]:
+            particleCollectionShiftUp = shiftedParticleCollections.get('%sEnUp' % particleCollection)
+            particleCollectionShiftDown = shiftedParticleCollections.get('%sEnDown' % particleCollection)
+            if particleCollectionShiftUp is None or particleCollectionShiftDown is None:
+                continue
+            moduleShiftUp = getattr(process, particleCollectionShiftUp)
+            moduleShiftDown = getattr(process, particleCollectionShiftDown)
+            module = cms.EDProducer(moduleShiftUp.type_().replace("Producer", "METcorrInputProducer"),
+                shifts = cms.VPSet(
+                    cms.PSet(
+                        instanceLabel = cms.string('EnUp'),
+                        shiftBy = cms.double(moduleShiftUp.shiftBy.value())
+                    ),
+                    cms.PSet(
+                        instanceLabel = cms.string('EnDown'),
+                        shiftBy = cms.double(moduleShiftDown.shiftBy.value())
+                    )
+                )
+            )
+            for parameterName in moduleShiftUp.parameterNames_():
+                if parameterName != 'shiftBy':
+                    setattr(module, parameterName, copy.deepcopy(getattr(moduleShiftUp, parameterName)))
+            moduleName = particleCollectionShiftUp[0:len(particleCollectionShiftUp) - len("EnUp" + postfix)] + "EnMETcorr" + postfix
+            setattr(process, moduleName, module)
+            for particleCollectionShifted in [ particleCollectionShiftUp, particleCollectionShiftDown ]:
+                sequence.remove(getattr(process, particleCollectionShifted))
+                delattr(process, particleCollectionShifted)
+                collectionsToKeep.remove(particleCollectionShifted)
+            sequence += module
+            shiftedParticleCollections['%sEnUp' % particleCollection] = None
+            shiftedParticleCollections['%sEnDown' % particleCollection] = None
+            shiftedParticleCollections['%sMETcorrEn' % particleCollection] = moduleName
+
     def _addPFCandidatesForPFMEtInput(self, process, metUncertaintySequence,
                                       particleCollection, particleType, shiftType, particleCollectionShiftUp, particleCollectionShiftDown,
                                       dRmatch,
@@ -522,6 +688,50 @@ class JetMEtUncertaintyTools(ConfigToolBase):
         metUncertaintySequence += module
         collectionsToKeep.append(patMEtCollectionName)
 
+    def _addMEtSystematicsTable(self, process, metUncertaintySequence,
+                                metSystematicsTable,
+                                collectionsToKeep, keepOnlyMEtSystematicsTable, postfix):
+
+        # collect px, py and sumEt of all pat::MET collections kept in the event content
+        # into one compact pat::METSystematicsTable
+        metCollections = []
+        variationNames = []
+        for collectionToKeep in collectionsToKeep:
+            moduleLabel = self._getModuleLabel(collectionToKeep)
+            if not hasattr(process, moduleLabel) or collectionToKeep in metCollections:
+                continue
+            moduleType = getattr(process, moduleLabel).type_()
+            if moduleType in [ "PATMETProducer", "CorrectedPATMETProducer" ]:
+                metCollections.append(collectionToKeep)
+                variationNames.append(collectionToKeep)
+            elif moduleType == "CorrectedPATMETProducerForSystematics" and collectionToKeep.find(':') != -1:
+                # CV: MET variations produced by module '<metLabel>Systematics<postfix>' with instance label e.g. 'JetEnUp'
+                #     are stored under the same name as if produced by module '<metLabel>JetEnUp<postfix>'
+                instanceLabel = collectionToKeep.split(':')[1]
+                metLabel = moduleLabel
+                if postfix != "" and metLabel[-len(postfix):] == postfix:
+                    metLabel = metLabel[0:-len(postfix)]
+                if metLabel[-len("Systematics"):] == "Systematics":
+                    metLabel = metLabel[0:-len("Systematics")]
+                metCollections.append(collectionToKeep)
+                variationNames.append("%s%s%s" % (metLabel, instanceLabel, postfix))
+        module = cms.EDProducer("METSystematicsTableProducer",
+            variations = cms.VPSet([ cms.PSet(
+                name = cms.string(variationName),
+                src = cms.InputTag(metCollection)
+            ) for metCollection, variationName in zip(metCollections, variationNames) ])
+        )
+        metSystematicsTableName = metSystematicsTable+postfix
+        setattr(process, metSystematicsTableName, module)
+        metUncertaintySequence += module
+
+        # CV: drop full pat::MET collections from event content
+        #     in case only the compact table is to be kept
+        if keepOnlyMEtSystematicsTable:
+            collectionsToKeep[:] = [ collectionToKeep for collectionToKeep in collectionsToKeep
+                                     if not collectionToKeep in metCollections ]
+        collectionsToKeep.append(metSystematicsTableName)
+
     def __call__(self, process,
                  electronCollection      = None,
                  photonCollection        = None,
@@ -538,6 +748,9 @@ class JetMEtUncertaintyTools(ConfigToolBase):
                  jecUncertaintyFile      = None,
                  jecUncertaintyTag       = None,
                  varyByNsigmas           = None,
+                 produceShiftsInOneModule = None,
+                 makeMEtSystematicsTable = None,
+                 keepOnlyMEtSystematicsTable = None,
                  addToPatDefaultSequence = None,
                  outputModule            = None,
                  postfix                 = None):
@@ -566,6 +779,12 @@ class JetMEtUncertaintyTools(ConfigToolBase):
             jecUncertaintyTag = self._defaultParameters['jecUncertaintyTag'].value
         if varyByNsigmas is None:
             varyByNsigmas = self._defaultParameters['varyByNsigmas'].value
+        if produceShiftsInOneModule is None:
+            produceShiftsInOneModule = self._defaultParameters['produceShiftsInOneModule'].value
+        if makeMEtSystematicsTable is None:
+            makeMEtSystematicsTable = self._defaultParameters['makeMEtSystematicsTable'].value
+        if keepOnlyMEtSystematicsTable is None:
+            keepOnlyMEtSystematicsTable = self._defaultParameters['keepOnlyMEtSystematicsTable'].value
         if addToPatDefaultSequence is None:
             addToPatDefaultSequence = self._defaultParameters['addToPatDefaultSequence'].value
         if outputModule is None:
@@ -588,6 +807,9 @@ class JetMEtUncertaintyTools(ConfigToolBase):
         self.setParameter('jecUncertaintyFile', jecUncertaintyFile)
         self.setParameter('jecUncertaintyTag', jecUncertaintyTag)
         self.setParameter('varyByNsigmas', varyByNsigmas)
+        self.setParameter('produceShiftsInOneModule', produceShiftsInOneModule)
+        self.setParameter('makeMEtSystematicsTable', makeMEtSystematicsTable)
+        self.setParameter('keepOnlyMEtSystematicsTable', keepOnlyMEtSystematicsTable)
         self.setParameter('addToPatDefaultSequence', addToPatDefaultSequence)
         self.setParameter('outputModule', outputModule)
         self.setParameter('postfix', postfix)
@@ -41,6 +41,7 @@ class RunJetUncertainties(JetMEtUncertaintyTools):
                  jecUncertaintyFile      = None,
                  jecUncertaintyTag       = None,
                  varyByNsigmas           = None,
+                 produceShiftsInOneModule = None,
                  addToPatDefaultSequence = None,
                  outputModule            = None,
                  postfix                 = None):
@@ -61,6 +62,7 @@ class RunJetUncertainties(JetMEtUncertaintyTools):
             jecUncertaintyFile = jecUncertaintyFile,
             jecUncertaintyTag = jecUncertaintyTag,
             varyByNsigmas = varyByNsigmas,
+            produceShiftsInOneModule = produceShiftsInOneModule,
             addToPatDefaultSequence = addToPatDefaultSequence,
             outputModule = outputModule,
             postfix = postfix)
@@ -88,6 +90,7 @@ class RunJetUncertainties(JetMEtUncertaintyTools):
         jecUncertaintyFile = self._parameters['jecUncertaintyFile'].value
         jecUncertaintyTag = self._parameters['jecUncertaintyTag'].value
         varyByNsigmas = self._parameters['varyByNsigmas'].value
+        produceShiftsInOneModule = self._parameters['produceShiftsInOneModule'].value
         addToPatDefaultSequence = self._parameters['addToPatDefaultSequence'].value
         outputModule = self._parameters['outputModule'].value
         postfix = self._parameters['postfix'].value
@@ -111,20 +114,31 @@ class RunJetUncertainties(JetMEtUncertaintyTools):
         jetCollectionResUp = None
         jetCollectionResDown = None
         if doSmearJets:
-            lastJetCollection = \
-              self._addSmearedJets(process, cleanedJetCollection, [ "smeared", jetCollection.value() ],
-                                   jetSmearFileName, jetSmearHistogram, varyByNsigmas,
-                                   uncertaintySequence = jetUncertaintySequence, postfix = postfix)                
-            jetCollectionResUp = \
-              self._addSmearedJets(process, cleanedJetCollection, [ "smeared", jetCollection.value(), "ResUp" ],
-                                   jetSmearFileName, jetSmearHistogram, varyByNsigmas, -1., 
-                                   uncertaintySequence = jetUncertaintySequence, postfix = postfix)
-            collectionsToKeep.append(jetCollectionResUp)
-            jetCollectionResDown = \
-              self._addSmearedJets(process, cleanedJetCollection, [ "smeared", jetCollection.value(), "ResDown" ],
-                                   jetSmearFileName, jetSmearHistogram, varyByNsigmas, +1., 
-                                   uncertaintySequence = jetUncertaintySequence, postfix = postfix)
-            collectionsToKeep.append(jetCollectionResDown)
+            if produceShiftsInOneModule:
+                # CV: produce smeared jets and jets with resolution shifted up/down in one module,
+                #     computing the jet resolution only once per jet
+                lastJetCollection = \
+                  self._addSmearedJets(process, cleanedJetCollection, [ "smeared", jetCollection.value() ],
+                                       jetSmearFileName, jetSmearHistogram, varyByNsigmas,
+                                       uncertaintySequence = jetUncertaintySequence, postfix = postfix,
+                                       shifts = self._getJetResolutionShifts(varyByNsigmas))
+                jetCollectionResUp = "%s:ResUp" % lastJetCollection
+                jetCollectionResDown = "%s:ResDown" % lastJetCollection
+            else:
+                lastJetCollection = \
+                  self._addSmearedJets(process, cleanedJetCollection, [ "smeared", jetCollection.value() ],
+                                       jetSmearFileName, jetSmearHistogram, varyByNsigmas,
+                                       uncertaintySequence = jetUncertaintySequence, postfix = postfix)                
+                jetCollectionResUp = \
+                  self._addSmearedJets(process, cleanedJetCollection, [ "smeared", jetCollection.value(), "ResUp" ],
+                                       jetSmearFileName, jetSmearHistogram, varyByNsigmas, -1., 
+                                       uncertaintySequence = jetUncertaintySequence, postfix = postfix)
+                collectionsToKeep.append(jetCollectionResUp)
+                jetCollectionResDown = \
+                  self._addSmearedJets(process, cleanedJetCollection, [ "smeared", jetCollection.value(), "ResDown" ],
+                                       jetSmearFileName, jetSmearHistogram, varyByNsigmas, +1., 
+                                       uncertaintySequence = jetUncertaintySequence, postfix = postfix)
+                collectionsToKeep.append(jetCollectionResDown)
 
         collectionsToKeep.append(lastJetCollection)
 
@@ -144,7 +158,8 @@ class RunJetUncertainties(JetMEtUncertaintyTools):
                                               jetCorrLabelUpToL3, jetCorrLabelUpToL3Res,
                                               jecUncertaintyFile, jecUncertaintyTag,
                                               varyByNsigmas,
-                                              postfix)
+                                              postfix,
+                                              produceShiftsInOneModule = produceShiftsInOneModule)
         setattr(process, "shiftedParticlesForJetUncertainties" + postfix, shiftedParticleSequence)        
         jetUncertaintySequence += getattr(process, "shiftedParticlesForJetUncertainties" + postfix)
         collectionsToKeep.extend(addCollectionsToKeep)
@@ -160,6 +175,6 @@ class RunJetUncertainties(JetMEtUncertaintyTools):
         if outputModule is not None and hasattr(process, outputModule):
             getattr(process, outputModule).outputCommands = _addEventContent(
                 getattr(process, outputModule).outputCommands,
-                [ 'keep *_%s_*_%s' % (collectionToKeep, process.name_()) for collectionToKeep in collectionsToKeep ])
+                [ 'keep *_%s_*_%s' % (self._getModuleLabel(collectionToKeep), process.name_()) for collectionToKeep in collectionsToKeep ])
        
 runJetUncertainties = RunJetUncertainties()
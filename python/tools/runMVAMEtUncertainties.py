@@ -31,7 +31,8 @@ class RunMVAMEtUncertainties(JetMEtUncertaintyTools):
                        doSmearJets,
                        jecUncertaintyFile, jecUncertaintyTag,
                        varyByNsigmas,
-                       postfix):
+                       postfix,
+                       produceShiftsInOneModule = False):
 
         if not hasattr(process, "pfMEtMVA"):
             process.load("JetMETCorrections.METPUSubtraction.mvaPFMET_cff")
@@ -59,6 +60,10 @@ class RunMVAMEtUncertainties(JetMEtUncertaintyTools):
                 skipCorrJetPtThreshold = cms.double(1.e-2),
                 srcGenJets = cms.InputTag('ak5GenJetsNoNu')
             ))
+            if produceShiftsInOneModule:
+                # CV: produce jets with resolution shifted up/down in the same module as the smeared jets
+                getattr(process, "smearedUncorrectedJetsForPFMEtByMVA" + postfix).shifts = \
+                  cms.VPSet(self._getJetResolutionShifts(varyByNsigmas))
             metUncertaintySequence += getattr(process, "smearedUncorrectedJetsForPFMEtByMVA" + postfix)
             getattr(process, "calibratedAK5PFJetsForPFMEtMVA" + postfix).src = cms.InputTag('smearedUncorrectedJetsForPFMEtByMVA' + postfix)
             getattr(process, "pfMEtMVA" + postfix).srcUncorrJets = cms.InputTag('smearedUncorrectedJetsForPFMEtByMVA' + postfix)
@@ -112,30 +117,58 @@ class RunMVAMEtUncertainties(JetMEtUncertaintyTools):
                                         modulePFMEtLeptonShiftDownName, 'patPFMetMVA%s%sDown' % (leptonCollection[0], leptonCollection[1]), collectionsToKeep, postfix)
 
         if self._isValidInputTag(shiftedParticleCollections['jetCollection']):            
-            setattr(process, "uncorrectedJetsEnUpForPFMEtByMVA" + postfix, cms.EDProducer("ShiftedPFJetProducer",
-                src = cms.InputTag(lastUncorrectedJetCollection),
-                jetCorrInputFileName = cms.FileInPath(jecUncertaintyFile),
-                jetCorrUncertaintyTag = cms.string(jecUncertaintyTag),
-                addResidualJES = cms.bool(True),
-                jetCorrLabelUpToL3 = cms.string("ak5PFL1FastL2L3"),
-                jetCorrLabelUpToL3Res = cms.string("ak5PFL1FastL2L3Residual"),                               
-                shiftBy = cms.double(+1.*varyByNsigmas)
-            ))
-            metUncertaintySequence += getattr(process, "uncorrectedJetsEnUpForPFMEtByMVA" + postfix)
-            setattr(process, "uncorrectedJetsEnDownForPFMEtByMVA" + postfix, getattr(process, "uncorrectedJetsEnUpForPFMEtByMVA" + postfix).clone(
-                shiftBy = cms.double(-1.*varyByNsigmas)
-            ))
-            metUncertaintySequence += getattr(process, "uncorrectedJetsEnDownForPFMEtByMVA" + postfix)
-            setattr(process, "correctedJetsEnUpForPFMEtByMVA" + postfix, getattr(process, "uncorrectedJetsEnUpForPFMEtByMVA" + postfix).clone(
-                src = cms.InputTag(lastCorrectedJetCollection),
-                addResidualJES = cms.bool(False),
-                shiftBy = cms.double(+1.*varyByNsigmas)
-            ))
-            metUncertaintySequence += getattr(process, "correctedJetsEnUpForPFMEtByMVA" + postfix)
-            setattr(process, "correctedJetsEnDownForPFMEtByMVA" + postfix, getattr(process, "correctedJetsEnUpForPFMEtByMVA" + postfix).clone(
-                shiftBy = cms.double(-1.*varyByNsigmas)
-            ))
-            metUncertaintySequence += getattr(process, "correctedJetsEnDownForPFMEtByMVA" + postfix)
+            uncorrectedJetsEnUp = None
+            uncorrectedJetsEnDown = None
+            correctedJetsEnUp = None
+            correctedJetsEnDown = None
+            if produceShiftsInOneModule:
+                setattr(process, "uncorrectedJetsEnForPFMEtByMVA" + postfix, cms.EDProducer("ShiftedPFJetProducer",
+                    src = cms.InputTag(lastUncorrectedJetCollection),
+                    jetCorrInputFileName = cms.FileInPath(jecUncertaintyFile),
+                    jetCorrUncertaintyTag = cms.string(jecUncertaintyTag),
+                    jetCorrLabelUpToL3 = cms.string("ak5PFL1FastL2L3"),
+                    jetCorrLabelUpToL3Res = cms.string("ak5PFL1FastL2L3Residual"),
+                    shifts = cms.VPSet(self._getJetEnergyShifts(varyByNsigmas, True))
+                ))
+                metUncertaintySequence += getattr(process, "uncorrectedJetsEnForPFMEtByMVA" + postfix)
+                setattr(process, "correctedJetsEnForPFMEtByMVA" + postfix, getattr(process, "uncorrectedJetsEnForPFMEtByMVA" + postfix).clone(
+                    src = cms.InputTag(lastCorrectedJetCollection),
+                    shifts = cms.VPSet(self._getJetEnergyShifts(varyByNsigmas, False))
+                ))
+                metUncertaintySequence += getattr(process, "correctedJetsEnForPFMEtByMVA" + postfix)
+                uncorrectedJetsEnUp = "uncorrectedJetsEnForPFMEtByMVA%s:EnUp" % postfix
+                uncorrectedJetsEnDown = "uncorrectedJetsEnForPFMEtByMVA%s:EnDown" % postfix
+                correctedJetsEnUp = "correctedJetsEnForPFMEtByMVA%s:EnUp" % postfix
+                correctedJetsEnDown = "correctedJetsEnForPFMEtByMVA%s:EnDown" % postfix
+            else:
+                setattr(process, "uncorrectedJetsEnUpForPFMEtByMVA" + postfix, cms.EDProducer("ShiftedPFJetProducer",
+                    src = cms.InputTag(lastUncorrectedJetCollection),
+                    jetCorrInputFileName = cms.FileInPath(jecUncertaintyFile),
+                    jetCorrUncertaintyTag = cms.string(jecUncertaintyTag),
+                    addResidualJES = cms.bool(True),
+                    jetCorrLabelUpToL3 = cms.string("ak5PFL1FastL2L3"),
+                    jetCorrLabelUpToL3Res = cms.string("ak5PFL1FastL2L3Residual"),                               
+                    shiftBy = cms.double(+1.*varyByNsigmas)
+                ))
+                metUncertaintySequence += getattr(process, "uncorrectedJetsEnUpForPFMEtByMVA" + postfix)
+                setattr(process, "uncorrectedJetsEnDownForPFMEtByMVA" + postfix, getattr(process, "uncorrectedJetsEnUpForPFMEtByMVA" + postfix).clone(
+                    shiftBy = cms.double(-1.*varyByNsigmas)
+                ))
+                metUncertaintySequence += getattr(process, "uncorrectedJetsEnDownForPFMEtByMVA" + postfix)
+                setattr(process, "correctedJetsEnUpForPFMEtByMVA" + postfix, getattr(process, "uncorrectedJetsEnUpForPFMEtByMVA" + postfix).clone(
+                    src = cms.InputTag(lastCorrectedJetCollection),
+                    addResidualJES = cms.bool(False),
+                    shiftBy = cms.double(+1.*varyByNsigmas)
+                ))
+                metUncertaintySequence += getattr(process, "correctedJetsEnUpForPFMEtByMVA" + postfix)
+                setattr(process, "correctedJetsEnDownForPFMEtByMVA" + postfix, getattr(process, "correctedJetsEnUpForPFMEtByMVA" + postfix).clone(
+                    shiftBy = cms.double(-1.*varyByNsigmas)
+                ))
+                metUncertaintySequence += getattr(process, "correctedJetsEnDownForPFMEtByMVA" + postfix)
+                uncorrectedJetsEnUp = "uncorrectedJetsEnUpForPFMEtByMVA" + postfix
+                uncorrectedJetsEnDown = "uncorrectedJetsEnDownForPFMEtByMVA" + postfix
+                correctedJetsEnUp = "correctedJetsEnUpForPFMEtByMVA" + postfix
+                correctedJetsEnDown = "correctedJetsEnDownForPFMEtByMVA" + postfix
             pfCandCollectionJetEnUp, pfCandCollectionJetEnDown = \
               self._addPFCandidatesForPFMEtInput(
                 process, metUncertaintySequence, 
@@ -144,8 +177,8 @@ class RunMVAMEtUncertainties(JetMEtUncertaintyTools):
                 0.5,
                 pfCandCollection, postfix)
             setattr(process, "pfMEtMVAJetEnUp" + postfix, getattr(process, "pfMEtMVA").clone(
-                srcCorrJets = cms.InputTag('correctedJetsEnUpForPFMEtByMVA' + postfix),
-                srcUncorrJets = cms.InputTag('uncorrectedJetsEnUpForPFMEtByMVA' + postfix),
+                srcCorrJets = cms.InputTag(correctedJetsEnUp),
+                srcUncorrJets = cms.InputTag(uncorrectedJetsEnUp),
                 srcPFCandidates = cms.InputTag(pfCandCollectionJetEnUp),
                 srcLeptons = cms.VInputTag(self._getLeptonsForPFMEtInput(shiftedParticleCollections, postfix = postfix))
             ))
@@ -153,8 +186,8 @@ class RunMVAMEtUncertainties(JetMEtUncertaintyTools):
             self._addPATMEtProducer(process, metUncertaintySequence,
                                     'pfMEtMVAJetEnUp' + postfix, 'patPFMetMVAJetEnUp', collectionsToKeep, postfix)
             setattr(process, "pfMEtMVAJetEnDown" + postfix, getattr(process, "pfMEtMVA" + postfix).clone(
-                srcCorrJets = cms.InputTag('correctedJetsEnDownForPFMEtByMVA' + postfix),
-                srcUncorrJets = cms.InputTag('uncorrectedJetsEnDownForPFMEtByMVA' + postfix),
+                srcCorrJets = cms.InputTag(correctedJetsEnDown),
+                srcUncorrJets = cms.InputTag(uncorrectedJetsEnDown),
                 srcPFCandidates = cms.InputTag(pfCandCollectionJetEnDown),
                 srcLeptons = cms.VInputTag(self._getLeptonsForPFMEtInput(shiftedParticleCollections, postfix = postfix))
             ))
@@ -163,22 +196,36 @@ class RunMVAMEtUncertainties(JetMEtUncertaintyTools):
                                     'pfMEtMVAJetEnDown' + postfix, 'patPFMetMVAJetEnDown', collectionsToKeep, postfix)
 
             if hasattr(process, "smearedUncorrectedJetsForPFMEtByMVA" + postfix):
-                setattr(process, "uncorrectedJetsResUpForPFMEtByMVA" + postfix, getattr(process, "smearedUncorrectedJetsForPFMEtByMVA" + postfix).clone(
-                    shiftBy = cms.double(-1.*varyByNsigmas)
-                ))
-                metUncertaintySequence += getattr(process, "uncorrectedJetsResUpForPFMEtByMVA" + postfix)
-                setattr(process, "uncorrectedJetsResDownForPFMEtByMVA" + postfix, getattr(process, "smearedUncorrectedJetsForPFMEtByMVA" + postfix).clone(
-                    shiftBy = cms.double(+1.*varyByNsigmas)
-                ))
-                metUncertaintySequence += getattr(process, "uncorrectedJetsResDownForPFMEtByMVA" + postfix)
-                setattr(process, "correctedJetsResUpForPFMEtByMVA" + postfix, getattr(process, "smearedCorrectedJetsForPFMEtByMVA" + postfix).clone(
-                    shiftBy = cms.double(-1.*varyByNsigmas)
-                ))
-                metUncertaintySequence += getattr(process, "correctedJetsResUpForPFMEtByMVA" + postfix)
-                setattr(process, "correctedJetsResDownForPFMEtByMVA" + postfix, getattr(process, "smearedCorrectedJetsForPFMEtByMVA" + postfix).clone(
-                    shiftBy = cms.double(+1.*varyByNsigmas)
-                ))
-                metUncertaintySequence += getattr(process, "correctedJetsResDownForPFMEtByMVA" + postfix)
+                uncorrectedJetsResUp = None
+                uncorrectedJetsResDown = None
+                correctedJetsResUp = None
+                correctedJetsResDown = None
+                if produceShiftsInOneModule:
+                    uncorrectedJetsResUp = "smearedUncorrectedJetsForPFMEtByMVA%s:ResUp" % postfix
+                    uncorrectedJetsResDown = "smearedUncorrectedJetsForPFMEtByMVA%s:ResDown" % postfix
+                    correctedJetsResUp = "smearedCorrectedJetsForPFMEtByMVA%s:ResUp" % postfix
+                    correctedJetsResDown = "smearedCorrectedJetsForPFMEtByMVA%s:ResDown" % postfix
+                else:
+                    setattr(process, "uncorrectedJetsResUpForPFMEtByMVA" + postfix, getattr(process, "smearedUncorrectedJetsForPFMEtByMVA" + postfix).clone(
+                        shiftBy = cms.double(-1.*varyByNsigmas)
+                    ))
+                    metUncertaintySequence += getattr(process, "uncorrectedJetsResUpForPFMEtByMVA" + postfix)
+                    setattr(process, "uncorrectedJetsResDownForPFMEtByMVA" + postfix, getattr(process, "smearedUncorrectedJetsForPFMEtByMVA" + postfix).clone(
+                        shiftBy = cms.double(+1.*varyByNsigmas)
+                    ))
+                    metUncertaintySequence += getattr(process, "uncorrectedJetsResDownForPFMEtByMVA" + postfix)
+                    setattr(process, "correctedJetsResUpForPFMEtByMVA" + postfix, getattr(process, "smearedCorrectedJetsForPFMEtByMVA" + postfix).clone(
+                        shiftBy = cms.double(-1.*varyByNsigmas)
+                    ))
+                    metUncertaintySequence += getattr(process, "correctedJetsResUpForPFMEtByMVA" + postfix)
+                    setattr(process, "correctedJetsResDownForPFMEtByMVA" + postfix, getattr(process, "smearedCorrectedJetsForPFMEtByMVA" + postfix).clone(
+                        shiftBy = cms.double(+1.*varyByNsigmas)
+                    ))
+                    metUncertaintySequence += getattr(process, "correctedJetsResDownForPFMEtByMVA" + postfix)
+                    uncorrectedJetsResUp = "uncorrectedJetsResUpForPFMEtByMVA" + postfix
+                    uncorrectedJetsResDown = "uncorrectedJetsResDownForPFMEtByMVA" + postfix
+                    correctedJetsResUp = "correctedJetsResUpForPFMEtByMVA" + postfix
+                    correctedJetsResDown = "correctedJetsResDownForPFMEtByMVA" + postfix
                 pfCandCollectionJetResUp, pfCandCollectionJetResDown = \
                   self._addPFCandidatesForPFMEtInput(
                     process, metUncertaintySequence,
@@ -187,8 +234,8 @@ class RunMVAMEtUncertainties(JetMEtUncertaintyTools):
                     0.5,
                     pfCandCollection, postfix)
                 setattr(process, "pfMEtMVAJetResUp" + postfix, getattr(process, "pfMEtMVA" + postfix).clone(
-                    srcCorrJets = cms.InputTag('correctedJetsResUpForPFMEtByMVA' + postfix),
-                    srcUncorrJets = cms.InputTag('uncorrectedJetsResUpForPFMEtByMVA' + postfix),
+                    srcCorrJets = cms.InputTag(correctedJetsResUp),
+                    srcUncorrJets = cms.InputTag(uncorrectedJetsResUp),
                     srcPFCandidates = cms.InputTag(pfCandCollectionJetResUp),
                     srcLeptons = cms.VInputTag(self._getLeptonsForPFMEtInput(shiftedParticleCollections, postfix = postfix))
                 ))
@@ -196,8 +243,8 @@ class RunMVAMEtUncertainties(JetMEtUncertaintyTools):
                 self._addPATMEtProducer(process, metUncertaintySequence,
                                        'pfMEtMVAJetResUp' + postfix, 'patPFMetMVAJetResUp', collectionsToKeep, postfix)
                 setattr(process, "pfMEtMVAJetResDown" + postfix, getattr(process, "pfMEtMVA" + postfix).clone(
-                    srcCorrJets = cms.InputTag('correctedJetsResDownForPFMEtByMVA' + postfix),
-                    srcUncorrJets = cms.InputTag('uncorrectedJetsResDownForPFMEtByMVA' + postfix),
+                    srcCorrJets = cms.InputTag(correctedJetsResDown),
+                    srcUncorrJets = cms.InputTag(uncorrectedJetsResDown),
                     srcPFCandidates = cms.InputTag(pfCandCollectionJetResDown),
                     srcLeptons = cms.VInputTag(self._getLeptonsForPFMEtInput(shiftedParticleCollections, postfix = postfix))
                 ))
@@ -255,6 +302,9 @@ class RunMVAMEtUncertainties(JetMEtUncertaintyTools):
                  jecUncertaintyFile      = None,
                  jecUncertaintyTag       = None,
                  varyByNsigmas           = None,
+                 produceShiftsInOneModule = None,
+                 makeMEtSystematicsTable = None,
+                 keepOnlyMEtSystematicsTable = None,
                  addToPatDefaultSequence = None,
                  outputModule            = None,
                  postfix                 = None):
@@ -275,6 +325,9 @@ class RunMVAMEtUncertainties(JetMEtUncertaintyTools):
             jecUncertaintyFile = jecUncertaintyFile,
             jecUncertaintyTag = jecUncertaintyTag,
             varyByNsigmas = varyByNsigmas,
+            produceShiftsInOneModule = produceShiftsInOneModule,
+            makeMEtSystematicsTable = makeMEtSystematicsTable,
+            keepOnlyMEtSystematicsTable = keepOnlyMEtSystematicsTable,
             addToPatDefaultSequence = addToPatDefaultSequence,
             outputModule = outputModule,
             postfix = postfix)
@@ -301,6 +354,9 @@ class RunMVAMEtUncertainties(JetMEtUncertaintyTools):
         jecUncertaintyFile = self._parameters['jecUncertaintyFile'].value
         jecUncertaintyTag = self._parameters['jecUncertaintyTag'].value
         varyByNsigmas = self._parameters['varyByNsigmas'].value
+        produceShiftsInOneModule = self._parameters['produceShiftsInOneModule'].value
+        makeMEtSystematicsTable = self._parameters['makeMEtSystematicsTable'].value
+        keepOnlyMEtSystematicsTable = self._parameters['keepOnlyMEtSystematicsTable'].value
         addToPatDefaultSequence = self._parameters['addToPatDefaultSequence'].value
         outputModule = self._parameters['outputModule'].value
         postfix = self._parameters['postfix'].value
@@ -319,20 +375,31 @@ class RunMVAMEtUncertainties(JetMEtUncertaintyTools):
         jetCollectionResUp = None
         jetCollectionResDown = None
         if doSmearJets:
-            lastJetCollection = \
-              self._addSmearedJets(process, lastJetCollection, [ "smeared", jetCollection.value(), "ForPFMEtByMVA" ],
-                                   jetSmearFileName, jetSmearHistogram, varyByNsigmas,
-                                   uncertaintySequence = metUncertaintySequence, postfix = postfix)
-            jetCollectionResUp = \
-              self._addSmearedJets(process, lastJetCollection, [ "smeared", jetCollection.value(), "ForPFMEtByMVAResUp" ],
-                                   jetSmearFileName, jetSmearHistogram, varyByNsigmas, -1., 
-                                   uncertaintySequence = metUncertaintySequence, postfix = postfix)
-            collectionsToKeep.append(jetCollectionResUp)
-            jetCollectionResDown = \
-              self._addSmearedJets(process, lastJetCollection, [ "smeared", jetCollection.value(), "ForPFMEtByMVAResDown" ],
-                                   jetSmearFileName, jetSmearHistogram, varyByNsigmas, +1., 
-                                   uncertaintySequence = metUncertaintySequence, postfix = postfix)
-            collectionsToKeep.append(jetCollectionResDown)
+            if produceShiftsInOneModule:
+                # CV: produce smeared jets and jets with resolution shifted up/down in one module,
+                #     computing the jet resolution only once per jet
+                lastJetCollection = \
+                  self._addSmearedJets(process, lastJetCollection, [ "smeared", jetCollection.value(), "ForPFMEtByMVA" ],
+                                       jetSmearFileName, jetSmearHistogram, varyByNsigmas,
+                                       uncertaintySequence = metUncertaintySequence, postfix = postfix,
+                                       shifts = self._getJetResolutionShifts(varyByNsigmas))
+                jetCollectionResUp = "%s:ResUp" % lastJetCollection
+                jetCollectionResDown = "%s:ResDown" % lastJetCollection
+            else:
+                lastJetCollection = \
+                  self._addSmearedJets(process, lastJetCollection, [ "smeared", jetCollection.value(), "ForPFMEtByMVA" ],
+                                       jetSmearFileName, jetSmearHistogram, varyByNsigmas,
+                                       uncertaintySequence = metUncertaintySequence, postfix = postfix)
+                jetCollectionResUp = \
+                  self._addSmearedJets(process, lastJetCollection, [ "smeared", jetCollection.value(), "ForPFMEtByMVAResUp" ],
+                                       jetSmearFileName, jetSmearHistogram, varyByNsigmas, -1., 
+                                       uncertaintySequence = metUncertaintySequence, postfix = postfix)
+                collectionsToKeep.append(jetCollectionResUp)
+                jetCollectionResDown = \
+                  self._addSmearedJets(process, lastJetCollection, [ "smeared", jetCollection.value(), "ForPFMEtByMVAResDown" ],
+                                       jetSmearFileName, jetSmearHistogram, varyByNsigmas, +1., 
+                                       uncertaintySequence = metUncertaintySequence, postfix = postfix)
+                collectionsToKeep.append(jetCollectionResDown)
 
         collectionsToKeep.append(lastJetCollection)
 
@@ -352,7 +419,8 @@ class RunMVAMEtUncertainties(JetMEtUncertaintyTools):
                                               jetCorrLabelUpToL3, jetCorrLabelUpToL3Res,
                                               jecUncertaintyFile, jecUncertaintyTag,
                                               varyByNsigmas,
-                                              "ForPFMEtByMVA" + postfix)
+                                              "ForPFMEtByMVA" + postfix,
+                                              produceShiftsInOneModule = produceShiftsInOneModule)
         setattr(process, "shiftedParticlesForPFMEtByMVAUncertainties" + postfix, shiftedParticleSequence)    
         metUncertaintySequence += getattr(process, "shiftedParticlesForPFMEtByMVAUncertainties" + postfix)
         collectionsToKeep.extend(addCollectionsToKeep)
@@ -367,8 +435,16 @@ class RunMVAMEtUncertainties(JetMEtUncertaintyTools):
                             doSmearJets,
                             jecUncertaintyFile, jecUncertaintyTag, 
                             varyByNsigmas,
-                            postfix)
+                            postfix,
+                            produceShiftsInOneModule = produceShiftsInOneModule)
         
+        # collect px, py and sumEt of all MET variations into one compact table
+        if makeMEtSystematicsTable or keepOnlyMEtSystematicsTable:
+            self._addMEtSystematicsTable(process, metUncertaintySequence,
+                                         "patPFMEtMVASystematicsTable",
+                                         collectionsToKeep, keepOnlyMEtSystematicsTable,
+                                         postfix)
+
         # insert metUncertaintySequence into patDefaultSequence
         if addToPatDefaultSequence:
             if not hasattr(process, "patDefaultSequence"):
@@ -380,6 +456,6 @@ class RunMVAMEtUncertainties(JetMEtUncertaintyTools):
         if outputModule is not None and hasattr(process, outputModule):
             getattr(process, outputModule).outputCommands = _addEventContent(
                 getattr(process, outputModule).outputCommands,
-                [ 'keep *_%s_*_%s' % (collectionToKeep, process.name_()) for collectionToKeep in collectionsToKeep ])
+                [ 'keep *_%s_*_%s' % (self._getModuleLabel(collectionToKeep), process.name_()) for collectionToKeep in collectionsToKeep ])
        
 runMVAMEtUncertainties = RunMVAMEtUncertainties()
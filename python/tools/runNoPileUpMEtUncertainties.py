@@ -36,7 +36,8 @@ class RunNoPileUpMEtUncertainties(JetMEtUncertaintyTools):
                           doSmearJets,
                           jecUncertaintyFile, jecUncertaintyTag,
                           varyByNsigmas,
-                          postfix):
+                          postfix,
+                          produceShiftsInOneModule = False):
 
         uncorrectedJetCollection = None
         smearedUncorrectedJetCollection = None
@@ -215,29 +216,55 @@ class RunNoPileUpMEtUncertainties(JetMEtUncertaintyTools):
         
         if self._isValidInputTag(shiftedParticleCollections['jetCollection']):
             uncorrectedJetsEnUp = None
+            uncorrectedJetsEnDown = None
             correctedJetsEnUp = None
-            if doApplyChargedHadronSubtraction:
-                uncorrectedJetsEnUp = "uncorrectedJetsEnUpForNoPileUpPFchsMEt" + postfix
-                correctedJetsEnUp = "correctedJetsEnUpForNoPileUpPFchsMEt" + postfix
+            correctedJetsEnDown = None
+            if produceShiftsInOneModule:
+                uncorrectedJetsEn = "uncorrectedJetsEnForNoPileUpPF%sMEt%s" % (chsLabel, postfix)
+                correctedJetsEn = "correctedJetsEnForNoPileUpPF%sMEt%s" % (chsLabel, postfix)
+                setattr(process, uncorrectedJetsEn, cms.EDProducer("ShiftedPFJetProducer",
+                    src = cms.InputTag(uncorrectedJetCollection),
+                    jetCorrInputFileName = cms.FileInPath(jecUncertaintyFile),
+                    jetCorrUncertaintyTag = cms.string(jecUncertaintyTag),
+                    jetCorrLabelUpToL3 = cms.string(jetCorrLabelUpToL3),
+                    jetCorrLabelUpToL3Res = cms.string(jetCorrLabelUpToL3Residual),
+                    shifts = cms.VPSet(self._getJetEnergyShifts(varyByNsigmas, True))
+                ))
+                metUncertaintySequence += getattr(process, uncorrectedJetsEn)
+                setattr(process, correctedJetsEn, getattr(process, uncorrectedJetsEn).clone(
+                    src = cms.InputTag(correctedJetCollection + postfix),
+                    shifts = cms.VPSet(self._getJetEnergyShifts(varyByNsigmas, False))
+                ))
+                metUncertaintySequence += getattr(process, correctedJetsEn)
+                uncorrectedJetsEnUp = uncorrectedJetsEn + ":EnUp"
+                uncorrectedJetsEnDown = uncorrectedJetsEn + ":EnDown"
+                correctedJetsEnUp = correctedJetsEn + ":EnUp"
+                correctedJetsEnDown = correctedJetsEn + ":EnDown"
             else:
-                uncorrectedJetsEnUp = "uncorrectedJetsEnUpForNoPileUpPFMEt" + postfix
-                correctedJetsEnUp = "correctedJetsEnUpForNoPileUpPFMEt" + postfix
-            setattr(process, uncorrectedJetsEnUp, cms.EDProducer("ShiftedPFJetProducer",
-                src = cms.InputTag(uncorrectedJetCollection),
-                jetCorrInputFileName = cms.FileInPath(jecUncertaintyFile),
-                jetCorrUncertaintyTag = cms.string(jecUncertaintyTag),
-                addResidualJES = cms.bool(True),
-                jetCorrLabelUpToL3 = cms.string(jetCorrLabelUpToL3),
-                jetCorrLabelUpToL3Res = cms.string(jetCorrLabelUpToL3Residual),
-                shiftBy = cms.double(+1.*varyByNsigmas),
-                ##verbosity = cms.int32(1)
-            ))
-            metUncertaintySequence += getattr(process, uncorrectedJetsEnUp)
-            setattr(process, correctedJetsEnUp, getattr(process, uncorrectedJetsEnUp).clone(
-                src = cms.InputTag(correctedJetCollection + postfix),
-                addResidualJES = cms.bool(False)
-            ))
-            metUncertaintySequence += getattr(process, correctedJetsEnUp)
+                if doApplyChargedHadronSubtraction:
+                    uncorrectedJetsEnUp = "uncorrectedJetsEnUpForNoPileUpPFchsMEt" + postfix
+                    correctedJetsEnUp = "correctedJetsEnUpForNoPileUpPFchsMEt" + postfix
+                else:
+                    uncorrectedJetsEnUp = "uncorrectedJetsEnUpForNoPileUpPFMEt" + postfix
+                    correctedJetsEnUp = "correctedJetsEnUpForNoPileUpPFMEt" + postfix
+                setattr(process, uncorrectedJetsEnUp, cms.EDProducer("ShiftedPFJetProducer",
+                    src = cms.InputTag(uncorrectedJetCollection),
+                    jetCorrInputFileName = cms.FileInPath(jecUncertaintyFile),
+                    jetCorrUncertaintyTag = cms.string(jecUncertaintyTag),
+                    addResidualJES = cms.bool(True),
+                    jetCorrLabelUpToL3 = cms.string(jetCorrLabelUpToL3),
+                    jetCorrLabelUpToL3Res = cms.string(jetCorrLabelUpToL3Residual),
+                    shiftBy = cms.double(+1.*varyByNsigmas),
+                    ##verbosity = cms.int32(1)
+                ))
+                metUncertaintySequence += getattr(process, uncorrectedJetsEnUp)
+                setattr(process, correctedJetsEnUp, getattr(process, uncorrectedJetsEnUp).clone(
+                    src = cms.InputTag(correctedJetCollection + postfix),
+                    addResidualJES = cms.bool(False)
+                ))
+                metUncertaintySequence += getattr(process, correctedJetsEnUp)
+                uncorrectedJetsEnDown = uncorrectedJetsEnUp.replace("JetsEnUp", "JetsEnDown")
+                correctedJetsEnDown = correctedJetsEnUp.replace("JetsEnUp", "JetsEnDown")
             puJetIdJetEnUp = "%sJetEnUp%s" % (puJetId, postfix)
             setattr(process, puJetIdJetEnUp, getattr(process, puJetId + postfix).clone(
                 jets = cms.InputTag(correctedJetsEnUp)
@@ -257,16 +284,15 @@ class RunNoPileUpMEtUncertainties(JetMEtUncertaintyTools):
             metUncertaintySequence += getattr(process, noPileUpPFMEtJetEnUp)
             self._addPATMEtProducer(process, metUncertaintySequence,
                                     noPileUpPFMEtJetEnUp, "%sJetEnUp" % patPFMetNoPileUp, collectionsToKeep, postfix)
-            uncorrectedJetsEnDown = uncorrectedJetsEnUp.replace("JetsEnUp", "JetsEnDown")
-            correctedJetsEnDown = correctedJetsEnUp.replace("JetsEnUp", "JetsEnDown")
-            setattr(process, uncorrectedJetsEnDown, getattr(process, uncorrectedJetsEnUp).clone(
-                shiftBy = cms.double(-1.*varyByNsigmas)
-            ))
-            metUncertaintySequence += getattr(process, uncorrectedJetsEnDown)
-            setattr(process, correctedJetsEnDown, getattr(process, correctedJetsEnUp).clone(
-                shiftBy = cms.double(-1.*varyByNsigmas)
-            ))
-            metUncertaintySequence += getattr(process, correctedJetsEnDown)
+            if not produceShiftsInOneModule:
+                setattr(process, uncorrectedJetsEnDown, getattr(process, uncorrectedJetsEnUp).clone(
+                    shiftBy = cms.double(-1.*varyByNsigmas)
+                ))
+                metUncertaintySequence += getattr(process, uncorrectedJetsEnDown)
+                setattr(process, correctedJetsEnDown, getattr(process, correctedJetsEnUp).clone(
+                    shiftBy = cms.double(-1.*varyByNsigmas)
+                ))
+                metUncertaintySequence += getattr(process, correctedJetsEnDown)
             puJetIdJetEnDown = "%sJetEnDown%s" % (puJetId, postfix)
             setattr(process, puJetIdJetEnDown, getattr(process, puJetIdJetEnUp).clone(
                 jets = cms.InputTag(correctedJetsEnDown)
@@ -293,14 +319,26 @@ class RunNoPileUpMEtUncertainties(JetMEtUncertaintyTools):
                     jetCorrLabel = cms.string("")
                 ))
                 correctedJetsResUp = None
-                if doApplyChargedHadronSubtraction:
-                    correctedJetsResUp = "correctedJetsResUpForNoPileUpPFchsMEt" + postfix
+                correctedJetsResDown = None
+                if produceShiftsInOneModule:
+                    # CV: produce jets with resolution shifted up and down in one module
+                    correctedJetsRes = "correctedJetsResForNoPileUpPF%sMEt%s" % (chsLabel, postfix)
+                    setattr(process, correctedJetsRes, getattr(process, smearedCorrectedJetCollection + postfix).clone(
+                        shifts = cms.VPSet(self._getJetResolutionShifts(varyByNsigmas, addCentralValue = False))
+                    ))
+                    metUncertaintySequence += getattr(process, correctedJetsRes)
+                    correctedJetsResUp = correctedJetsRes + ":ResUp"
+                    correctedJetsResDown = correctedJetsRes + ":ResDown"
                 else:
-                    correctedJetsResUp = "correctedJetsResUpForNoPileUpPFMEt" + postfix
-                setattr(process, correctedJetsResUp, getattr(process, smearedCorrectedJetCollection + postfix).clone(
-                    shiftBy = cms.double(-1.*varyByNsigmas)
-                ))
-                metUncertaintySequence += getattr(process, correctedJetsResUp)
+                    if doApplyChargedHadronSubtraction:
+                        correctedJetsResUp = "correctedJetsResUpForNoPileUpPFchsMEt" + postfix
+                    else:
+                        correctedJetsResUp = "correctedJetsResUpForNoPileUpPFMEt" + postfix
+                    setattr(process, correctedJetsResUp, getattr(process, smearedCorrectedJetCollection + postfix).clone(
+                        shiftBy = cms.double(-1.*varyByNsigmas)
+                    ))
+                    metUncertaintySequence += getattr(process, correctedJetsResUp)
+                    correctedJetsResDown = correctedJetsResUp.replace("JetsResUp", "JetsResDown")
                 puJetIdJetResUp = "%sJetResUp%s" % (puJetId, postfix)                
                 setattr(process, puJetIdJetResUp, getattr(process, puJetId).clone(
                     jets = cms.InputTag(correctedJetsResUp)
@@ -320,11 +358,11 @@ class RunNoPileUpMEtUncertainties(JetMEtUncertaintyTools):
                 metUncertaintySequence += getattr(process, noPileUpPFMEtJetResUp)
                 self._addPATMEtProducer(process, metUncertaintySequence,
                                         noPileUpPFMEtJetResUp, "%sJetResUp" % patPFMetNoPileUp, collectionsToKeep, postfix)
-                correctedJetsResDown = correctedJetsResUp.replace("JetsResUp", "JetsResDown")
-                setattr(process, correctedJetsResDown, getattr(process, smearedCorrectedJetCollection + postfix).clone(
-                    shiftBy = cms.double(+1.*varyByNsigmas)
-                ))
-                metUncertaintySequence += getattr(process, correctedJetsResDown)
+                if not produceShiftsInOneModule:
+                    setattr(process, correctedJetsResDown, getattr(process, smearedCorrectedJetCollection + postfix).clone(
+                        shiftBy = cms.double(+1.*varyByNsigmas)
+                    ))
+                    metUncertaintySequence += getattr(process, correctedJetsResDown)
                 puJetIdJetResDown = "%sJetResDown%s" % (puJetId, postfix)                
                 setattr(process, puJetIdJetResDown, getattr(process, puJetId).clone(
                     jets = cms.InputTag(correctedJetsResDown)
@@ -440,6 +478,9 @@ class RunNoPileUpMEtUncertainties(JetMEtUncertaintyTools):
                  jecUncertaintyFile              = None,
                  jecUncertaintyTag               = None,
                  varyByNsigmas                   = None,                 
+                 produceShiftsInOneModule        = None,
+                 makeMEtSystematicsTable         = None,
+                 keepOnlyMEtSystematicsTable     = None,
                  addToPatDefaultSequence         = None,
                  outputModule                    = None,
                  postfix                         = None):
@@ -460,6 +501,9 @@ class RunNoPileUpMEtUncertainties(JetMEtUncertaintyTools):
             jecUncertaintyFile = jecUncertaintyFile,
             jecUncertaintyTag = jecUncertaintyTag,
             varyByNsigmas = varyByNsigmas,
+            produceShiftsInOneModule = produceShiftsInOneModule,
+            makeMEtSystematicsTable = makeMEtSystematicsTable,
+            keepOnlyMEtSystematicsTable = keepOnlyMEtSystematicsTable,
             addToPatDefaultSequence = addToPatDefaultSequence,
             outputModule = outputModule,
             postfix = postfix)
@@ -499,6 +543,9 @@ class RunNoPileUpMEtUncertainties(JetMEtUncertaintyTools):
         jecUncertaintyFile = self._parameters['jecUncertaintyFile'].value
         jecUncertaintyTag = self._parameters['jecUncertaintyTag'].value
         varyByNsigmas = self._parameters['varyByNsigmas'].value
+        produceShiftsInOneModule = self._parameters['produceShiftsInOneModule'].value
+        makeMEtSystematicsTable = self._parameters['makeMEtSystematicsTable'].value
+        keepOnlyMEtSystematicsTable = self._parameters['keepOnlyMEtSystematicsTable'].value
         addToPatDefaultSequence = self._parameters['addToPatDefaultSequence'].value
         outputModule = self._parameters['outputModule'].value
         postfix = self._parameters['postfix'].value
@@ -517,20 +564,31 @@ class RunNoPileUpMEtUncertainties(JetMEtUncertaintyTools):
         jetCollectionResUp = None
         jetCollectionResDown = None
         if doSmearJets:
-            lastJetCollection = \
-              self._addSmearedJets(process, lastJetCollection, [ "smeared", jetCollection.value(), "ForNoPileUpPF%sMEt" % chsLabel ],
-                                   jetSmearFileName, jetSmearHistogram, varyByNsigmas,
-                                   uncertaintySequence = metUncertaintySequence, postfix = postfix)
-            jetCollectionResUp = \
-              self._addSmearedJets(process, lastJetCollection, [ "smeared", jetCollection.value(), "ForNoPileUpPF%sMEtResUp" % chsLabel ],
-                                   jetSmearFileName, jetSmearHistogram, varyByNsigmas, -1., 
-                                   uncertaintySequence = metUncertaintySequence, postfix = postfix)
-            collectionsToKeep.append(jetCollectionResUp)
-            jetCollectionResDown = \
-              self._addSmearedJets(process, lastJetCollection, [ "smeared", jetCollection.value(), "ForNoPileUpPF%sMEtResDown" % chsLabel ],
-                                   jetSmearFileName, jetSmearHistogram, varyByNsigmas, +1., 
-                                   uncertaintySequence = metUncertaintySequence, postfix = postfix)
-            collectionsToKeep.append(jetCollectionResDown)
+            if produceShiftsInOneModule:
+                # CV: produce smeared jets and jets with resolution shifted up/down in one module,
+                #     computing the jet resolution only once per jet
+                lastJetCollection = \
+                  self._addSmearedJets(process, lastJetCollection, [ "smeared", jetCollection.value(), "ForNoPileUpPF%sMEt" % chsLabel ],
+                                       jetSmearFileName, jetSmearHistogram, varyByNsigmas,
+                                       uncertaintySequence = metUncertaintySequence, postfix = postfix,
+                                       shifts = self._getJetResolutionShifts(varyByNsigmas))
+                jetCollectionResUp = "%s:ResUp" % lastJetCollection
+                jetCollectionResDown = "%s:ResDown" % lastJetCollection
+            else:
+                lastJetCollection = \
+                  self._addSmearedJets(process, lastJetCollection, [ "smeared", jetCollection.value(), "ForNoPileUpPF%sMEt" % chsLabel ],
+                                       jetSmearFileName, jetSmearHistogram, varyByNsigmas,
+                                       uncertaintySequence = metUncertaintySequence, postfix = postfix)
+                jetCollectionResUp = \
+                  self._addSmearedJets(process, lastJetCollection, [ "smeared", jetCollection.value(), "ForNoPileUpPF%sMEtResUp" % chsLabel ],
+                                       jetSmearFileName, jetSmearHistogram, varyByNsigmas, -1., 
+                                       uncertaintySequence = metUncertaintySequence, postfix = postfix)
+                collectionsToKeep.append(jetCollectionResUp)
+                jetCollectionResDown = \
+                  self._addSmearedJets(process, lastJetCollection, [ "smeared", jetCollection.value(), "ForNoPileUpPF%sMEtResDown" % chsLabel ],
+                                       jetSmearFileName, jetSmearHistogram, varyByNsigmas, +1., 
+                                       uncertaintySequence = metUncertaintySequence, postfix = postfix)
+                collectionsToKeep.append(jetCollectionResDown)
 
         collectionsToKeep.append(lastJetCollection)
 
@@ -550,7 +608,8 @@ class RunNoPileUpMEtUncertainties(JetMEtUncertaintyTools):
                                               jetCorrLabelUpToL3, jetCorrLabelUpToL3Res,
                                               jecUncertaintyFile, jecUncertaintyTag,
                                               varyByNsigmas,
-                                              "ForNoPileUpPF%sMEt%s" % (chsLabel, postfix))
+                                              "ForNoPileUpPF%sMEt%s" % (chsLabel, postfix),
+                                              produceShiftsInOneModule = produceShiftsInOneModule)
         setattr(process, "shiftedParticlesForNoPileUpPF%sMEtUncertainties%s" % (chsLabel, postfix), shiftedParticleSequence)    
         metUncertaintySequence += getattr(process, "shiftedParticlesForNoPileUpPF%sMEtUncertainties%s" % (chsLabel, postfix))
         collectionsToKeep.extend(addCollectionsToKeep)
@@ -566,8 +625,16 @@ class RunNoPileUpMEtUncertainties(JetMEtUncertaintyTools):
                                doSmearJets,
                                jecUncertaintyFile, jecUncertaintyTag,
                                varyByNsigmas,
-                               postfix)
+                               postfix,
+                               produceShiftsInOneModule = produceShiftsInOneModule)
         
+        # collect px, py and sumEt of all MET variations into one compact table
+        if makeMEtSystematicsTable or keepOnlyMEtSystematicsTable:
+            self._addMEtSystematicsTable(process, metUncertaintySequence,
+                                         "patPF%sMEtNoPileUpSystematicsTable" % chsLabel,
+                                         collectionsToKeep, keepOnlyMEtSystematicsTable,
+                                         postfix)
+
         # insert metUncertaintySequence into patDefaultSequence
         if addToPatDefaultSequence:
             if not hasattr(process, "patDefaultSequence"):
@@ -579,6 +646,6 @@ class RunNoPileUpMEtUncertainties(JetMEtUncertaintyTools):
         if outputModule is not None and hasattr(process, outputModule):
             getattr(process, outputModule).outputCommands = _addEventContent(
                 getattr(process, outputModule).outputCommands,
-                [ 'keep *_%s_*_%s' % (collectionToKeep, process.name_()) for collectionToKeep in collectionsToKeep ])
+                [ 'keep *_%s_*_%s' % (self._getModuleLabel(collectionToKeep), process.name_()) for collectionToKeep in collectionsToKeep ])
        
 runNoPileUpMEtUncertainties = RunNoPileUpMEtUncertainties()
@@ -161,6 +161,9 @@ class RunType1CaloMEtUncertainties(JetMEtUncertaintyTools):
                  jecUncertaintyFile      = None,
                  jecUncertaintyTag       = None,
                  varyByNsigmas           = None,
+                 produceShiftsInOneModule = None,
+                 makeMEtSystematicsTable = None,
+                 keepOnlyMEtSystematicsTable = None,
                  type1JetPtThreshold     = None,
                  addToPatDefaultSequence = None,
                  outputModule            = None,
@@ -180,6 +183,9 @@ class RunType1CaloMEtUncertainties(JetMEtUncertaintyTools):
             jecUncertaintyFile = jecUncertaintyFile,
             jecUncertaintyTag = jecUncertaintyTag,
             varyByNsigmas = varyByNsigmas,
+            produceShiftsInOneModule = produceShiftsInOneModule,
+            makeMEtSystematicsTable = makeMEtSystematicsTable,
+            keepOnlyMEtSystematicsTable = keepOnlyMEtSystematicsTable,
             addToPatDefaultSequence = addToPatDefaultSequence,
             outputModule = outputModule,
             postfix = postfix)
@@ -210,6 +216,9 @@ class RunType1CaloMEtUncertainties(JetMEtUncertaintyTools):
         jecUncertaintyFile = self._parameters['jecUncertaintyFile'].value
         jecUncertaintyTag = self._parameters['jecUncertaintyTag'].value
         varyByNsigmas = self._parameters['varyByNsigmas'].value
+        produceShiftsInOneModule = self._parameters['produceShiftsInOneModule'].value
+        makeMEtSystematicsTable = self._parameters['makeMEtSystematicsTable'].value
+        keepOnlyMEtSystematicsTable = self._parameters['keepOnlyMEtSystematicsTable'].value
         type1JetPtThreshold = self._parameters['type1JetPtThreshold'].value
         addToPatDefaultSequence = self._parameters['addToPatDefaultSequence'].value
         outputModule = self._parameters['outputModule'].value
@@ -256,7 +265,8 @@ class RunType1CaloMEtUncertainties(JetMEtUncertaintyTools):
                                               jetCorrLabelUpToL3, jetCorrLabelUpToL3Res,
                                               jecUncertaintyFile, jecUncertaintyTag,
                                               varyByNsigmas,
-                                              postfix)
+                                              postfix,
+                                              produceShiftsInOneModule = produceShiftsInOneModule)
         setattr(process, "shiftedParticlesForType1CaloMEtUncertainties" + postfix, shiftedParticleSequence)        
         metUncertaintySequence += getattr(process, "shiftedParticlesForType1CaloMEtUncertainties" + postfix)
         collectionsToKeep.extend(addCollectionsToKeep)
@@ -274,6 +284,13 @@ class RunType1CaloMEtUncertainties(JetMEtUncertaintyTools):
                              type1JetPtThreshold,
                              postfix)
         
+        # collect px, py and sumEt of all MET variations into one compact table
+        if makeMEtSystematicsTable or keepOnlyMEtSystematicsTable:
+            self._addMEtSystematicsTable(process, metUncertaintySequence,
+                                         "patType1CaloMEtSystematicsTable",
+                                         collectionsToKeep, keepOnlyMEtSystematicsTable,
+                                         postfix)
+
         # insert metUncertaintySequence into patDefaultSequence
         if addToPatDefaultSequence:
             if not hasattr(process, "patDefaultSequence"):
@@ -285,6 +302,6 @@ class RunType1CaloMEtUncertainties(JetMEtUncertaintyTools):
         if outputModule is not None and hasattr(process, outputModule):
             getattr(process, outputModule).outputCommands = _addEventContent(
                 getattr(process, outputModule).outputCommands,
-                [ 'keep *_%s_*_%s' % (collectionToKeep, process.name_()) for collectionToKeep in collectionsToKeep ])
+                [ 'keep *_%s_*_%s' % (self._getModuleLabel(collectionToKeep), process.name_()) for collectionToKeep in collectionsToKeep ])
        
 runType1CaloMEtUncertainties = RunType1CaloMEtUncertainties()
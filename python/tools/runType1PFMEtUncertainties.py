@@ -36,6 +36,8 @@ class RunType1PFMEtUncertainties(JetMEtUncertaintyTools):
                           "Input PFCandidate collection", Type=cms.InputTag)
         self.addParameter(self._defaultParameters, 'doApplyUnclEnergyCalibration', False,
                           "Flag to enable/disable usage of 'unclustered energy' calibration", Type=bool)
+        self.addParameter(self._defaultParameters, 'propagateShiftsToMEtDirectly', False,
+                          "Flag to compute MET shifts of electrons/photons, muons and tau-jets directly from the original collections, without producing (and keeping) the shifted collections", Type=bool)
         self._parameters = copy.deepcopy(self._defaultParameters)
         self._comment = ""
    
@@ -155,50 +157,26 @@ class RunType1PFMEtUncertainties(JetMEtUncertaintyTools):
             'patType1CorrectedPFMet' + postfix,
             'patType1p2CorrectedPFMet' + postfix])
 
-        setattr(process, "selectedPatJetsForMETtype1p2CorrEnUp" + postfix, 
-          getattr(process, shiftedParticleCollections['jetCollectionEnUpForCorrMEt']).clone(
-            src = cms.InputTag('selectedPatJetsForMETtype1p2Corr' + postfix)
-        ))
-        metUncertaintySequence += getattr(process, "selectedPatJetsForMETtype1p2CorrEnUp" + postfix)
-        setattr(process, "selectedPatJetsForMETtype1p2CorrEnDown" + postfix,
-          getattr(process, shiftedParticleCollections['jetCollectionEnDownForCorrMEt']).clone(
-            src = cms.InputTag('selectedPatJetsForMETtype1p2Corr' + postfix)
-        ))
-        metUncertaintySequence += getattr(process, "selectedPatJetsForMETtype1p2CorrEnDown" + postfix)
+        jetCollectionsForMETtype1p2CorrEnUp_Down = \
+          self._addShiftedJetCollectionsForSrc(
+            process, shiftedParticleCollections['jetCollectionEnUpForCorrMEt'], shiftedParticleCollections['jetCollectionEnDownForCorrMEt'],
+            'selectedPatJetsForMETtype1p2Corr', "En", metUncertaintySequence, postfix)
         if makeType1p2corrPFMEt:
-            setattr(process, "selectedPatJetsForMETtype2CorrEnUp" + postfix,
-              getattr(process, shiftedParticleCollections['jetCollectionEnUpForCorrMEt']).clone(
-                src = cms.InputTag('selectedPatJetsForMETtype2Corr' + postfix)
-            ))
-            metUncertaintySequence += getattr(process, "selectedPatJetsForMETtype2CorrEnUp" + postfix)
-            setattr(process, "selectedPatJetsForMETtype2CorrEnDown" + postfix,
-              getattr(process, shiftedParticleCollections['jetCollectionEnDownForCorrMEt']).clone(
-                src = cms.InputTag('selectedPatJetsForMETtype2Corr' + postfix)
-            ))
-            metUncertaintySequence += getattr(process, "selectedPatJetsForMETtype2CorrEnDown" + postfix)
+            jetCollectionsForMETtype2CorrEnUp_Down = \
+              self._addShiftedJetCollectionsForSrc(
+                process, shiftedParticleCollections['jetCollectionEnUpForCorrMEt'], shiftedParticleCollections['jetCollectionEnDownForCorrMEt'],
+                'selectedPatJetsForMETtype2Corr', "En", metUncertaintySequence, postfix)
 
         if doSmearJets:
-            setattr(process, "selectedPatJetsForMETtype1p2CorrResUp" + postfix,
-              getattr(process, shiftedParticleCollections['jetCollectionResUp']).clone(
-                src = cms.InputTag('selectedPatJetsForMETtype1p2Corr' + postfix)
-            ))
-            metUncertaintySequence += getattr(process, "selectedPatJetsForMETtype1p2CorrResUp" + postfix)
-            setattr(process, "selectedPatJetsForMETtype1p2CorrResDown" + postfix,
-              getattr(process, shiftedParticleCollections['jetCollectionResDown']).clone(
-                src = cms.InputTag('selectedPatJetsForMETtype1p2Corr' + postfix)
-            ))
-            metUncertaintySequence += getattr(process, "selectedPatJetsForMETtype1p2CorrResDown" + postfix)
-            if makeType1p2corrPFMEt:            
-                setattr(process, "selectedPatJetsForMETtype2CorrResUp" + postfix,
-                  getattr(process, shiftedParticleCollections['jetCollectionResUp']).clone(
-                    src = cms.InputTag('selectedPatJetsForMETtype2Corr' + postfix)
-                ))
-                metUncertaintySequence += getattr(process, "selectedPatJetsForMETtype2CorrResUp" + postfix)
-                setattr(process, "selectedPatJetsForMETtype2CorrResDown" + postfix,
-                  getattr(process, shiftedParticleCollections['jetCollectionResDown']).clone(
-                    src = cms.InputTag('selectedPatJetsForMETtype2Corr' + postfix)
-                ))
-                metUncertaintySequence += getattr(process, "selectedPatJetsForMETtype2CorrResDown" + postfix)
+            jetCollectionsForMETtype1p2CorrResUp_Down = \
+              self._addShiftedJetCollectionsForSrc(
+                process, shiftedParticleCollections['jetCollectionResUp'], shiftedParticleCollections['jetCollectionResDown'],
+                'selectedPatJetsForMETtype1p2Corr', "Res", metUncertaintySequence, postfix)
+            if makeType1p2corrPFMEt:
+                jetCollectionsForMETtype2CorrResUp_Down = \
+                  self._addShiftedJetCollectionsForSrc(
+                    process, shiftedParticleCollections['jetCollectionResUp'], shiftedParticleCollections['jetCollectionResDown'],
+                    'selectedPatJetsForMETtype2Corr', "Res", metUncertaintySequence, postfix)
 
         if doSmearJets:
             # apply MET smearing to "raw" (uncorrected) MET
@@ -243,20 +221,20 @@ class RunType1PFMEtUncertainties(JetMEtUncertaintyTools):
         # propagate shifts in jet energy to Type 1 + 2 corrected MET
         if makeType1p2corrPFMEt:   
             setattr(process, "patPFJetMETtype1p2CorrEnUp" + postfix, getattr(process, "patPFJetMETtype1p2Corr" + postfix).clone(
-                src = cms.InputTag(getattr(process, "selectedPatJetsForMETtype1p2CorrEnUp" + postfix).label()),
+                src = cms.InputTag(jetCollectionsForMETtype1p2CorrEnUp_Down[0]),
                 jetCorrLabel = cms.string(jetCorrLabel)
             ))
             metUncertaintySequence += getattr(process, "patPFJetMETtype1p2CorrEnUp" + postfix)
             setattr(process, "patPFJetMETtype1p2CorrEnDown" + postfix, getattr(process, "patPFJetMETtype1p2CorrEnUp" + postfix).clone(
-                src = cms.InputTag(getattr(process, "selectedPatJetsForMETtype1p2CorrEnDown" + postfix).label())
+                src = cms.InputTag(jetCollectionsForMETtype1p2CorrEnUp_Down[1])
             ))
             metUncertaintySequence += getattr(process, "patPFJetMETtype1p2CorrEnDown" + postfix)
             setattr(process, "patPFJetMETtype2CorrEnUp" + postfix, getattr(process, "patPFJetMETtype2Corr" + postfix).clone(
-                src = cms.InputTag('selectedPatJetsForMETtype2CorrEnUp' + postfix)
+                src = cms.InputTag(jetCollectionsForMETtype2CorrEnUp_Down[0])
             ))
             metUncertaintySequence += getattr(process, "patPFJetMETtype2CorrEnUp" + postfix)
             setattr(process, "patPFJetMETtype2CorrEnDown" + postfix,  getattr(process, "patPFJetMETtype2Corr" + postfix).clone(
-                src = cms.InputTag('selectedPatJetsForMETtype2CorrEnDown' + postfix)
+                src = cms.InputTag(jetCollectionsForMETtype2CorrEnUp_Down[1])
             ))
             metUncertaintySequence += getattr(process, "patPFJetMETtype2CorrEnDown" + postfix)
 
@@ -312,20 +290,20 @@ class RunType1PFMEtUncertainties(JetMEtUncertaintyTools):
             # propagate shifts in jet resolution to Type 1 + 2 corrected MET
             if makeType1p2corrPFMEt:  
                 setattr(process, "patPFJetMETtype1p2CorrResUp" + postfix, getattr(process, "patPFJetMETtype1p2Corr" + postfix).clone(
-                    src = cms.InputTag(getattr(process, "selectedPatJetsForMETtype1p2CorrResUp" + postfix).label()),
+                    src = cms.InputTag(jetCollectionsForMETtype1p2CorrResUp_Down[0]),
                     jetCorrLabel = cms.string(jetCorrLabel)
                 ))
                 metUncertaintySequence += getattr(process, "patPFJetMETtype1p2CorrResUp" + postfix)
                 setattr(process, "patPFJetMETtype1p2CorrResDown" + postfix, getattr(process, "patPFJetMETtype1p2CorrResUp" + postfix).clone(
-                    src = cms.InputTag(getattr(process, "selectedPatJetsForMETtype1p2CorrResDown" + postfix).label())
+                    src = cms.InputTag(jetCollectionsForMETtype1p2CorrResUp_Down[1])
                 ))
                 metUncertaintySequence += getattr(process, "patPFJetMETtype1p2CorrResDown" + postfix)
                 setattr(process, "patPFJetMETtype2CorrResUp" + postfix, getattr(process, "patPFJetMETtype2Corr" + postfix).clone(
-                    src = cms.InputTag('selectedPatJetsForMETtype2CorrResUp' + postfix)
+                    src = cms.InputTag(jetCollectionsForMETtype2CorrResUp_Down[0])
                 ))
                 metUncertaintySequence += getattr(process, "patPFJetMETtype2CorrResUp" + postfix)
                 setattr(process, "patPFJetMETtype2CorrResDown" + postfix, getattr(process, "patPFJetMETtype2Corr" + postfix).clone(
-                    src = cms.InputTag('selectedPatJetsForMETtype2CorrResDown' + postfix)
+                    src = cms.InputTag(jetCollectionsForMETtype2CorrResUp_Down[1])
                 ))
                 metUncertaintySequence += getattr(process, "patPFJetMETtype2CorrResDown" + postfix)
 
@@ -379,12 +357,23 @@ class RunType1PFMEtUncertainties(JetMEtUncertaintyTools):
         unclEnMETcorrectionsUp = []
         unclEnMETcorrectionsDown = []
         for srcUnclEnMETcorr in unclEnMETcorrections:
-            moduleUnclEnMETcorrUp = cms.EDProducer("ShiftedMETcorrInputProducer",
+            # CV: produce up and down shifts in one module,
+            #     shifted MET corrections are stored with instance label = instance label of original MET correction + 'Up'/'Down'
+            moduleUnclEnMETcorr = cms.EDProducer("ShiftedMETcorrInputProducer",
                 src = cms.VInputTag(
                     [ cms.InputTag(srcUnclEnMETcorr[0], instanceLabel) for instanceLabel in srcUnclEnMETcorr[1] ]
                 ),
                 uncertainty = cms.double(0.10),
-                shiftBy = cms.double(+1.*varyByNsigmas)
+                shifts = cms.VPSet(
+                    cms.PSet(
+                        instanceLabel = cms.string('Up'),
+                        shiftBy = cms.double(+1.*varyByNsigmas)
+                    ),
+                    cms.PSet(
+                        instanceLabel = cms.string('Down'),
+                        shiftBy = cms.double(-1.*varyByNsigmas)
+                    )
+                )
             )
             baseName = srcUnclEnMETcorr[0]
             if postfix != "":
@@ -392,18 +381,12 @@ class RunType1PFMEtUncertainties(JetMEtUncertaintyTools):
                     baseName = baseName[0:-len(postfix)]
                 else:
                     raise StandardError("Tried to remove postfix %s from label %s, but it wasn't there" % (postfix, baseName))
-            moduleUnclEnMETcorrUpName = "%sUnclusteredEnUp%s" % (baseName, postfix)
-            setattr(process, moduleUnclEnMETcorrUpName, moduleUnclEnMETcorrUp)
-            metUncertaintySequence += moduleUnclEnMETcorrUp
-            unclEnMETcorrectionsUp.extend([ cms.InputTag(moduleUnclEnMETcorrUpName, instanceLabel)
+            moduleUnclEnMETcorrName = "%sUnclusteredEn%s" % (baseName, postfix)
+            setattr(process, moduleUnclEnMETcorrName, moduleUnclEnMETcorr)
+            metUncertaintySequence += moduleUnclEnMETcorr
+            unclEnMETcorrectionsUp.extend([ cms.InputTag(moduleUnclEnMETcorrName, instanceLabel + 'Up')
                                             for instanceLabel in srcUnclEnMETcorr[1] ] )
-            moduleUnclEnMETcorrDown = moduleUnclEnMETcorrUp.clone(
-                shiftBy = cms.double(-1.*varyByNsigmas)
-            )
-            moduleUnclEnMETcorrDownName = "%sUnclusteredEnDown%s" % (baseName, postfix)
-            setattr(process, moduleUnclEnMETcorrDownName, moduleUnclEnMETcorrDown)
-            metUncertaintySequence += moduleUnclEnMETcorrDown
-            unclEnMETcorrectionsDown.extend([ cms.InputTag(moduleUnclEnMETcorrDownName, instanceLabel)
+            unclEnMETcorrectionsDown.extend([ cms.InputTag(moduleUnclEnMETcorrName, instanceLabel + 'Down')
                                               for instanceLabel in srcUnclEnMETcorr[1] ] )
 
         # propagate shifts in jet energy/resolution to "raw" (uncorrected) MET    
@@ -442,13 +425,13 @@ class RunType1PFMEtUncertainties(JetMEtUncertaintyTools):
             setattr(process, "patType1p2CorrectedPFMetUnclusteredEnUp" + postfix, getattr(process, "patType1p2CorrectedPFMet" + postfix).clone(
                 srcUnclEnergySums = cms.VInputTag(
                     cms.InputTag('patPFJetMETtype1p2Corr' + postfix,                'type2' ),
-                    cms.InputTag('patPFJetMETtype1p2CorrUnclusteredEnUp' + postfix, 'type2' ),
+                    cms.InputTag('patPFJetMETtype1p2CorrUnclusteredEn' + postfix,   'type2Up' ),
                     cms.InputTag('patPFJetMETtype2Corr' + postfix,                  'type2' ),   
-                    cms.InputTag('patPFJetMETtype2CorrUnclusteredEnUp' + postfix,   'type2' ),
+                    cms.InputTag('patPFJetMETtype2CorrUnclusteredEn' + postfix,     'type2Up' ),
                     cms.InputTag('patPFJetMETtype1p2Corr' + postfix,                'offset'),
-                    cms.InputTag('patPFJetMETtype1p2CorrUnclusteredEnUp' + postfix, 'offset'),
+                    cms.InputTag('patPFJetMETtype1p2CorrUnclusteredEn' + postfix,   'offsetUp'),
                     cms.InputTag('pfCandMETcorr' + postfix),
-                    cms.InputTag('pfCandMETcorrUnclusteredEnUp' + postfix)
+                    cms.InputTag('pfCandMETcorrUnclusteredEn' + postfix, 'Up')
                 )
             ))
             metUncertaintySequence += getattr(process, "patType1p2CorrectedPFMetUnclusteredEnUp" + postfix)
@@ -456,13 +439,13 @@ class RunType1PFMEtUncertainties(JetMEtUncertaintyTools):
             setattr(process, "patType1p2CorrectedPFMetUnclusteredEnDown" + postfix, getattr(process, "patType1p2CorrectedPFMetUnclusteredEnUp" + postfix).clone(
                 srcUnclEnergySums = cms.VInputTag(
                     cms.InputTag('patPFJetMETtype1p2Corr' + postfix,                  'type2' ),
-                    cms.InputTag('patPFJetMETtype1p2CorrUnclusteredEnDown' + postfix, 'type2' ),
+                    cms.InputTag('patPFJetMETtype1p2CorrUnclusteredEn' + postfix,     'type2Down' ),
                     cms.InputTag('patPFJetMETtype2Corr' + postfix,                    'type2' ),  
-                    cms.InputTag('patPFJetMETtype2CorrUnclusteredEnDown' + postfix,   'type2' ),
+                    cms.InputTag('patPFJetMETtype2CorrUnclusteredEn' + postfix,       'type2Down' ),
                     cms.InputTag('patPFJetMETtype1p2Corr' + postfix,                  'offset'),
-                    cms.InputTag('patPFJetMETtype1p2CorrUnclusteredEnDown' + postfix, 'offset'),
+                    cms.InputTag('patPFJetMETtype1p2CorrUnclusteredEn' + postfix,     'offsetDown'),
                     cms.InputTag('pfCandMETcorr' + postfix),
-                    cms.InputTag('pfCandMETcorrUnclusteredEnDown' + postfix)
+                    cms.InputTag('pfCandMETcorrUnclusteredEn' + postfix, 'Down')
                 )
             ))
             metUncertaintySequence += getattr(process, "patType1p2CorrectedPFMetUnclusteredEnDown" + postfix)
@@ -483,7 +466,8 @@ class RunType1PFMEtUncertainties(JetMEtUncertaintyTools):
                     self._propagateMEtUncertainties(
                       process, shiftedParticleCollections['electronCollection'].value(), "Electron", "En",
                       shiftedParticleCollections['electronCollectionEnUp'], shiftedParticleCollections['electronCollectionEnDown'],
-                      metProducer, "PF", metUncertaintySequence, postfix)
+                      metProducer, "PF", metUncertaintySequence, postfix,
+                      srcMETcorr = shiftedParticleCollections.get('electronCollectionMETcorrEn'))
                 collectionsToKeep.extend(metCollectionsUp_Down)
 
             if self._isValidInputTag(shiftedParticleCollections['photonCollection']):
@@ -491,7 +475,8 @@ class RunType1PFMEtUncertainties(JetMEtUncertaintyTools):
                     self._propagateMEtUncertainties(
                       process, shiftedParticleCollections['photonCollection'].value(), "Photon", "En",
                       shiftedParticleCollections['photonCollectionEnUp'], shiftedParticleCollections['photonCollectionEnDown'],
-                      metProducer, "PF", metUncertaintySequence, postfix)
+                      metProducer, "PF", metUncertaintySequence, postfix,
+                      srcMETcorr = shiftedParticleCollections.get('photonCollectionMETcorrEn'))
                 collectionsToKeep.extend(metCollectionsUp_Down)
                 
             if self._isValidInputTag(shiftedParticleCollections['muonCollection']):
@@ -499,7 +484,8 @@ class RunType1PFMEtUncertainties(JetMEtUncertaintyTools):
                     self._propagateMEtUncertainties(
                       process, shiftedParticleCollections['muonCollection'].value(), "Muon", "En",
                       shiftedParticleCollections['muonCollectionEnUp'], shiftedParticleCollections['muonCollectionEnDown'],
-                      metProducer, "PF", metUncertaintySequence, postfix)
+                      metProducer, "PF", metUncertaintySequence, postfix,
+                      srcMETcorr = shiftedParticleCollections.get('muonCollectionMETcorrEn'))
                 collectionsToKeep.extend(metCollectionsUp_Down)
 
             if self._isValidInputTag(shiftedParticleCollections['tauCollection']):
@@ -507,9 +493,87 @@ class RunType1PFMEtUncertainties(JetMEtUncertaintyTools):
                     self._propagateMEtUncertainties(
                       process, shiftedParticleCollections['tauCollection'].value(), "Tau", "En",
                       shiftedParticleCollections['tauCollectionEnUp'], shiftedParticleCollections['tauCollectionEnDown'],
-                      metProducer, "PF", metUncertaintySequence, postfix)
+                      metProducer, "PF", metUncertaintySequence, postfix,
+                      srcMETcorr = shiftedParticleCollections.get('tauCollectionMETcorrEn'))
                 collectionsToKeep.extend(metCollectionsUp_Down)
 
+    def _addCorrPFMEtForSystematics(self, process, metUncertaintySequence,
+                                    collectionsToKeep,
+                                    makeType1p2corrPFMEt,
+                                    postfix):
+
+        # replace the CorrectedPATMETProducer modules of all systematic variations of a MET type
+        # by one CorrectedPATMETProducerForSystematics module, producing the shifted MET collections with different instance labels
+        metLabels = [ 'patPFMet', 'patType1CorrectedPFMet' ]
+        if makeType1p2corrPFMEt:
+            metLabels.append('patType1p2CorrectedPFMet')
+        for metLabel in metLabels:
+            if not hasattr(process, metLabel + postfix):
+                continue
+            metProducer = getattr(process, metLabel + postfix)
+            isCorrectedMEt = (metProducer.type_() == "CorrectedPATMETProducer")
+            src = cms.InputTag(metLabel + postfix)
+            if isCorrectedMEt:
+                src = metProducer.src
+            corrections = []
+            variationNames = []
+            for particleType, shiftType in [ [ 'Jet',         'En'  ],
+                                             [ 'Jet',         'Res' ],
+                                             [ 'Electron',    'En'  ],
+                                             [ 'Photon',      'En'  ],
+                                             [ 'Muon',        'En'  ],
+                                             [ 'Tau',         'En'  ],
+                                             [ 'Unclustered', 'En'  ] ]:
+                for shiftDirection in [ 'Up', 'Down' ]:
+                    instanceLabel = "%s%s%s" % (particleType, shiftType, shiftDirection)
+                    variationName = "%s%s%s" % (metLabel, instanceLabel, postfix)
+                    if not (variationName in collectionsToKeep and hasattr(process, variationName)):
+                        continue
+                    variation = getattr(process, variationName)
+                    if variation.type_() != "CorrectedPATMETProducer":
+                        continue
+                    applyType2Corrections = hasattr(variation, "applyType2Corrections") and variation.applyType2Corrections.value()
+                    srcType1Corrections = None
+                    type2Corrections = None
+                    if variation.src.value() == src.value():
+                        srcType1Corrections = list(variation.srcType1Corrections)
+                        type2Corrections = variation
+                    elif isCorrectedMEt and variation.src.value() == metLabel + postfix and \
+                         not (metProducer.applyType2Corrections.value() and applyType2Corrections):
+                        # CV: shift is applied on top of corrected MET;
+                        #     add MET corrections of "nominal" (unshifted) MET, as the corrections are computed independently of the MET they are applied to
+                        srcType1Corrections = list(metProducer.srcType1Corrections) + list(variation.srcType1Corrections)
+                        type2Corrections = metProducer
+                        if applyType2Corrections:
+                            type2Corrections = variation
+                    else:
+                        continue
+                    correction = cms.PSet(
+                        instanceLabel = cms.string(instanceLabel),
+                        applyType1Corrections = cms.bool(True),
+                        srcType1Corrections = cms.VInputTag(srcType1Corrections)
+                    )
+                    for parameterName in [ 'applyType2Corrections', 'srcUnclEnergySums', 'type2CorrFormula', 'type2CorrParameter' ]:
+                        if hasattr(type2Corrections, parameterName):
+                            setattr(correction, parameterName, copy.deepcopy(getattr(type2Corrections, parameterName)))
+                    corrections.append(correction)
+                    variationNames.append(variationName)
+            if len(corrections) == 0:
+                continue
+            module = cms.EDProducer("CorrectedPATMETProducerForSystematics",
+                src = src,
+                corrections = cms.VPSet(corrections)
+            )
+            moduleName = "%sSystematics%s" % (metLabel, postfix)
+            setattr(process, moduleName, module)
+            for variationName, correction in zip(variationNames, corrections):
+                metUncertaintySequence.remove(getattr(process, variationName))
+                delattr(process, variationName)
+                collectionsToKeep[:] = [ collectionToKeep if collectionToKeep != variationName else \
+                                           "%s:%s" % (moduleName, correction.instanceLabel.value())
+                                         for collectionToKeep in collectionsToKeep ]
+            metUncertaintySequence += module
+
     def __call__(self, process,
                  electronCollection           = None,
                  photonCollection             = None,
@@ -528,12 +592,16 @@ class RunType1PFMEtUncertainties(JetMEtUncertaintyTools):
                  jetSmearHistogram            = None,
                  pfCandCollection             = None,
                  doApplyUnclEnergyCalibration = None,
+                 propagateShiftsToMEtDirectly = None,
+                 makeMEtSystematicsTable      = None,
+                 keepOnlyMEtSystematicsTable  = None,
                  jetCorrPayloadName           = None,
                  jetCorrLabelUpToL3           = None,
                  jetCorrLabelUpToL3Res        = None,
                  jecUncertaintyFile           = None,
                  jecUncertaintyTag            = None,
                  varyByNsigmas                = None,
+                 produceShiftsInOneModule     = None,
                  addToPatDefaultSequence      = None,
                  outputModule                 = None,
                  postfix                      = None):
@@ -554,6 +622,9 @@ class RunType1PFMEtUncertainties(JetMEtUncertaintyTools):
             jecUncertaintyFile = jecUncertaintyFile,
             jecUncertaintyTag = jecUncertaintyTag,
             varyByNsigmas = varyByNsigmas,
+            produceShiftsInOneModule = produceShiftsInOneModule,
+            makeMEtSystematicsTable = makeMEtSystematicsTable,
+            keepOnlyMEtSystematicsTable = keepOnlyMEtSystematicsTable,
             addToPatDefaultSequence = addToPatDefaultSequence,
             outputModule = outputModule,
             postfix = postfix)
@@ -576,6 +647,8 @@ class RunType1PFMEtUncertainties(JetMEtUncertaintyTools):
         pfCandCollection = self._initializeInputTag(pfCandCollection, 'pfCandCollection')
         if doApplyUnclEnergyCalibration is None:
             doApplyUnclEnergyCalibration = self._defaultParameters['doApplyUnclEnergyCalibration'].value
+        if propagateShiftsToMEtDirectly is None:
+            propagateShiftsToMEtDirectly = self._defaultParameters['propagateShiftsToMEtDirectly'].value
 
         self.setParameter('dRjetCleaning', dRjetCleaning)
         self.setParameter('makeType1corrPFMEt', makeType1corrPFMEt)
@@ -585,6 +658,7 @@ class RunType1PFMEtUncertainties(JetMEtUncertaintyTools):
         self.setParameter('sysShiftCorrParameter', sysShiftCorrParameter)
         self.setParameter('pfCandCollection', pfCandCollection)
         self.setParameter('doApplyUnclEnergyCalibration', doApplyUnclEnergyCalibration)
+        self.setParameter('propagateShiftsToMEtDirectly', propagateShiftsToMEtDirectly)
   
         self.apply(process) 
         
@@ -606,12 +680,16 @@ class RunType1PFMEtUncertainties(JetMEtUncertaintyTools):
         jetSmearHistogram = self._parameters['jetSmearHistogram'].value
         pfCandCollection = self._parameters['pfCandCollection'].value
         doApplyUnclEnergyCalibration = self._parameters['doApplyUnclEnergyCalibration'].value
+        propagateShiftsToMEtDirectly = self._parameters['propagateShiftsToMEtDirectly'].value
+        makeMEtSystematicsTable = self._parameters['makeMEtSystematicsTable'].value
+        keepOnlyMEtSystematicsTable = self._parameters['keepOnlyMEtSystematicsTable'].value
         jetCorrPayloadName = self._parameters['jetCorrPayloadName'].value
         jetCorrLabelUpToL3 = self._parameters['jetCorrLabelUpToL3'].value
         jetCorrLabelUpToL3Res = self._parameters['jetCorrLabelUpToL3Res'].value
         jecUncertaintyFile = self._parameters['jecUncertaintyFile'].value
         jecUncertaintyTag = self._parameters['jecUncertaintyTag'].value
         varyByNsigmas = self._parameters['varyByNsigmas'].value
+        produceShiftsInOneModule = self._parameters['produceShiftsInOneModule'].value
         addToPatDefaultSequence = self._parameters['addToPatDefaultSequence'].value
         outputModule = self._parameters['outputModule'].value
         postfix = self._parameters['postfix'].value
@@ -635,21 +713,32 @@ class RunType1PFMEtUncertainties(JetMEtUncertaintyTools):
         jetCollectionResUp = None
         jetCollectionResDown = None
         if doSmearJets:
-            lastJetCollection = \
-              self._addSmearedJets(process, cleanedJetCollection, [ "smeared", jetCollection.value() ],
-                                   jetSmearFileName, jetSmearHistogram, varyByNsigmas,
-                                   uncertaintySequence = metUncertaintySequence, postfix = postfix)
+            if produceShiftsInOneModule:
+                # CV: produce smeared jets and jets with resolution shifted up/down in one module,
+                #     computing the jet resolution only once per jet
+                lastJetCollection = \
+                  self._addSmearedJets(process, cleanedJetCollection, [ "smeared", jetCollection.value() ],
+                                       jetSmearFileName, jetSmearHistogram, varyByNsigmas,
+                                       uncertaintySequence = metUncertaintySequence, postfix = postfix,
+                                       shifts = self._getJetResolutionShifts(varyByNsigmas))
+                jetCollectionResUp = "%s:ResUp" % lastJetCollection
+                jetCollectionResDown = "%s:ResDown" % lastJetCollection
+            else:
+                lastJetCollection = \
+                  self._addSmearedJets(process, cleanedJetCollection, [ "smeared", jetCollection.value() ],
+                                       jetSmearFileName, jetSmearHistogram, varyByNsigmas,
+                                       uncertaintySequence = metUncertaintySequence, postfix = postfix)
                 
-            jetCollectionResUp = \
-              self._addSmearedJets(process, cleanedJetCollection, [ "smeared", jetCollection.value(), "ResUp" ],
-                                   jetSmearFileName, jetSmearHistogram, varyByNsigmas, -1., 
-                                   uncertaintySequence = metUncertaintySequence, postfix = postfix)
-            collectionsToKeep.append(jetCollectionResUp)
-            jetCollectionResDown = \
-              self._addSmearedJets(process, cleanedJetCollection, [ "smeared", jetCollection.value(), "ResDown" ],
-                                   jetSmearFileName, jetSmearHistogram, varyByNsigmas, +1., 
-                                   uncertaintySequence = metUncertaintySequence, postfix = postfix)
-            collectionsToKeep.append(jetCollectionResDown)
+                jetCollectionResUp = \
+                  self._addSmearedJets(process, cleanedJetCollection, [ "smeared", jetCollection.value(), "ResUp" ],
+                                       jetSmearFileName, jetSmearHistogram, varyByNsigmas, -1., 
+                                       uncertaintySequence = metUncertaintySequence, postfix = postfix)
+                collectionsToKeep.append(jetCollectionResUp)
+                jetCollectionResDown = \
+                  self._addSmearedJets(process, cleanedJetCollection, [ "smeared", jetCollection.value(), "ResDown" ],
+                                       jetSmearFileName, jetSmearHistogram, varyByNsigmas, +1., 
+                                       uncertaintySequence = metUncertaintySequence, postfix = postfix)
+                collectionsToKeep.append(jetCollectionResDown)
 
         collectionsToKeep.append(lastJetCollection)
 
@@ -669,7 +758,9 @@ class RunType1PFMEtUncertainties(JetMEtUncertaintyTools):
                                               jetCorrLabelUpToL3, jetCorrLabelUpToL3Res,
                                               jecUncertaintyFile, jecUncertaintyTag,
                                               varyByNsigmas,
-                                              postfix)
+                                              postfix,
+                                              produceShiftsInOneModule = produceShiftsInOneModule,
+                                              propagateShiftsToMEtDirectly = propagateShiftsToMEtDirectly)
         setattr(process, "shiftedParticlesForType1PFMEtUncertainties" + postfix, shiftedParticleSequence)        
         metUncertaintySequence += getattr(process, "shiftedParticlesForType1PFMEtUncertainties" + postfix)
         collectionsToKeep.extend(addCollectionsToKeep)
@@ -690,6 +781,18 @@ class RunType1PFMEtUncertainties(JetMEtUncertaintyTools):
                            jetCorrLabel,
                            varyByNsigmas,
                            postfix)
+        if produceShiftsInOneModule:
+            self._addCorrPFMEtForSystematics(process, metUncertaintySequence,
+                                             collectionsToKeep,
+                                             makeType1p2corrPFMEt,
+                                             postfix)
+
+        # collect px, py and sumEt of all MET variations into one compact table
+        if makeMEtSystematicsTable or keepOnlyMEtSystematicsTable:
+            self._addMEtSystematicsTable(process, metUncertaintySequence,
+                                         "patType1PFMEtSystematicsTable",
+                                         collectionsToKeep, keepOnlyMEtSystematicsTable,
+                                         postfix)
         
         # insert metUncertaintySequence into patDefaultSequence
         if addToPatDefaultSequence:
@@ -702,6 +805,6 @@ class RunType1PFMEtUncertainties(JetMEtUncertaintyTools):
         if outputModule is not None and hasattr(process, outputModule):
             getattr(process, outputModule).outputCommands = _addEventContent(
                 getattr(process, outputModule).outputCommands,
-                [ 'keep *_%s_*_%s' % (collectionToKeep, process.name_()) for collectionToKeep in collectionsToKeep ])
+                [ 'keep *_%s_*_%s' % (self._getModuleLabel(collectionToKeep), process.name_()) for collectionToKeep in collectionsToKeep ])
        
 runType1PFMEtUncertainties = RunType1PFMEtUncertainties()
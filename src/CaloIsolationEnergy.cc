@@ -11,6 +11,7 @@
 #include "DataFormats/PatCandidates/interface/Muon.h"
 #include "DataFormats/GsfTrackReco/interface/GsfTrack.h"
 #include <vector>
+#include <algorithm>
 
 using namespace pat;
 
@@ -24,38 +25,64 @@ CaloIsolationEnergy::~CaloIsolationEnergy() {
 
 /// calculate the CalIsoE from the lepton object
 float CaloIsolationEnergy::calculate(const Electron & theElectron, const std::vector<CaloTower> & theTowers, float isoConeElectron) const {
-  float isoE = this->calculate(*theElectron.gsfTrack(), theElectron.energy(), theTowers, isoConeElectron);
+  float isoE = this->calculate(*theElectron.gsfTrack(), theElectron.energy(), theTowers, 0, isoConeElectron);
   return isoE - theElectron.caloEnergy();
 }
 float CaloIsolationEnergy::calculate(const Muon & theMuon, const std::vector<CaloTower> & theTowers, float isoConeMuon) const {
-  return this->calculate(*theMuon.track(), theMuon.energy(), theTowers, isoConeMuon);
+  return this->calculate(*theMuon.track(), theMuon.energy(), theTowers, 0, isoConeMuon);
+}
+
+/// calculate the CalIsoE from the lepton object, using an eta-phi index of the towers
+float CaloIsolationEnergy::calculate(const Electron & theElectron, const std::vector<CaloTower> & theTowers, const helper::EtaPhiGrid & towerIndex, float isoConeElectron) const {
+  float isoE = this->calculate(*theElectron.gsfTrack(), theElectron.energy(), theTowers, &towerIndex, isoConeElectron);
+  return isoE - theElectron.caloEnergy();
+}
+float CaloIsolationEnergy::calculate(const Muon & theMuon, const std::vector<CaloTower> & theTowers, const helper::EtaPhiGrid & towerIndex, float isoConeMuon) const {
+  return this->calculate(*theMuon.track(), theMuon.energy(), theTowers, &towerIndex, isoConeMuon);
+}
+
+
+/// build the eta-phi index of the towers
+void CaloIsolationEnergy::buildTowerIndex(const std::vector<CaloTower> & theTowers, float maxIsoCone, helper::EtaPhiGrid & towerIndex) {
+  std::vector<double> etas, phis;
+  etas.reserve(theTowers.size());
+  phis.reserve(theTowers.size());
+  for (std::vector<CaloTower>::const_iterator itTower = theTowers.begin(); itTower != theTowers.end(); itTower++) {
+    etas.push_back(itTower->eta());
+    phis.push_back(itTower->phi());
+  }
+  towerIndex.build(etas, phis, maxIsoCone);
 }
 
 
 /// calculate the CalIsoE from the lepton's track
-float CaloIsolationEnergy::calculate(const reco::Track & theTrack, const float leptonEnergy, const std::vector<CaloTower> & theTowers, float isoCone) const {
+float CaloIsolationEnergy::calculate(const reco::Track & theTrack, const float leptonEnergy, const std::vector<CaloTower> & theTowers, const helper::EtaPhiGrid * towerIndex, float isoCone) const {
   float isoELepton = 0;
+  float isoCone2 = isoCone*isoCone;
+  float trackEta = theTrack.eta();
+  float trackPhi = theTrack.phi();
+  // select towers: all towers or, if an index valid for the isolation cone is given, the towers close to the track
+  // (visited in the order of the collection, so that the sum is the same in both cases)
+  std::vector<unsigned> closeTowers;
+  bool useIndex = (towerIndex && isoCone <= towerIndex->cellSize());
+  if (useIndex) {
+    towerIndex->findNeighbours(trackEta, trackPhi, closeTowers);
+    std::sort(closeTowers.begin(), closeTowers.end());
+  }
+  size_t numTowers = (useIndex) ? closeTowers.size() : theTowers.size();
   // calculate iso energy
-  //const CaloTower * closestTower = 0;
-  float closestDR = 10000;
-  for (std::vector<CaloTower>::const_iterator itTower = theTowers.begin(); itTower != theTowers.end(); itTower++) {
+  for (size_t iTower = 0; iTower < numTowers; ++iTower) {
+    const CaloTower & tower = theTowers[(useIndex) ? closeTowers[iTower] : iTower];
     // calculate dPhi with correct sign
-    float dPhi = theTrack.phi() - itTower->phi();
+    float dPhi = trackPhi - tower.phi();
     if (dPhi > M_PI)  dPhi = -2*M_PI + dPhi;
     if (dPhi < -M_PI) dPhi =  2*M_PI + dPhi;
-    // calculate dR
-    float dR = sqrt(std::pow(theTrack.eta()-itTower->eta(), 2) + std::pow(dPhi, 2));
+    float dEta = trackEta - tower.eta();
     // calculate energy in cone around direction at vertex of the track
-    if (dR < isoCone) {
-      isoELepton += itTower->energy();
-      if (dR < closestDR) {
-        closestDR = dR;
-        //closestTower = &(*itTower);
-      }
+    if ((dEta*dEta + dPhi*dPhi) < isoCone2) {
+      isoELepton += tower.energy();
     }
   }
-  // subtract track deposits from total energy in cone
-//  if (closestTower) isoELepton -= closestTower->energy();
   // return the iso energy
   return isoELepton;
 }
@@ -0,0 +1,55 @@
+#include "PhysicsTools/PatUtils/interface/DRmaxGenJetMatchFormula.h"
+
+#include <TString.h>
+
+#include <stdio.h>
+
+namespace
+{
+  std::string removeWhitespace(const std::string& formula)
+  {
+    std::string retVal;
+    for ( std::string::const_iterator c = formula.begin();
+	  c != formula.end(); ++c ) {
+      if ( !((*c) == ' ' || (*c) == '\t' || (*c) == '\n' || (*c) == '\r') ) retVal += (*c);
+    }
+    return retVal;
+  }
+}
+
+DRmaxGenJetMatchFormula::DRmaxGenJetMatchFormula(const std::string& formula)
+  : isNative_(false),
+    a_(0.), b_(0.), c_(0.), d_(0.), e_(0.),
+    formula_(0)
+{
+  TString formula_tstring = formula.data();
+  formula_tstring.ReplaceAll("genJetPt", "x");
+  formula_ = new TFormula("dRmaxGenJetMatch", formula_tstring.Data());
+
+//--- check if formula is of the standard form
+  std::string formula_stripped = removeWhitespace(formula);
+  int numCharsParsed = -1;
+  if ( sscanf(formula_stripped.data(), "TMath::Min(%lf,%lf+%lf*TMath::Exp(-%lf*(genJetPt-%lf)))%n",
+	      &a_, &b_, &c_, &d_, &e_, &numCharsParsed) == 5 && numCharsParsed == (int)formula_stripped.length() ) {
+    isNative_ = true;
+
+    // CV: cross-check native code against TFormula, to protect against parsing errors
+    const double genJetPtValues[] = { 0., 5., 10., 15., 20., 30., 50., 100., 250., 1000. };
+    const size_t numGenJetPtValues = sizeof(genJetPtValues)/sizeof(double);
+    for ( size_t iGenJetPt = 0; iGenJetPt < numGenJetPtValues && isNative_; ++iGenJetPt ) {
+      double dRmax_native = (*this)(genJetPtValues[iGenJetPt]);
+      double dRmax_formula = formula_->Eval(genJetPtValues[iGenJetPt]);
+      if ( TMath::Abs(dRmax_native - dRmax_formula) > 1.e-6*TMath::Max(1., TMath::Abs(dRmax_formula)) ) isNative_ = false;
+    }
+  }
+
+  if ( isNative_ ) {
+    delete formula_;
+    formula_ = 0;
+  }
+}
+
+DRmaxGenJetMatchFormula::~DRmaxGenJetMatchFormula()
+{
+  delete formula_;
+}
@@ -0,0 +1,200 @@
+#include "PhysicsTools/PatUtils/interface/JetCorrUncertaintyTable.h"
+
+#include "FWCore/Utilities/interface/Exception.h"
+
+#include "PhysicsTools/PatUtils/interface/SharedInstance.h"
+
+#include <algorithm>
+#include <map>
+#include <cmath>
+
+namespace
+{
+  // CV: maximum number of cells per eta bin
+  //    (protects against excessive memory consumption in case of very narrow eta bins)
+  const unsigned maxCellsPerBin = 16;
+
+  struct tableFactory
+  {
+    tableFactory(const JetCorrectorParametersReader& reader, const std::string& section)
+      : reader_(reader),
+	section_(section)
+    {}
+    const JetCorrUncertaintyTable* operator()() const { return new JetCorrUncertaintyTable(reader_.parameters(section_)); }
+    const JetCorrectorParametersReader& reader_;
+    const std::string& section_;
+  };
+
+  void addSegments(const std::vector<float>& ptNodes, const std::vector<float>& values,
+		   std::vector<float>& slopes, std::vector<float>& intercepts)
+  {
+    // CV: compute slope and intercept exactly as in SimpleJetCorrectionUncertainty::linearInterpolation
+    size_t numNodes = ptNodes.size();
+    for ( size_t iNode = 0; iNode < numNodes; ++iNode ) {
+      float a = 0.;
+      float b = values[iNode];
+      if ( (iNode + 1) < numNodes && ptNodes[iNode] != ptNodes[iNode + 1] ) {
+	float x0 = ptNodes[iNode];
+	float x1 = ptNodes[iNode + 1];
+	float y0 = values[iNode];
+	float y1 = values[iNode + 1];
+	a = (y1 - y0)/(x1 - x0);
+	b = (y0*x1 - y1*x0)/(x1 - x0);
+      }
+      slopes.push_back(a);
+      intercepts.push_back(b);
+    }
+  }
+}
+
+JetCorrUncertaintyTable::JetCorrUncertaintyTable(const JetCorrectorParameters& jetCorrParameters)
+  : cellEtaMin_(0.),
+    cellEtaMax_(0.),
+    cellWidth_(1.),
+    numCells_(0)
+{
+  const JetCorrectorParameters::Definitions& definitions = jetCorrParameters.definitions();
+  if ( !(definitions.nBinVar() == 1 && definitions.binVar(0) == "JetEta" &&
+	 definitions.nParVar() == 1 && definitions.parVar(0) == "JetPt") )
+    throw cms::Exception("JetCorrUncertaintyTable")
+      << " Only payloads binned in JetEta and parametrized in JetPt are supported !!\n";
+
+  unsigned numBins = jetCorrParameters.size();
+  nodeOffsets_.push_back(0);
+  for ( unsigned iBin = 0; iBin < numBins; ++iBin ) {
+    const JetCorrectorParameters::Record& record = jetCorrParameters.record(iBin);
+    etaMin_.push_back(record.xMin(0));
+    etaMax_.push_back(record.xMax(0));
+
+    const std::vector<float>& parameters = record.parameters();
+    if ( parameters.size() == 0 || (parameters.size() % 3) != 0 )
+      throw cms::Exception("JetCorrUncertaintyTable")
+	<< " Wrong number of parameters = " << parameters.size() << " for eta bin = " << iBin << " !!\n";
+
+    std::vector<float> ptNodes, valuesUp, valuesDown;
+    for ( size_t iNode = 0; iNode < (parameters.size()/3); ++iNode ) {
+      ptNodes.push_back(parameters[3*iNode]);
+      valuesUp.push_back(parameters[3*iNode + 1]);
+      valuesDown.push_back(parameters[3*iNode + 2]);
+    }
+    isSorted_.push_back(true);
+    for ( size_t iNode = 1; iNode < ptNodes.size(); ++iNode ) {
+      if ( ptNodes[iNode] < ptNodes[iNode - 1] ) isSorted_.back() = false;
+    }
+
+    ptNodes_.insert(ptNodes_.end(), ptNodes.begin(), ptNodes.end());
+    up_.values_.insert(up_.values_.end(), valuesUp.begin(), valuesUp.end());
+    addSegments(ptNodes, valuesUp, up_.slopes_, up_.intercepts_);
+    down_.values_.insert(down_.values_.end(), valuesDown.begin(), valuesDown.end());
+    addSegments(ptNodes, valuesDown, down_.slopes_, down_.intercepts_);
+    nodeOffsets_.push_back(ptNodes_.size());
+  }
+
+//--- determine range and width of cells;
+//    bins of zero or negative width never match (cf. JetCorrectorParameters::binIndex) and are ignored
+  double minBinWidth = -1.;
+  unsigned numValidBins = 0;
+  for ( unsigned iBin = 0; iBin < numBins; ++iBin ) {
+    if ( !(etaMin_[iBin] < etaMax_[iBin]) ) continue;
+    double binWidth = (double)etaMax_[iBin] - (double)etaMin_[iBin];
+    if ( numValidBins == 0 ) {
+      cellEtaMin_ = etaMin_[iBin];
+      cellEtaMax_ = etaMax_[iBin];
+      minBinWidth = binWidth;
+    } else {
+      cellEtaMin_ = std::min(cellEtaMin_, (double)etaMin_[iBin]);
+      cellEtaMax_ = std::max(cellEtaMax_, (double)etaMax_[iBin]);
+      minBinWidth = std::min(minBinWidth, binWidth);
+    }
+    ++numValidBins;
+  }
+  if ( numValidBins == 0 ) return;
+
+  double numCells = std::ceil((cellEtaMax_ - cellEtaMin_)/minBinWidth);
+  numCells_ = (unsigned)std::max(1., std::min(numCells, (double)(maxCellsPerBin*numValidBins)));
+  cellWidth_ = (cellEtaMax_ - cellEtaMin_)/numCells_;
+
+//--- fill cells (counting sort),
+//    keeping bin indices in ascending order within each cell, so that the first matching bin is found first
+//   (same behaviour as JetCorrectorParameters::binIndex in case of overlapping bins)
+  std::vector<unsigned> firstCell(numBins), lastCell(numBins);
+  cellOffsets_.assign(numCells_ + 1, 0);
+  for ( unsigned iBin = 0; iBin < numBins; ++iBin ) {
+    if ( !(etaMin_[iBin] < etaMax_[iBin]) ) continue;
+    firstCell[iBin] = (unsigned)std::min((double)(numCells_ - 1), std::floor(((double)etaMin_[iBin] - cellEtaMin_)/cellWidth_));
+    lastCell[iBin] = (unsigned)std::min((double)(numCells_ - 1), std::floor(((double)etaMax_[iBin] - cellEtaMin_)/cellWidth_));
+    for ( unsigned iCell = firstCell[iBin]; iCell <= lastCell[iBin]; ++iCell ) {
+      ++cellOffsets_[iCell + 1];
+    }
+  }
+  for ( unsigned iCell = 0; iCell < numCells_; ++iCell ) {
+    cellOffsets_[iCell + 1] += cellOffsets_[iCell];
+  }
+  cellEtaBins_.resize(cellOffsets_[numCells_]);
+  std::vector<unsigned> cellPositions(cellOffsets_.begin(), cellOffsets_.end() - 1);
+  for ( unsigned iBin = 0; iBin < numBins; ++iBin ) {
+    if ( !(etaMin_[iBin] < etaMax_[iBin]) ) continue;
+    for ( unsigned iCell = firstCell[iBin]; iCell <= lastCell[iBin]; ++iCell ) {
+      cellEtaBins_[cellPositions[iCell]++] = iBin;
+    }
+  }
+}
+
+boost::shared_ptr<const JetCorrUncertaintyTable> JetCorrUncertaintyTable::get(const JetCorrectorParametersReader& reader, const std::string& section)
+{
+  return pat::helper::getSharedInstance<const JetCorrUncertaintyTable>(std::make_pair(reader.inputFileName(), section), tableFactory(reader, section));
+}
+
+int JetCorrUncertaintyTable::findEtaBin(float eta) const
+{
+  // CV: check written such that NaN values are rejected
+  if ( !(eta >= cellEtaMin_ && eta < cellEtaMax_) ) return -1;
+
+  unsigned iCell = (unsigned)std::min((double)(numCells_ - 1), std::floor(((double)eta - cellEtaMin_)/cellWidth_));
+  for ( unsigned iEntry = cellOffsets_[iCell]; iEntry < cellOffsets_[iCell + 1]; ++iEntry ) {
+    unsigned iBin = cellEtaBins_[iEntry];
+    if ( eta >= etaMin_[iBin] && eta < etaMax_[iBin] ) return iBin;
+  }
+
+  return -1;
+}
+
+unsigned JetCorrUncertaintyTable::findPtSegment(unsigned iBin, float pt) const
+{
+  const float* nodesBegin = &ptNodes_[nodeOffsets_[iBin]];
+  const float* nodesEnd = nodesBegin + (nodeOffsets_[iBin + 1] - nodeOffsets_[iBin]);
+  unsigned numSegments = (nodesEnd - nodesBegin) - 1;
+
+  // CV: same convention as SimpleJetCorrectionUncertainty::findBin,
+  //     which returns the first segment with ptNode[i] <= pt < ptNode[i + 1] and segment 0 in case none matches
+  if ( isSorted_[iBin] ) {
+    unsigned iSegment = (std::upper_bound(nodesBegin, nodesEnd, pt) - nodesBegin) - 1;
+    if ( iSegment < numSegments && pt >= nodesBegin[iSegment] ) return iSegment;
+  } else {
+    for ( unsigned iSegment = 0; iSegment < numSegments; ++iSegment ) {
+      if ( pt >= nodesBegin[iSegment] && pt < nodesBegin[iSegment + 1] ) return iSegment;
+    }
+  }
+
+  return 0;
+}
+
+float JetCorrUncertaintyTable::getUncertainty(double eta, double pt, bool direction) const
+{
+  // CV: JetCorrectionUncertainty computes uncertainties in single precision
+  float eta_float = eta;
+  float pt_float = pt;
+
+  int iBin = findEtaBin(eta_float);
+  if ( iBin < 0 ) return -999.;
+
+  const directionEntryType& entry = ( direction ) ? up_ : down_;
+
+  unsigned firstNode = nodeOffsets_[iBin];
+  unsigned lastNode = nodeOffsets_[iBin + 1] - 1;
+  if ( pt_float <= ptNodes_[firstNode] ) return entry.values_[firstNode];
+  if ( pt_float >= ptNodes_[lastNode] ) return entry.values_[lastNode];
+
+  unsigned iNode = firstNode + findPtSegment(iBin, pt_float);
+  return entry.slopes_[iNode]*pt_float + entry.intercepts_[iNode];
+}
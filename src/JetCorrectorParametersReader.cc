@@ -0,0 +1,350 @@
+#include "PhysicsTools/PatUtils/interface/JetCorrectorParametersReader.h"
+
+#include "FWCore/Utilities/interface/Exception.h"
+
+#include "PhysicsTools/PatUtils/interface/SharedInstance.h"
+
+#include <fstream>
+#include <sstream>
+#include <algorithm>
+#include <string.h>
+
+namespace
+{
+  // CV: same conventions as used by JetCorrectorParameters(fileName, section) constructor
+  std::string getSection(const std::string& line)
+  {
+    size_t iFirst = line.find('[');
+    size_t iLast = line.find(']');
+    if ( iFirst != std::string::npos && iLast != std::string::npos && iFirst < iLast )
+      return std::string(line, iFirst + 1, iLast - iFirst - 1);
+    return "";
+  }
+
+  std::string getDefinitions(const std::string& line)
+  {
+    if ( line.empty() || line[0] != '{' ) return "";
+    size_t iEnd = line.find('}');
+    if ( iEnd == std::string::npos ) return "";
+    return line.substr(1, iEnd - 1);
+  }
+
+  bool isEmptyRecord(const std::string& line)
+  {
+    for ( std::string::const_iterator c = line.begin();
+	  c != line.end(); ++c ) {
+      if ( (*c) == '#' ) break; // skip comments
+      if ( !((*c) == ' ' || (*c) == '\t' || (*c) == '\r') ) return false;
+    }
+    return true;
+  }
+
+  // 64-bit FNV-1a hash of file content
+  uint64_t computeChecksum(const std::string& content)
+  {
+    uint64_t retVal = 14695981039346656037ULL;
+    for ( std::string::const_iterator c = content.begin();
+	  c != content.end(); ++c ) {
+      retVal ^= (unsigned char)(*c);
+      retVal *= 1099511628211ULL;
+    }
+    return retVal;
+  }
+
+//--- layout of binary file:
+//
+//      char[8]   magic word
+//      uint32_t  byte-order mark
+//      uint64_t  checksum of text file content
+//      uint32_t  number of sections
+//      for each section:
+//        string  name
+//        string  definitions
+//        uint32_t number of records
+//        for each record:
+//          uint32_t number of bin variables; float[] xMin; float[] xMax
+//          uint32_t number of parameters; float[] parameters
+//
+//    where strings are stored as uint32_t length followed by the characters
+//   (all numbers are stored in the native byte-order of the machine writing the file)
+  const char binaryMagic[8] = { 'J', 'E', 'C', 'P', 'B', 'I', 'N', '1' };
+  const uint32_t binaryByteOrderMark = 0x01020304;
+
+  template <typename T>
+  void writeValue(std::ostream& stream, const T& value)
+  {
+    stream.write(reinterpret_cast<const char*>(&value), sizeof(T));
+  }
+
+  void writeString(std::ostream& stream, const std::string& value)
+  {
+    writeValue<uint32_t>(stream, value.size());
+    stream.write(value.data(), value.size());
+  }
+
+  void writeFloats(std::ostream& stream, const std::vector<float>& values)
+  {
+    if ( values.size() > 0 ) stream.write(reinterpret_cast<const char*>(&values[0]), values.size()*sizeof(float));
+  }
+
+  class binaryBufferReader
+  {
+   public:
+    binaryBufferReader(const std::string& buffer)
+      : buffer_(buffer),
+	position_(0)
+    {}
+    template <typename T>
+    bool readValue(T& value)
+    {
+      if ( (position_ + sizeof(T)) > buffer_.size() ) return false;
+      memcpy(&value, buffer_.data() + position_, sizeof(T));
+      position_ += sizeof(T);
+      return true;
+    }
+    bool readString(std::string& value)
+    {
+      uint32_t length = 0;
+      if ( !readValue(length) || (position_ + length) > buffer_.size() ) return false;
+      value.assign(buffer_.data() + position_, length);
+      position_ += length;
+      return true;
+    }
+    bool readFloats(std::vector<float>& values, uint32_t numValues)
+    {
+      if ( (position_ + numValues*sizeof(float)) > buffer_.size() ) return false;
+      values.resize(numValues);
+      if ( numValues > 0 ) memcpy(&values[0], buffer_.data() + position_, numValues*sizeof(float));
+      position_ += numValues*sizeof(float);
+      return true;
+    }
+    bool isAtEnd() const { return (position_ == buffer_.size()); }
+   private:
+    const std::string& buffer_;
+    size_t position_;
+  };
+
+  bool readFile(const std::string& fileName, std::string& content)
+  {
+    std::ifstream file(fileName.data(), std::ios::in | std::ios::binary);
+    if ( !file ) return false;
+    std::ostringstream buffer;
+    buffer << file.rdbuf();
+    content = buffer.str();
+    return true;
+  }
+}
+
+JetCorrectorParametersReader::JetCorrectorParametersReader(const std::string& inputFileName)
+  : inputFileName_(inputFileName),
+    isLoadedFromBinary_(false),
+    checksum_(0)
+{
+  std::string content;
+  if ( !readFile(inputFileName_, content) )
+    throw cms::Exception("JetCorrectorParametersReader")
+      << " Failed to open file = " << inputFileName_ << " !!\n";
+  checksum_ = computeChecksum(content);
+
+  isLoadedFromBinary_ = readBinary(getBinaryFileName(inputFileName_));
+  if ( !isLoadedFromBinary_ ) {
+    std::istringstream inputStream(content);
+    readText(inputStream);
+  }
+
+  if ( sections_.size() == 0 )
+    throw cms::Exception("JetCorrectorParametersReader")
+      << " No definitions found in file = " << inputFileName_ << " !!\n";
+}
+
+JetCorrectorParametersReader::~JetCorrectorParametersReader()
+{
+  for ( sectionMap::iterator it = sectionEntries_.begin();
+	it != sectionEntries_.end(); ++it ) {
+    delete it->second;
+  }
+}
+
+boost::shared_ptr<const JetCorrectorParametersReader> JetCorrectorParametersReader::get(const std::string& inputFileName)
+{
+  return pat::helper::getSharedInstance<const JetCorrectorParametersReader>(inputFileName);
+}
+
+JetCorrectorParametersReader::sectionEntryType* JetCorrectorParametersReader::addSection(const std::string& section)
+{
+  if ( sectionEntries_.find(section) != sectionEntries_.end() )
+    throw cms::Exception("JetCorrectorParametersReader")
+      << " Section = " << section << " defined more than once in file = " << inputFileName_ << " !!\n";
+  sectionEntryType* sectionEntry = new sectionEntryType();
+  sectionEntries_[section] = sectionEntry;
+  sections_.push_back(section);
+  return sectionEntry;
+}
+
+void JetCorrectorParametersReader::readText(std::istream& inputStream)
+{
+  sectionEntryType* currentSection = 0;
+  std::string line;
+  while ( std::getline(inputStream, line) ) {
+    std::string section = getSection(line);
+    std::string definitions = getDefinitions(line);
+    if ( section != "" && definitions == "" ) {
+      currentSection = addSection(section);
+      continue;
+    }
+    if ( !currentSection ) {
+      // CV: file not divided into sections;
+      //     ignore comments preceding the definitions
+      if ( definitions == "" ) continue;
+      currentSection = addSection("");
+    }
+    if ( definitions != "" ) {
+      currentSection->definitions_ = definitions;
+      continue;
+    }
+    if ( !isEmptyRecord(line) ) currentSection->records_.push_back(line);
+  }
+}
+
+bool JetCorrectorParametersReader::readBinary(const std::string& binaryFileName)
+{
+  std::string buffer;
+  if ( !readFile(binaryFileName, buffer) ) return false;
+
+  binaryBufferReader reader(buffer);
+
+  char magic[sizeof(binaryMagic)];
+  for ( size_t iChar = 0; iChar < sizeof(binaryMagic); ++iChar ) {
+    if ( !reader.readValue(magic[iChar]) || magic[iChar] != binaryMagic[iChar] ) return false;
+  }
+  uint32_t byteOrderMark = 0;
+  if ( !reader.readValue(byteOrderMark) || byteOrderMark != binaryByteOrderMark ) return false;
+  uint64_t checksum = 0;
+  if ( !reader.readValue(checksum) || checksum != checksum_ ) {
+    std::cout << "Binary file = " << binaryFileName << " is outdated, reading JEC parameters from text file." << std::endl;
+    return false;
+  }
+
+  std::vector<std::string> sections;
+  sectionMap sectionEntries;
+  bool isValid = true;
+  uint32_t numSections = 0;
+  if ( !reader.readValue(numSections) ) isValid = false;
+  for ( uint32_t iSection = 0; iSection < numSections && isValid; ++iSection ) {
+    std::string section;
+    sectionEntryType* sectionEntry = new sectionEntryType();
+    uint32_t numRecords = 0;
+    if ( !(reader.readString(section) && sectionEntries.find(section) == sectionEntries.end() &&
+	   reader.readString(sectionEntry->definitions_) &&
+	   reader.readValue(numRecords)) ) {
+      delete sectionEntry;
+      isValid = false;
+      break;
+    }
+    sections.push_back(section);
+    sectionEntries[section] = sectionEntry;
+
+    JetCorrectorParameters::Definitions definitions(sectionEntry->definitions_);
+    std::vector<JetCorrectorParameters::Record> records;
+    records.reserve(numRecords);
+    for ( uint32_t iRecord = 0; iRecord < numRecords; ++iRecord ) {
+      uint32_t numBinVar = 0;
+      std::vector<float> xMin, xMax;
+      uint32_t numParameters = 0;
+      std::vector<float> parameters;
+      if ( !(reader.readValue(numBinVar) && numBinVar == definitions.nBinVar() &&
+	     reader.readFloats(xMin, numBinVar) && reader.readFloats(xMax, numBinVar) &&
+	     reader.readValue(numParameters) && reader.readFloats(parameters, numParameters)) ) {
+	isValid = false;
+	break;
+      }
+      records.push_back(JetCorrectorParameters::Record(numBinVar, xMin, xMax, parameters));
+    }
+    if ( isValid ) sectionEntry->parameters_ = new JetCorrectorParameters(definitions, records);
+  }
+  if ( isValid && !reader.isAtEnd() ) isValid = false;
+
+  if ( isValid ) {
+    sections_.swap(sections);
+    sectionEntries_.swap(sectionEntries);
+  } else {
+    std::cout << "Failed to read binary file = " << binaryFileName << ", reading JEC parameters from text file." << std::endl;
+  }
+  for ( sectionMap::iterator it = sectionEntries.begin();
+	it != sectionEntries.end(); ++it ) {
+    delete it->second;
+  }
+
+  return isValid;
+}
+
+void JetCorrectorParametersReader::writeBinary(const std::string& binaryFileName) const
+{
+  std::ofstream binaryFile(binaryFileName.data(), std::ios::out | std::ios::binary | std::ios::trunc);
+  if ( !binaryFile )
+    throw cms::Exception("JetCorrectorParametersReader")
+      << " Failed to create file = " << binaryFileName << " !!\n";
+
+  binaryFile.write(binaryMagic, sizeof(binaryMagic));
+  writeValue(binaryFile, binaryByteOrderMark);
+  writeValue(binaryFile, checksum_);
+  writeValue<uint32_t>(binaryFile, sections_.size());
+  for ( std::vector<std::string>::const_iterator section = sections_.begin();
+	section != sections_.end(); ++section ) {
+    const JetCorrectorParameters& jetCorrParameters = parameters(*section);
+    writeString(binaryFile, *section);
+    writeString(binaryFile, sectionEntries_[*section]->definitions_);
+    writeValue<uint32_t>(binaryFile, jetCorrParameters.size());
+    for ( unsigned iRecord = 0; iRecord < jetCorrParameters.size(); ++iRecord ) {
+      const JetCorrectorParameters::Record& record = jetCorrParameters.record(iRecord);
+      uint32_t numBinVar = record.nVar();
+      std::vector<float> xMin(numBinVar), xMax(numBinVar);
+      for ( uint32_t iBinVar = 0; iBinVar < numBinVar; ++iBinVar ) {
+	xMin[iBinVar] = record.xMin(iBinVar);
+	xMax[iBinVar] = record.xMax(iBinVar);
+      }
+      writeValue(binaryFile, numBinVar);
+      writeFloats(binaryFile, xMin);
+      writeFloats(binaryFile, xMax);
+      writeValue<uint32_t>(binaryFile, record.nParameters());
+      writeFloats(binaryFile, record.parameters());
+    }
+  }
+
+  if ( !binaryFile )
+    throw cms::Exception("JetCorrectorParametersReader")
+      << " Failed to write file = " << binaryFileName << " !!\n";
+}
+
+bool JetCorrectorParametersReader::hasSection(const std::string& section) const
+{
+  return (sectionEntries_.find(section) != sectionEntries_.end());
+}
+
+const JetCorrectorParameters& JetCorrectorParametersReader::parameters(const std::string& section) const
+{
+  sectionMap::iterator sectionEntry = sectionEntries_.find(section);
+  if ( sectionEntry == sectionEntries_.end() )
+    throw cms::Exception("JetCorrectorParametersReader")
+      << " Section = " << section << " does not exist in file = " << inputFileName_ << " !!\n";
+
+  sectionEntryType* entry = sectionEntry->second;
+  if ( !entry->parameters_ ) {
+    if ( entry->definitions_ == "" )
+      throw cms::Exception("JetCorrectorParametersReader")
+	<< " No definitions found for section = " << section << " in file = " << inputFileName_ << " !!\n";
+    JetCorrectorParameters::Definitions definitions(entry->definitions_);
+    std::vector<JetCorrectorParameters::Record> records;
+    records.reserve(entry->records_.size());
+    for ( std::vector<std::string>::const_iterator record = entry->records_.begin();
+	  record != entry->records_.end(); ++record ) {
+      records.push_back(JetCorrectorParameters::Record(*record, definitions.nBinVar()));
+    }
+    std::sort(records.begin(), records.end());
+    entry->parameters_ = new JetCorrectorParameters(definitions, records);
+    // CV: text of records no longer needed once the parameters have been created
+    std::vector<std::string>().swap(entry->records_);
+  }
+
+  return (*entry->parameters_);
+}
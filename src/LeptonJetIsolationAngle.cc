@@ -7,15 +7,20 @@
 #include "FWCore/MessageLogger/interface/MessageLogger.h"
 #include "FWCore/Utilities/interface/Exception.h"
 #include "DataFormats/Math/interface/deltaR.h"
+#include "DataFormats/GsfTrackReco/interface/GsfTrack.h"
 
 #include <vector>
+#include <algorithm>
+#include <cmath>
 
 
 using namespace pat;
 
 
 // constructor
-LeptonJetIsolationAngle::LeptonJetIsolationAngle() {
+LeptonJetIsolationAngle::LeptonJetIsolationAngle() :
+  cachedTrackProduct_(0),
+  cachedTrackCollectionSize_(0) {
 }
 
 
@@ -26,60 +31,70 @@ LeptonJetIsolationAngle::~LeptonJetIsolationAngle() {
 
 // calculate the JetIsoA for the lepton object
 float LeptonJetIsolationAngle::calculate(const Electron & theElectron, const edm::Handle<edm::View<reco::Track> > & trackHandle, const edm::Event & iEvent) {
-  CLHEP::HepLorentzVector theElectronHLV(theElectron.px(), theElectron.py(), theElectron.pz(), theElectron.energy());
-  return this->calculate(theElectronHLV, trackHandle, iEvent);
+  return this->calculate(math::XYZVector(theElectron.px(), theElectron.py(), theElectron.pz()).Unit(), trackHandle, iEvent);
 }
 float LeptonJetIsolationAngle::calculate(const Muon & theMuon, const edm::Handle<edm::View<reco::Track> > & trackHandle, const edm::Event & iEvent) {
-  CLHEP::HepLorentzVector theMuonHLV(theMuon.px(), theMuon.py(), theMuon.pz(), theMuon.energy());
-  return this->calculate(theMuonHLV, trackHandle, iEvent);
+  return this->calculate(math::XYZVector(theMuon.px(), theMuon.py(), theMuon.pz()).Unit(), trackHandle, iEvent);
 }
 
 
-// calculate the JetIsoA for the lepton's HLV
-float LeptonJetIsolationAngle::calculate(const CLHEP::HepLorentzVector & aLepton, const edm::Handle<edm::View<reco::Track> > & trackHandle, const edm::Event & iEvent) {
+// calculate the JetIsoA for the lepton's direction
+float LeptonJetIsolationAngle::calculate(const math::XYZVector & aLeptonDirection, const edm::Handle<edm::View<reco::Track> > & trackHandle, const edm::Event & iEvent) {
+  // the cleaned jets depend on the event and on the tracks used for the electron isolation only,
+  // so compute them only once for all leptons in the event
+  // (the address and size of the track collection are checked as well,
+  //  as the event ID and ProductID alone do not distinguish e.g. events read from different files)
+  if (iEvent.id() != cachedEventID_ || trackHandle.id() != cachedTrackProductID_ ||
+      trackHandle.product() != cachedTrackProduct_ || trackHandle->size() != cachedTrackCollectionSize_) {
+    this->update(trackHandle, iEvent);
+    cachedEventID_ = iEvent.id();
+    cachedTrackProductID_ = trackHandle.id();
+    cachedTrackProduct_ = trackHandle.product();
+    cachedTrackCollectionSize_ = trackHandle->size();
+  }
+  // calculate finally the isolation angle
+  // (the angle between two vectors in 3d eucledian space, computed from their unit vectors)
+  float isoAngle = 1000; // default to some craze impossible number to inhibit compiler warnings
+  for (std::vector<math::XYZVector>::const_iterator jetDirection = jetDirections_.begin(); jetDirection != jetDirections_.end(); jetDirection++) {
+    double cosAngle = std::max(-1., std::min(1., jetDirection->Dot(aLeptonDirection)));
+    float curDR = acos(cosAngle);
+    if (curDR < isoAngle) isoAngle = curDR;
+  }
+  return isoAngle;
+}
+
+
+// compute the directions of the jets, cleaned from isolated electrons
+void LeptonJetIsolationAngle::update(const edm::Handle<edm::View<reco::Track> > & trackHandle, const edm::Event & iEvent) {
   // FIXME: this is an ugly temporary workaround, JetMET+egamma should come up with a better tool
   // retrieve the jets
   edm::Handle<reco::CaloJetCollection> jetHandle;
   iEvent.getByLabel("iterativeCone5CaloJets", jetHandle);
-  reco::CaloJetCollection jetColl = *(jetHandle.product());
+  const reco::CaloJetCollection & jetColl = *jetHandle;
   // retrieve the electrons which might be in the jet list
   edm::Handle<std::vector<reco::GsfElectron> > electronsHandle;
   iEvent.getByLabel("pixelMatchGsfElectrons", electronsHandle);
-  std::vector<reco::GsfElectron> electrons = *electronsHandle;
+  const std::vector<reco::GsfElectron> & electrons = *electronsHandle;
   // determine the set of isolated electrons
-  std::vector<Electron> isoElectrons;
+  TrackerIsolationPt::buildTrackIndex(*trackHandle, 0.3, trackIndex_);
+  std::vector<const reco::GsfElectron *> isoElectrons;
   for (size_t ie=0; ie<electrons.size(); ie++) {
-    Electron anElectron(electrons[ie]);
-    if (anElectron.pt() > 10 &&
-        trkIsolator_.calculate(anElectron, *trackHandle) < 3.0) {
-      isoElectrons.push_back(electrons[ie]);
+    if (!(electrons[ie].pt() > 10)) continue;
+    const reco::GsfTrack & gsfTrack = *electrons[ie].gsfTrack();
+    if (trkIsolator_.calculate(gsfTrack.momentum(), gsfTrack.vertex(), *trackHandle, trackIndex_) < 3.0) {
+      isoElectrons.push_back(&electrons[ie]);
     }
   }
-  // determine the collections of jets, cleaned from electrons
-  std::vector<reco::CaloJet> theJets;
+  // determine the directions of the jets, cleaned from electrons
+  jetDirections_.clear();
   for (reco::CaloJetCollection::const_iterator itJet = jetColl.begin(); itJet != jetColl.end(); itJet++) {
+    // yes, all cuts hardcoded buts, but it's a second-order effect
+    if (!(itJet->et() > 15)) continue;
     float mindr2 = 9999.;
     for (size_t ie = 0; ie < isoElectrons.size(); ie++) {
-      float dr2 = ::deltaR2(*itJet, isoElectrons[ie]);
+      float dr2 = ::deltaR2(*itJet, *isoElectrons[ie]);
       if (dr2 < mindr2) mindr2 = dr2;
     }
-    float mindr = std::sqrt(mindr2);
-    // yes, all cuts hardcoded buts, but it's a second-order effect
-    if (itJet->et() > 15 && mindr > 0.3) theJets.push_back(reco::CaloJet(*itJet));
-  }
-  // calculate finally the isolation angle
-  float isoAngle = 1000; // default to some craze impossible number to inhibit compiler warnings
-  for (std::vector<reco::CaloJet>::const_iterator itJet = theJets.begin(); itJet != theJets.end(); itJet++) {
-    float curDR = this->spaceAngle(aLepton, *itJet);
-    if (curDR < isoAngle) isoAngle = curDR;
+    if (mindr2 > 0.3*0.3) jetDirections_.push_back(math::XYZVector(itJet->px(), itJet->py(), itJet->pz()).Unit());
   }
-  return isoAngle;
-}
-
-
-// calculate the angle between two vectors in 3d eucledian space
-float LeptonJetIsolationAngle::spaceAngle(const CLHEP::HepLorentzVector & aLepton, const reco::CaloJet & aJet) {
-  return acos(sin(aJet.theta()) * cos(aJet.phi()) * sin(aLepton.theta()) * cos(aLepton.phi())
-            + sin(aJet.theta()) * sin(aJet.phi()) * sin(aLepton.theta()) * sin(aLepton.phi())
-            + cos(aJet.theta()) * cos(aLepton.theta()));
 }
@@ -5,31 +5,34 @@ PATStringObjectFunction::PATStringObjectFunction(const std::string &string) :
     expr_(string)
 {
    candFunc_ = tryGet<reco::Candidate>(string);
-   if (!candFunc_.get()) {
-       eleFunc_ = tryGet<pat::Electron>(string);
-       muFunc_  = tryGet<pat::Muon>(string);
-       tauFunc_ = tryGet<pat::Tau>(string);
-       gamFunc_ = tryGet<pat::Photon>(string);
-       jetFunc_ = tryGet<pat::Jet>(string);
-       metFunc_ = tryGet<pat::MET>(string);
-       gpFunc_  = tryGet<pat::GenericParticle>(string);
-       pfFunc_  = tryGet<pat::PFParticle>(string);
-   } 
 }
 
 double
 PATStringObjectFunction::operator()(const reco::Candidate &c) const  {
     if (candFunc_.get()) return (*candFunc_)(c);
     const std::type_info &type = typeid(c);
-    if      (type == typeid(pat::Electron       )) return tryEval<pat::Electron       >(c, eleFunc_);
-    else if (type == typeid(pat::Muon           )) return tryEval<pat::Muon           >(c,  muFunc_);
-    else if (type == typeid(pat::Tau            )) return tryEval<pat::Tau            >(c, tauFunc_);
-    else if (type == typeid(pat::Photon         )) return tryEval<pat::Photon         >(c, gamFunc_);
-    else if (type == typeid(pat::Jet            )) return tryEval<pat::Jet            >(c, jetFunc_);
-    else if (type == typeid(pat::MET            )) return tryEval<pat::MET            >(c, metFunc_);
-    else if (type == typeid(pat::GenericParticle)) return tryEval<pat::GenericParticle>(c,  gpFunc_);
-    else if (type == typeid(pat::PFParticle     )) return tryEval<pat::PFParticle     >(c,  pfFunc_);
+    const EvaluatorBase *evaluator = findEvaluator(type);
+    if (!evaluator) throwBadType(type);
+    return (*evaluator)(c);
+}
+
+const PATStringObjectFunction::EvaluatorBase *
+PATStringObjectFunction::findEvaluator(const std::type_info &type) const  {
+    for (EvaluatorCache::const_iterator it = evaluators_.begin(); it != evaluators_.end(); ++it) {
+        if (*it->first == type) return it->second.get();
+    }
+    boost::shared_ptr<EvaluatorBase> evaluator;
+    if      (type == typeid(pat::Electron       )) evaluator = makeEvaluator<pat::Electron       >();
+    else if (type == typeid(pat::Muon           )) evaluator = makeEvaluator<pat::Muon           >();
+    else if (type == typeid(pat::Tau            )) evaluator = makeEvaluator<pat::Tau            >();
+    else if (type == typeid(pat::Photon         )) evaluator = makeEvaluator<pat::Photon         >();
+    else if (type == typeid(pat::Jet            )) evaluator = makeEvaluator<pat::Jet            >();
+    else if (type == typeid(pat::MET            )) evaluator = makeEvaluator<pat::MET            >();
+    else if (type == typeid(pat::GenericParticle)) evaluator = makeEvaluator<pat::GenericParticle>();
+    else if (type == typeid(pat::PFParticle     )) evaluator = makeEvaluator<pat::PFParticle     >();
     else throw cms::Exception("Type Error") << "Cannot evaluate '" << expr_ << "' on an object of unsupported type " << type.name() << "\n"; 
+    evaluators_.push_back(std::make_pair(&type, evaluator));
+    return evaluator.get();
 }
 
 void 
@@ -41,31 +44,34 @@ PATStringCutObjectSelector::PATStringCutObjectSelector(const std::string &string
     expr_(string)
 {
    candFunc_ = tryGet<reco::Candidate>(string);
-   if (!candFunc_.get()) {
-       eleFunc_ = tryGet<pat::Electron>(string);
-       muFunc_  = tryGet<pat::Muon>(string);
-       tauFunc_ = tryGet<pat::Tau>(string);
-       gamFunc_ = tryGet<pat::Photon>(string);
-       jetFunc_ = tryGet<pat::Jet>(string);
-       metFunc_ = tryGet<pat::MET>(string);
-       gpFunc_  = tryGet<pat::GenericParticle>(string);
-       pfFunc_  = tryGet<pat::PFParticle>(string);
-   } 
 }
 
 bool
 PATStringCutObjectSelector::operator()(const reco::Candidate &c) const  {
     if (candFunc_.get()) return (*candFunc_)(c);
     const std::type_info &type = typeid(c);
-    if      (type == typeid(pat::Electron       )) return tryEval<pat::Electron       >(c, eleFunc_);
-    else if (type == typeid(pat::Muon           )) return tryEval<pat::Muon           >(c,  muFunc_);
-    else if (type == typeid(pat::Tau            )) return tryEval<pat::Tau            >(c, tauFunc_);
-    else if (type == typeid(pat::Photon         )) return tryEval<pat::Photon         >(c, gamFunc_);
-    else if (type == typeid(pat::Jet            )) return tryEval<pat::Jet            >(c, jetFunc_);
-    else if (type == typeid(pat::MET            )) return tryEval<pat::MET            >(c, metFunc_);
-    else if (type == typeid(pat::GenericParticle)) return tryEval<pat::GenericParticle>(c,  gpFunc_);
-    else if (type == typeid(pat::PFParticle     )) return tryEval<pat::PFParticle     >(c,  pfFunc_);
+    const EvaluatorBase *evaluator = findEvaluator(type);
+    if (!evaluator) throwBadType(type);
+    return (*evaluator)(c);
+}
+
+const PATStringCutObjectSelector::EvaluatorBase *
+PATStringCutObjectSelector::findEvaluator(const std::type_info &type) const  {
+    for (EvaluatorCache::const_iterator it = evaluators_.begin(); it != evaluators_.end(); ++it) {
+        if (*it->first == type) return it->second.get();
+    }
+    boost::shared_ptr<EvaluatorBase> evaluator;
+    if      (type == typeid(pat::Electron       )) evaluator = makeEvaluator<pat::Electron       >();
+    else if (type == typeid(pat::Muon           )) evaluator = makeEvaluator<pat::Muon           >();
+    else if (type == typeid(pat::Tau            )) evaluator = makeEvaluator<pat::Tau            >();
+    else if (type == typeid(pat::Photon         )) evaluator = makeEvaluator<pat::Photon         >();
+    else if (type == typeid(pat::Jet            )) evaluator = makeEvaluator<pat::Jet            >();
+    else if (type == typeid(pat::MET            )) evaluator = makeEvaluator<pat::MET            >();
+    else if (type == typeid(pat::GenericParticle)) evaluator = makeEvaluator<pat::GenericParticle>();
+    else if (type == typeid(pat::PFParticle     )) evaluator = makeEvaluator<pat::PFParticle     >();
     else throw cms::Exception("Type Error") << "Cannot evaluate '" << expr_ << "' on an object of unsupported type " << type.name() << "\n"; 
+    evaluators_.push_back(std::make_pair(&type, evaluator));
+    return evaluator.get();
 }
 
 void 
@@ -0,0 +1,71 @@
+#include "PhysicsTools/PatUtils/interface/TH2LookupTable.h"
+
+#include "FWCore/Utilities/interface/Exception.h"
+
+#include "PhysicsTools/PatUtils/interface/SharedInstance.h"
+
+#include <TFile.h>
+
+TH2LookupTable::axisEntryType::axisEntryType(const TAxis& axis)
+  : min_(axis.GetXmin()),
+    max_(axis.GetXmax()),
+    numBins_(axis.GetNbins()),
+    isUniform_(axis.GetXbins()->GetSize() == 0)
+{
+  if ( !isUniform_ ) {
+    for ( int iBin = 1; iBin <= (numBins_ + 1); ++iBin ) {
+      edges_.push_back(axis.GetBinLowEdge(iBin));
+    }
+  }
+}
+
+TH2LookupTable::TH2LookupTable(const TH2& histogram)
+  : xAxis_(*histogram.GetXaxis()),
+    yAxis_(*histogram.GetYaxis())
+{
+  contents_.reserve(xAxis_.numBins_*yAxis_.numBins_);
+  errors_.reserve(xAxis_.numBins_*yAxis_.numBins_);
+  for ( int iBinY = 1; iBinY <= yAxis_.numBins_; ++iBinY ) {
+    for ( int iBinX = 1; iBinX <= xAxis_.numBins_; ++iBinX ) {
+      int binIndex = histogram.GetBin(iBinX, iBinY);
+      contents_.push_back(histogram.GetBinContent(binIndex));
+      errors_.push_back(histogram.GetBinError(binIndex));
+    }
+  }
+}
+
+namespace
+{
+  struct tableFactory
+  {
+    tableFactory(const std::string& inputFileName, const std::string& histogramName)
+      : inputFileName_(inputFileName),
+        histogramName_(histogramName)
+    {}
+    const TH2LookupTable* operator()() const
+    {
+      TFile* inputFile = TFile::Open(inputFileName_.data());
+      if ( !inputFile || inputFile->IsZombie() ) {
+        delete inputFile;
+        throw cms::Exception("TH2LookupTable") 
+          << " Failed to open File = " << inputFileName_ << " !!\n";
+      }
+      TH2* histogram = dynamic_cast<TH2*>(inputFile->Get(histogramName_.data()));
+      if ( !histogram ) {
+        delete inputFile;
+        throw cms::Exception("TH2LookupTable") 
+          << " Failed to load LUT = " << histogramName_ << " from file = " << inputFileName_ << " !!\n";
+      }
+      const TH2LookupTable* table = new TH2LookupTable(*histogram);
+      delete inputFile; // CV: also deletes histogram
+      return table;
+    }
+    const std::string& inputFileName_;
+    const std::string& histogramName_;
+  };
+}
+
+boost::shared_ptr<const TH2LookupTable> TH2LookupTable::get(const std::string& inputFileName, const std::string& histogramName)
+{
+  return pat::helper::getSharedInstance<const TH2LookupTable>(std::make_pair(inputFileName, histogramName), tableFactory(inputFileName, histogramName));
+}
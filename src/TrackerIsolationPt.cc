@@ -7,14 +7,14 @@
 #include "FWCore/Utilities/interface/Exception.h"
 #include "FWCore/Framework/interface/ESHandle.h"
 #include "DataFormats/Common/interface/Handle.h"
-#include "CLHEP/Vector/LorentzVector.h"
-#include "DataFormats/GeometryVector/interface/GlobalVector.h"
+#include "DataFormats/Math/interface/deltaPhi.h"
 #include "FWCore/Utilities/interface/InputTag.h"
 #include "DataFormats/Common/interface/View.h"
 #include "DataFormats/PatCandidates/interface/Electron.h"
 #include "DataFormats/PatCandidates/interface/Muon.h"
 #include "DataFormats/GsfTrackReco/interface/GsfTrack.h"
 #include <vector>
+#include <algorithm>
 
 using namespace pat;
 
@@ -28,50 +28,89 @@ TrackerIsolationPt::~TrackerIsolationPt() {
 
 /// calculate the TrackIsoPt for the lepton object
 float TrackerIsolationPt::calculate(const Electron & theElectron, const edm::View<reco::Track> & theTracks, float isoConeElectron) const {
-  return this->calculate(*theElectron.gsfTrack(), theTracks, isoConeElectron);
+  return this->calculate(theElectron.gsfTrack()->momentum(), theTracks, 0, isoConeElectron);
 }
 
 float TrackerIsolationPt::calculate(const Muon & theMuon, const edm::View<reco::Track> & theTracks, float isoConeMuon) const {
-  return this->calculate(*theMuon.track(), theTracks, isoConeMuon);
+  return this->calculate(theMuon.track()->momentum(), theTracks, 0, isoConeMuon);
 }
 
-/// calculate the TrackIsoPt for the lepton's track
-float TrackerIsolationPt::calculate(const reco::Track & theTrack, const edm::View<reco::Track> & theTracks, float isoCone) const {
+/// calculate the TrackIsoPt for the lepton object, using an eta-phi index of the tracks
+float TrackerIsolationPt::calculate(const Electron & theElectron, const edm::View<reco::Track> & theTracks, const helper::EtaPhiGrid & trackIndex, float isoConeElectron) const {
+  return this->calculate(theElectron.gsfTrack()->momentum(), theTracks, &trackIndex, isoConeElectron);
+}
+
+float TrackerIsolationPt::calculate(const Muon & theMuon, const edm::View<reco::Track> & theTracks, const helper::EtaPhiGrid & trackIndex, float isoConeMuon) const {
+  return this->calculate(theMuon.track()->momentum(), theTracks, &trackIndex, isoConeMuon);
+}
+
+/// calculate the TrackIsoPt for the lepton track given by its momentum and vertex
+float TrackerIsolationPt::calculate(const math::XYZVector & theMomentum, const math::XYZPoint & theVertex, const edm::View<reco::Track> & theTracks, float isoCone) const {
+  return this->calculate(theMomentum, theTracks, 0, isoCone);
+}
+
+float TrackerIsolationPt::calculate(const math::XYZVector & theMomentum, const math::XYZPoint & theVertex, const edm::View<reco::Track> & theTracks, const helper::EtaPhiGrid & trackIndex, float isoCone) const {
+  return this->calculate(theMomentum, theTracks, &trackIndex, isoCone);
+}
+
+/// build the eta-phi index of the tracks
+void TrackerIsolationPt::buildTrackIndex(const edm::View<reco::Track> & theTracks, float maxIsoCone, helper::EtaPhiGrid & trackIndex) {
+  std::vector<double> etas, phis;
+  etas.reserve(theTracks.size());
+  phis.reserve(theTracks.size());
+  for (edm::View<reco::Track>::const_iterator itTrack = theTracks.begin(); itTrack != theTracks.end(); itTrack++) {
+    etas.push_back(itTrack->eta());
+    phis.push_back(itTrack->phi());
+  }
+  trackIndex.build(etas, phis, maxIsoCone);
+}
+
+/// calculate the TrackIsoPt for the lepton's track momentum
+float TrackerIsolationPt::calculate(const math::XYZVector & theMomentum, const edm::View<reco::Track> & theTracks, const helper::EtaPhiGrid * trackIndex, float isoCone) const {
   // initialize some variables
   float isoPtLepton = 0;
   const reco::Track * closestTrackDRPt = 0, * closestTrackDR = 0;
-  float closestDRPt = 10000, closestDR = 10000;
-  // use all these pointless vector conversions because the momenta from tracks
-  // are completely unusable; bah, these math-vectors are worthless!
-  CLHEP::HepLorentzVector lepton(theTrack.px(), theTrack.py(), theTrack.pz(), theTrack.p());
-  for (edm::View<reco::Track>::const_iterator itTrack = theTracks.begin(); itTrack != theTracks.end(); itTrack++) {
-    CLHEP::HepLorentzVector track(itTrack->px(), itTrack->py(), itTrack->pz(), itTrack->p());
-    float dR = lepton.deltaR(track);
-    if (dR < isoCone) {
-      isoPtLepton += track.perp();
+  double closestDR2Pt = 1.e+8, closestDR2 = 1.e+8;
+  double isoCone2 = isoCone*isoCone;
+  double leptonEta = theMomentum.eta();
+  double leptonPhi = theMomentum.phi();
+  double leptonPt = theMomentum.rho();
+  // select tracks: all tracks or, if an index valid for the isolation cone is given, the tracks close to the lepton
+  // (visited in the order of the collection, so that the result is the same in both cases)
+  std::vector<unsigned> closeTracks;
+  bool useIndex = (trackIndex && isoCone <= trackIndex->cellSize());
+  if (useIndex) {
+    trackIndex->findNeighbours(leptonEta, leptonPhi, closeTracks);
+    std::sort(closeTracks.begin(), closeTracks.end());
+  }
+  size_t numTracks = (useIndex) ? closeTracks.size() : theTracks.size();
+  for (size_t iTrack = 0; iTrack < numTracks; ++iTrack) {
+    const reco::Track & track = theTracks[(useIndex) ? closeTracks[iTrack] : iTrack];
+    double dEta = leptonEta - track.eta();
+    double dPhi = reco::deltaPhi(leptonPhi, track.phi());
+    double dR2 = dEta*dEta + dPhi*dPhi;
+    if (dR2 < isoCone2) {
+      isoPtLepton += track.pt();
       // find the closest matching track
       // FIXME: we could association by hits or chi2 to match
-      float pRatio = track.perp()/lepton.perp();
-      if (dR < closestDRPt && pRatio > 0.5 && pRatio < 1.5) {
-        closestDRPt = dR;
-        closestTrackDRPt = &*itTrack;
+      float pRatio = track.pt()/leptonPt;
+      if (dR2 < closestDR2Pt && pRatio > 0.5 && pRatio < 1.5) {
+        closestDR2Pt = dR2;
+        closestTrackDRPt = &track;
       }
-      if (dR < closestDR) {
-        closestDR = dR;
-        closestTrackDR = &*itTrack;
+      if (dR2 < closestDR2) {
+        closestDR2 = dR2;
+        closestTrackDR = &track;
       }
     }
   }
   if (closestTrackDRPt) {
-    GlobalVector closestTrackVector(closestTrackDRPt->px(), closestTrackDRPt->py(), closestTrackDRPt->pz());
-    isoPtLepton -= closestTrackVector.perp();
+    isoPtLepton -= closestTrackDRPt->pt();
   } else if (closestTrackDR) {
-    GlobalVector closestTrackVector(closestTrackDR->px(), closestTrackDR->py(), closestTrackDR->pz());
-    isoPtLepton -= closestTrackVector.perp();
+    isoPtLepton -= closestTrackDR->pt();
   }
   // back to normal sum - S.L. 30/10/2007
   if (isoPtLepton<0) isoPtLepton = 0;
   //  isoPtLepton <= 0.01 ? isoPtLepton = -1 : isoPtLepton = log(isoPtLepton);
   return isoPtLepton;
 }
-
@@ -16,20 +16,64 @@ using namespace pat::helper;
 // Methods
 
 
+// Drop the cached indices of the associations
+void TriggerMatchHelper::resetCache() const
+{
+  cachedMatchIndices_.clear();
+  cachedEventID_      = edm::EventID();
+  cachedTriggerEvent_ = 0;
+}
+
+
+// Get the index of the associations of a matcher module, building it on first access in the event
+const TriggerMatchHelper::MatchIndex & TriggerMatchHelper::matchIndex( const TriggerObjectMatch * matchResult, const edm::Event & event, const TriggerEvent & triggerEvent ) const
+{
+  if ( event.id() != cachedEventID_ || &triggerEvent != cachedTriggerEvent_ ) {
+    resetCache();
+    cachedEventID_      = event.id();
+    cachedTriggerEvent_ = &triggerEvent;
+  }
+  // the association is identified by its address, its size and the product IDs of the physics objects and trigger objects,
+  // so that an index built for an association which has since been replaced at the same address is not used
+  std::vector< edm::ProductID > candidateProductIDs;
+  for ( size_t iId = 0; iId < matchResult->ids().size(); ++iId ) {
+    candidateProductIDs.push_back( matchResult->ids().at( iId ).first );
+  }
+  std::map< const TriggerObjectMatch *, MatchIndex >::iterator itIndex( cachedMatchIndices_.find( matchResult ) );
+  if ( itIndex != cachedMatchIndices_.end() ) {
+    if ( itIndex->second.associationSize_     == matchResult->size()     &&
+         itIndex->second.objectProductID_     == matchResult->ref().id() &&
+         itIndex->second.candidateProductIDs_ == candidateProductIDs ) return itIndex->second;
+    cachedMatchIndices_.erase( itIndex );
+  }
+
+  MatchIndex & index( cachedMatchIndices_[ matchResult ] );
+  index.associationSize_     = matchResult->size();
+  index.objectProductID_     = matchResult->ref().id();
+  index.candidateProductIDs_ = candidateProductIDs;
+  edm::AssociativeIterator< reco::CandidateBaseRef, TriggerObjectMatch > it( *matchResult, edm::EdmEventItemGetter< reco::CandidateBaseRef >( event ) ), itEnd( it.end() );
+  while ( it != itEnd ) {
+    if ( it->first.isNonnull() && it->second.isNonnull() && it->second.isAvailable() ) {
+      // keep the first match of each physics object, as found by the iteration over the association
+      index.objectByCandidate_.insert( std::make_pair( RefKey( it->first.id(), it->first.key() ), TriggerObjectRef( it->second ) ) );
+      index.candidatesByObject_[ RefKey( it->second.id(), it->second.key() ) ].push_back( it->first );
+    }
+    ++it;
+  }
+  return index;
+}
+
+
 // Get a reference to the trigger objects matched to a certain physics object given by a reference for a certain matcher module
 
 // ... by resulting association
 TriggerObjectRef TriggerMatchHelper::triggerMatchObject( const reco::CandidateBaseRef & candRef, const TriggerObjectMatch * matchResult, const edm::Event & event, const TriggerEvent & triggerEvent ) const
 {
   if ( matchResult ) {
-    edm::AssociativeIterator< reco::CandidateBaseRef, TriggerObjectMatch > it( *matchResult, edm::EdmEventItemGetter< reco::CandidateBaseRef >( event ) ), itEnd( it.end() );
-    while ( it != itEnd ) {
-      if ( it->first.isNonnull() && it->second.isNonnull() && it->second.isAvailable() ) {
-        if ( it->first.id() == candRef.id() && it->first.key() == candRef.key() ) {
-          return TriggerObjectRef( it->second );
-        }
-      }
-      ++it;
+    const MatchIndex & index( matchIndex( matchResult, event, triggerEvent ) );
+    std::map< RefKey, TriggerObjectRef >::const_iterator it( index.objectByCandidate_.find( RefKey( candRef.id(), candRef.key() ) ) );
+    if ( it != index.objectByCandidate_.end() ) {
+      return it->second;
     }
   }
   return TriggerObjectRef();
@@ -61,14 +105,10 @@ reco::CandidateBaseRefVector TriggerMatchHelper::triggerMatchCandidates( const T
 {
   reco::CandidateBaseRefVector theCands;
   if ( matchResult ) {
-    edm::AssociativeIterator< reco::CandidateBaseRef, TriggerObjectMatch > it( *matchResult, edm::EdmEventItemGetter< reco::CandidateBaseRef >( event ) ), itEnd( it.end() );
-    while ( it != itEnd ) {
-      if ( it->first.isNonnull() && it->second.isNonnull() && it->second.isAvailable() ) {
-        if ( it->second == objectRef ) {
-          theCands.push_back( it->first );
-        }
-      }
-      ++it;
+    const MatchIndex & index( matchIndex( matchResult, event, triggerEvent ) );
+    std::map< RefKey, reco::CandidateBaseRefVector >::const_iterator it( index.candidatesByObject_.find( RefKey( objectRef.id(), objectRef.key() ) ) );
+    if ( it != index.candidatesByObject_.end() ) {
+      theCands = it->second;
     }
   }
   return theCands;
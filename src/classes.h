@@ -1,5 +1,12 @@
 #include "PhysicsTools/PatUtils/interface/PATDiObjectProxy.h"
+#include "PhysicsTools/PatUtils/interface/METSystematicsTable.h"
+#include "PhysicsTools/PatUtils/interface/ShiftedPFCandidateOverlay.h"
+#include "DataFormats/Common/interface/Wrapper.h"
 
 namespace { struct dictionary  {  // apparenlty better than namespace { namespace {
     pat::DiObjectProxy patDiObjectProxy; 
+    pat::METSystematicsTable patMETSystematicsTable;
+    edm::Wrapper<pat::METSystematicsTable> patMETSystematicsTable_wrapper;
+    pat::ShiftedPFCandidateOverlay patShiftedPFCandidateOverlay;
+    edm::Wrapper<pat::ShiftedPFCandidateOverlay> patShiftedPFCandidateOverlay_wrapper;
 }; }